@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled FlagExtractor vs. the original per-pattern re.search loop.
+Usage: python benchmarks/bench_flag_extractor.py [num_strings]
+"""
+import os
+import re
+import sys
+import random
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.flag_extractor import FlagExtractor, DEFAULT_PATTERNS
+
+def legacy_check(text, patterns=DEFAULT_PATTERNS):
+    """The pre-compilation implementation, kept here as the baseline."""
+    if not text or not isinstance(text, str):
+        return None
+    for pattern in patterns:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            return match.group(0)
+    return None
+
+def make_corpus(count, seed=1337):
+    """Printable strings like a strings pass produces, with a few flags mixed in."""
+    rng = random.Random(seed)
+    alphabet = bytes(range(0x20, 0x7f))
+    corpus = []
+    for i in range(count):
+        s = bytes(rng.choice(alphabet) for _ in range(rng.randint(4, 40)))
+        if i % 5000 == 0:
+            s += b"flag{bench_%d}" % i
+        corpus.append(s)
+    return corpus
+
+def timed(fn, corpus):
+    start = time.perf_counter()
+    hits = sum(1 for item in corpus if fn(item))
+    return time.perf_counter() - start, hits
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    corpus = make_corpus(count)
+    decoded = [s.decode() for s in corpus]
+    blob = b"\x00".join(corpus)
+    extractor = FlagExtractor(patterns=DEFAULT_PATTERNS)
+
+    legacy_time, legacy_hits = timed(legacy_check, decoded)
+    str_time, str_hits = timed(extractor.check, decoded)
+    bytes_time, bytes_hits = timed(extractor.check, corpus)
+
+    start = time.perf_counter()
+    blob_hits = len(extractor.find_all(blob))
+    blob_time = time.perf_counter() - start
+
+    print(f"[*] {count} candidate strings ({len(blob) / 1e6:.1f} MB)")
+    print(f"    legacy loop (str):      {legacy_time:.3f}s  hits={legacy_hits}")
+    print(f"    compiled check (str):   {str_time:.3f}s  hits={str_hits}  x{legacy_time / str_time:.1f}")
+    print(f"    compiled check (bytes): {bytes_time:.3f}s  hits={bytes_hits}  x{legacy_time / bytes_time:.1f}")
+    print(f"    find_all (one buffer):  {blob_time:.3f}s  hits={blob_hits}  x{legacy_time / blob_time:.1f}")
+
+if __name__ == "__main__":
+    main()
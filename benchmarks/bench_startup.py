@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CLI startup cost per category.
+Runs `python -X importtime main.py <target>` for a sample target of each category and
+reports time-to-first-output, time until the engine starts, total wall time and the
+heaviest imports, so regressions in lazy loading show up immediately.
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+import os
+import re
+import sys
+import time
+import shutil
+import tempfile
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, "main.py")
+
+def make_targets(workdir):
+    """One representative input per category."""
+    png = os.path.join(workdir, "image.png")
+    with open(png, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n" + b"\x00" * 64 + b"flag{startup}")
+    script = os.path.join(workdir, "chall.py")
+    with open(script, "w") as f:
+        f.write("print('flag{startup}')\n")
+    binary = os.path.join(workdir, "chall.elf")
+    shutil.copy("/bin/ls", binary)
+
+    return {
+        "crypto": "ZmxhZ3tzdGFydHVwfQ==",
+        "web": "http://127.0.0.1:9",  # Closed port: measures startup, not the network
+        "pwn": binary,
+        "forensics": png,
+        "rev": script,
+    }
+
+def measure(target):
+    """Returns (first_output, engine_start, total, imports) in seconds."""
+    cmd = [sys.executable, "-X", "importtime", MAIN, "--no-cache", target]
+    start = time.perf_counter()
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            env=dict(os.environ, PYTHONUNBUFFERED="1"), cwd=ROOT)
+
+    first_output = engine_start = None
+    for line in proc.stdout:
+        now = time.perf_counter() - start
+        if first_output is None:
+            first_output = now
+        if engine_start is None and b"Handing over" in line:
+            engine_start = now
+    stderr = proc.stderr.read().decode(errors="ignore")
+    proc.wait()
+    total = time.perf_counter() - start
+
+    # Top-level imports only (no leading indentation in the module column)
+    imports = {}
+    for m in re.finditer(r"import time:\s+\d+ \|\s+(\d+) \| (\S.*)", stderr):
+        imports[m.group(2).strip()] = int(m.group(1)) / 1e6
+    return first_output or total, engine_start or total, total, imports
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    workdir = tempfile.mkdtemp(prefix="ctf-startup-")
+    try:
+        targets = make_targets(workdir)
+        print(f"[*] Startup benchmark ({runs} runs each, best of)")
+        print(f"    {'category':<10} {'first out':>10} {'engine':>10} {'total':>10}  heaviest imports")
+        for category, target in targets.items():
+            samples = [measure(target) for _ in range(runs)]
+            first, engine, total, imports = min(samples, key=lambda s: s[2])
+            heaviest = sorted(imports.items(), key=lambda kv: kv[1], reverse=True)[:3]
+            names = ", ".join(f"{name} {secs * 1000:.0f}ms" for name, secs in heaviest)
+            print(f"    {category:<10} {first * 1000:8.0f}ms {engine * 1000:8.0f}ms "
+                  f"{total * 1000:8.0f}ms  {names}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent WebEngine probes vs. one-request-at-a-time fetching.
+Serves a local stand-in challenge with artificial latency.
+Usage: python benchmarks/bench_web_engine.py [hidden_paths] [latency_ms]
+"""
+import os
+import sys
+import time
+import threading
+import contextlib
+import io
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import requests
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.engines.web_engine import WebEngine
+
+def make_handler(paths, latency):
+    robots = "User-agent: *\n" + "".join(f"Disallow: /hidden{i}\n" for i in range(paths))
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, body=True):
+            time.sleep(latency)
+            data = (robots if self.path == "/robots.txt" else f"page {self.path}").encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if body:
+                self.wfile.write(data)
+
+        def do_GET(self):
+            self._respond()
+
+        def do_HEAD(self):
+            self._respond(body=False)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+def serial_scan(url):
+    """The same probe set fetched one by one with fresh connections (the pre-async behaviour)."""
+    r = requests.get(f"{url}/robots.txt", timeout=5)
+    requests.head(url, timeout=5)
+    requests.get(url, timeout=5)
+    for path in WebEngine._disallowed_paths(r.text):
+        requests.get(url + path, timeout=5)
+
+def main():
+    paths = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    latency = (int(sys.argv[2]) if len(sys.argv) > 2 else 20) / 1000
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(paths, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    try:
+        start = time.perf_counter()
+        serial_scan(url)
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            WebEngine(rate=0).execute(url)
+        concurrent = time.perf_counter() - start
+    finally:
+        server.shutdown()
+
+    total = paths + 3
+    print(f"[*] {total} requests, {latency * 1000:.0f}ms server latency")
+    print(f"    serial:     {serial:.3f}s  ({total / serial:.1f} req/s)")
+    print(f"    concurrent: {concurrent:.3f}s  ({total / concurrent:.1f} req/s)  x{serial / concurrent:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Synthetic CTF corpus generator.
+Builds a reproducible (seeded) set of challenge-like files plus a manifest.json
+listing each file's expected category and embedded flags.
+Usage: python benchmarks/corpus.py <out_dir> [--seed N] [--big-mb N]
+"""
+import os
+import io
+import json
+import zlib
+import base64
+import codecs
+import random
+import struct
+import zipfile
+import argparse
+
+# --- Format builders (also used by tests) ---
+
+def make_elf(payload=b"", pie=False, nx=True, upx=False):
+    """Minimal x86-64 ELF: one PT_LOAD covering the file and a PT_GNU_STACK."""
+    if upx:
+        # UPX leaves its magic plus the UPX0/UPX1 section names behind
+        payload = b"UPX0\x00UPX1\x00" + payload + b"$Info: This file is packed with the UPX executable packer $UPX!"
+    ehsize, phentsize, phnum = 64, 56, 2
+    body = ehsize + phentsize * phnum
+    size = body + len(payload)
+    base = 0 if pie else 0x400000
+
+    ehdr = (b"\x7fELF" + bytes([2, 1, 1, 0]) + b"\x00" * 8 +
+            struct.pack("<HHIQQQIHHHHHH", 3 if pie else 2, 0x3e, 1, base + body,
+                        ehsize, 0, 0, ehsize, phentsize, phnum, 64, 0, 0))
+    load = struct.pack("<IIQQQQQQ", 1, 5, 0, base, base, size, size, 0x1000)
+    stack = struct.pack("<IIQQQQQQ", 0x6474e551, 6 if nx else 7, 0, 0, 0, 0, 0, 16)
+    return ehdr + load + stack + payload
+
+def make_png(width, height, rng, text_chunks=None, pixels=None):
+    """RGB8 PNG with filter-0 scanlines. 'pixels' overrides the random image data."""
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data +
+                struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff))
+
+    if pixels is None:
+        pixels = bytes(rng.getrandbits(8) for _ in range(width * height * 3))
+    stride = width * 3
+    raw = b"".join(b"\x00" + pixels[y * stride:(y + 1) * stride] for y in range(height))
+
+    png = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+    for key, value in (text_chunks or {}).items():
+        png += chunk(b"tEXt", key.encode() + b"\x00" + value.encode())
+    return png + chunk(b"IDAT", zlib.compress(raw)) + chunk(b"IEND", b"")
+
+def make_zip(members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+    return buf.getvalue()
+
+def make_pcap(streams, mss=8):
+    """
+    Classic little-endian pcap of Ethernet/IPv4/TCP segments.
+    Each (client_port, payload) stream is cut into 'mss'-byte segments, so
+    anything longer than that is split across packets.
+    """
+    out = [struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1)]
+    ts = 1700000000
+    for port, payload in streams:
+        seq = 1000
+        for i in range(0, len(payload), mss):
+            data = payload[i:i + mss]
+            tcp = struct.pack(">HHIIBBHHH", port, 80, seq, 0, 5 << 4, 0x18, 65535, 0, 0)
+            total = 20 + len(tcp) + len(data)
+            ip = struct.pack(">BBHHHBBH4s4s", 0x45, 0, total, 0, 0, 64, 6, 0,
+                             bytes([10, 0, 0, 1]), bytes([10, 0, 0, 2]))
+            frame = b"\x00" * 12 + b"\x08\x00" + ip + tcp + data
+            out.append(struct.pack("<IIII", ts, i, len(frame), len(frame)) + frame)
+            seq += len(data)
+            ts += 1
+    return b"".join(out)
+
+def encode_chain(text, chain):
+    """Applies encoders in order, e.g. ['rot13', 'hex', 'base64']."""
+    for step in chain:
+        if step == "rot13":
+            text = codecs.encode(text, "rot13")
+        elif step == "hex":
+            text = text.encode().hex()
+        elif step == "base64":
+            text = base64.b64encode(text.encode()).decode()
+        elif step == "base32":
+            text = base64.b32encode(text.encode()).decode()
+        elif step == "reverse":
+            text = text[::-1]
+    return text
+
+# --- Corpus ---
+
+def random_flag(rng, prefix="flag"):
+    return f"{prefix}{{{''.join(rng.choice('abcdefghijklmnopqrstuvwxyz0123456789_') for _ in range(20))}}}"
+
+def write_big_binary(path, size, flags, rng):
+    """Random bytes with each flag planted at a random offset; written in 1 MB blocks."""
+    offsets = sorted(rng.randrange(0, size - 64) for _ in flags)
+    planted = dict(zip(offsets, flags))
+    block = 1024 * 1024
+    with open(path, "wb") as f:
+        pos = 0
+        while pos < size:
+            n = min(block, size - pos)
+            chunk = bytearray(rng.getrandbits(8) for _ in range(min(n, 4096))) * (n // 4096 + 1)
+            chunk = chunk[:n]
+            for offset, flag in planted.items():
+                if pos <= offset < pos + n:
+                    data = b"\x00" + flag.encode() + b"\x00"
+                    end = min(offset - pos + len(data), n)
+                    chunk[offset - pos:end] = data[:end - (offset - pos)]
+            f.write(chunk)
+            pos += n
+    return offsets
+
+def generate(out_dir, seed=1337, big_mb=16):
+    """Writes the corpus into 'out_dir' and returns the manifest."""
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = []
+
+    def add(name, data, category, flags):
+        path = os.path.join(out_dir, name)
+        if data is not None:
+            with open(path, "wb") as f:
+                f.write(data)
+        manifest.append({"file": name, "category": category, "flags": flags,
+                         "size": os.path.getsize(path)})
+
+    for i, upx in enumerate((False, True, False, True)):
+        flag = random_flag(rng)
+        payload = bytes(rng.getrandbits(8) for _ in range(4096)) + b"\x00" + flag.encode() + b"\x00"
+        # ET_DYN without an interpreter looks like a shared library, which routes to rev
+        add(f"elf_{'upx' if upx else 'plain'}_{i}.elf",
+            make_elf(payload, pie=bool(i % 2), upx=upx), "rev" if i % 2 else "pwn", [flag])
+
+    big_flags = [random_flag(rng, "CTF") for _ in range(3)]
+    write_big_binary(os.path.join(out_dir, "big.bin"), big_mb * 1024 * 1024, big_flags, rng)
+    add("big.bin", None, "misc", big_flags)
+
+    chains = [["base64"], ["hex", "base64"], ["rot13", "hex", "base64"],
+              ["reverse", "base32", "hex"], ["rot13", "base64", "base64", "hex"]]
+    for i, chain in enumerate(chains):
+        flag = random_flag(rng)
+        add(f"encoded_{i}.txt", encode_chain(flag, chain).encode(), "crypto", [flag])
+
+    flag = random_flag(rng)
+    add("image.png", make_png(256, 256, rng, {"Comment": flag}), "forensics", [flag])
+
+    flag = random_flag(rng)
+    add("archive.zip", make_zip({"readme.txt": "nothing", "secret/flag.txt": flag}), "forensics", [flag])
+
+    flag = random_flag(rng)
+    request = b"GET /login HTTP/1.1\r\nHost: ctf\r\n\r\nuser=admin&pass=" + flag.encode()
+    add("capture.pcap", make_pcap([(40000, request), (40001, b"GET / HTTP/1.1\r\n\r\n")]),
+        "forensics", [flag])
+
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("out_dir")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--big-mb", type=int, default=16, help="Size of the large binary in MB")
+    args = parser.parse_args()
+
+    manifest = generate(args.out_dir, args.seed, args.big_mb)
+    total = sum(entry["size"] for entry in manifest)
+    print(f"[+] Wrote {len(manifest)} files ({total / 1e6:.1f} MB) to {args.out_dir}")
+
+if __name__ == "__main__":
+    main()
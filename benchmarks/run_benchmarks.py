@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite over the synthetic corpus (see corpus.py).
+Each benchmark runs in a fresh interpreter so its peak RSS is its own.
+Reports throughput (MB/s, targets/s) and peak RSS, and can save/compare a
+baseline JSON to catch regressions.
+
+Usage:
+    python benchmarks/run_benchmarks.py                    # run and print
+    python benchmarks/run_benchmarks.py --save             # also write the baseline
+    python benchmarks/run_benchmarks.py --compare          # fail on regressions vs. baseline
+    python benchmarks/run_benchmarks.py --only engine.rev  # subset (prefix match)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+import contextlib
+import multiprocessing
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import corpus
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmarks", "baseline.json")
+
+# Slower than baseline by more than this fraction counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+def _files(corpus_dir, manifest, categories=None):
+    return [os.path.join(corpus_dir, e["file"]) for e in manifest
+            if categories is None or e["category"] in categories]
+
+def _size(paths):
+    return sum(os.path.getsize(p) for p in paths)
+
+@contextlib.contextmanager
+def _quiet():
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        yield
+
+def _run_engine(engine_path, paths, repeat=1):
+    from src.engines import EngineRegistry
+    from src.core.artifact import Artifact
+    engine_class = EngineRegistry().get(engine_path)
+    with _quiet():
+        engine = engine_class()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for path in paths:
+                with Artifact(path) as artifact:
+                    engine.execute(path, artifact)
+        return time.perf_counter() - start
+
+# --- Benchmarks: each returns {'seconds', 'bytes', 'targets'} ---
+
+def bench_classifier(corpus_dir, manifest):
+    from src.core.classifier import Classifier
+    paths = _files(corpus_dir, manifest) * 50
+    classifier = Classifier()
+    with _quiet():
+        start = time.perf_counter()
+        for path in paths:
+            classifier.identify(path)
+        seconds = time.perf_counter() - start
+    return {"seconds": seconds, "bytes": 0, "targets": len(paths)}
+
+def bench_flag_extractor(corpus_dir, manifest):
+    from src.utils.flag_extractor import FlagExtractor
+    from src.utils.strings_scanner import iter_strings
+    path = os.path.join(corpus_dir, "big.bin")
+    candidates = [s for _, s in iter_strings(path)]
+    extractor = FlagExtractor(config={})
+    start = time.perf_counter()
+    for s in candidates:
+        extractor.check(s)
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "bytes": sum(map(len, candidates)), "targets": len(candidates)}
+
+def bench_strings(corpus_dir, manifest):
+    from src.utils.strings_scanner import scan_strings
+    path = os.path.join(corpus_dir, "big.bin")
+    start = time.perf_counter()
+    count = sum(1 for _ in scan_strings(path))
+    seconds = time.perf_counter() - start
+    return {"seconds": seconds, "bytes": os.path.getsize(path), "targets": count}
+
+def bench_engine_crypto(corpus_dir, manifest):
+    paths = _files(corpus_dir, manifest, {"crypto"})
+    return {"seconds": _run_engine("crypto", paths, repeat=5),
+            "bytes": _size(paths) * 5, "targets": len(paths) * 5}
+
+def bench_engine_forensics(corpus_dir, manifest):
+    paths = _files(corpus_dir, manifest, {"forensics", "misc"})
+    return {"seconds": _run_engine("forensics", paths), "bytes": _size(paths), "targets": len(paths)}
+
+def bench_engine_rev(corpus_dir, manifest):
+    paths = _files(corpus_dir, manifest, {"pwn", "rev", "misc"})
+    return {"seconds": _run_engine("rev", paths), "bytes": _size(paths), "targets": len(paths)}
+
+def bench_engine_pwn(corpus_dir, manifest):
+    paths = _files(corpus_dir, manifest, {"pwn", "rev"})
+    return {"seconds": _run_engine("pwn", paths, repeat=5),
+            "bytes": _size(paths) * 5, "targets": len(paths) * 5}
+
+def bench_engine_web(corpus_dir, manifest):
+    paths = ["/"] + [f"/hidden{i}" for i in range(20)]
+    robots = "User-agent: *\n" + "".join(f"Disallow: {p}\n" for p in paths[1:])
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _respond(self, body=True):
+            data = (robots if self.path == "/robots.txt" else f"page {self.path}").encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            if body:
+                self.wfile.write(data)
+
+        def do_GET(self):
+            self._respond()
+
+        def do_HEAD(self):
+            self._respond(body=False)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        from src.engines.web_engine import WebEngine
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        with _quiet():
+            start = time.perf_counter()
+            WebEngine(rate=0).execute(url)
+            seconds = time.perf_counter() - start
+    finally:
+        server.shutdown()
+    return {"seconds": seconds, "bytes": 0, "targets": len(paths) + 2}
+
+def bench_orchestrator(corpus_dir, manifest):
+    from src.core.orchestrator import Orchestrator
+    paths = _files(corpus_dir, manifest)
+    orchestrator = Orchestrator(use_cache=False)
+    with _quiet():
+        start = time.perf_counter()
+        for path in paths:
+            orchestrator.run(path)
+        seconds = time.perf_counter() - start
+    return {"seconds": seconds, "bytes": _size(paths), "targets": len(paths)}
+
+BENCHMARKS = {
+    "classifier.identify": bench_classifier,
+    "flag_extractor.check": bench_flag_extractor,
+    "strings.scan": bench_strings,
+    "engine.crypto": bench_engine_crypto,
+    "engine.forensics": bench_engine_forensics,
+    "engine.rev": bench_engine_rev,
+    "engine.pwn": bench_engine_pwn,
+    "engine.web": bench_engine_web,
+    "orchestrator.run": bench_orchestrator,
+}
+
+def _child(name, corpus_dir, manifest, queue):
+    """Runs one benchmark in a fresh process and reports its peak RSS."""
+    import resource
+    try:
+        result = BENCHMARKS[name](corpus_dir, manifest)
+        # ru_maxrss is KB on Linux, bytes on macOS
+        scale = 1 if sys.platform == "darwin" else 1024
+        result["peak_rss"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        queue.put(result)
+    except Exception as e:
+        queue.put({"error": f"{type(e).__name__}: {e}"})
+
+def run_benchmark(name, corpus_dir, manifest):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(name, corpus_dir, manifest, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    if "error" not in result:
+        seconds = max(result["seconds"], 1e-9)
+        result["mb_per_s"] = result["bytes"] / 1e6 / seconds if result["bytes"] else None
+        result["targets_per_s"] = result["targets"] / seconds
+    return result
+
+def compare(results, baseline, tolerance):
+    """Returns a list of human-readable regressions against the baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or "error" in result or "error" in base:
+            continue
+        if result["targets_per_s"] < base["targets_per_s"] * (1 - tolerance):
+            regressions.append(f"{name}: {result['targets_per_s']:.1f} targets/s "
+                               f"vs baseline {base['targets_per_s']:.1f}")
+        if result["peak_rss"] > base["peak_rss"] * (1 + tolerance) + 16 * 1024 * 1024:
+            regressions.append(f"{name}: peak RSS {result['peak_rss'] / 1e6:.0f} MB "
+                               f"vs baseline {base['peak_rss'] / 1e6:.0f} MB")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="CTF Copilot benchmark suite")
+    parser.add_argument("--corpus", help="Reuse an existing corpus directory")
+    parser.add_argument("--seed", type=int, default=1337)
+    parser.add_argument("--big-mb", type=int, default=32)
+    parser.add_argument("--only", action="append", help="Run benchmarks whose name starts with this")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Exit non-zero on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args()
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix="ctf-corpus-")
+    try:
+        manifest_path = os.path.join(corpus_dir, "manifest.json")
+        if args.corpus and os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+        else:
+            manifest = corpus.generate(corpus_dir, args.seed, args.big_mb)
+
+        names = [n for n in BENCHMARKS if not args.only or any(n.startswith(o) for o in args.only)]
+        results = {}
+        print(f"[*] Corpus: {corpus_dir} ({len(manifest)} files, "
+              f"{sum(e['size'] for e in manifest) / 1e6:.1f} MB)")
+        print(f"    {'benchmark':<22} {'time':>9} {'MB/s':>9} {'targets/s':>11} {'peak RSS':>10}")
+        for name in names:
+            r = results[name] = run_benchmark(name, corpus_dir, manifest)
+            if "error" in r:
+                print(f"    {name:<22} ERROR {r['error']}")
+                continue
+            mbs = f"{r['mb_per_s']:.1f}" if r["mb_per_s"] else "-"
+            print(f"    {name:<22} {r['seconds']:8.3f}s {mbs:>9} {r['targets_per_s']:11.1f} "
+                  f"{r['peak_rss'] / 1e6:8.1f}MB")
+    finally:
+        if not args.corpus:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+
+    if args.compare:
+        try:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        except FileNotFoundError:
+            print(f"[-] No baseline at {args.baseline}; run with --save first.")
+            sys.exit(2)
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"[-] REGRESSION {line}")
+        if regressions:
+            sys.exit(1)
+        print("[+] No regressions against baseline.")
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"[+] Baseline saved to {args.baseline}")
+
+if __name__ == "__main__":
+    main()
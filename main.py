@@ -4,22 +4,120 @@ CTF Copilot - Main Entry Point
 """
 import sys
 import os
+import argparse
+import contextlib
 
 # Ensure python can find our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from src.core.orchestrator import Orchestrator
+def print_profile(out, trace_path):
+    """Writes the Chrome trace and prints the per-stage summary, slowest first."""
+    from src.utils import profiler
+    events = profiler.export_chrome_trace(trace_path)
+    print("")
+    out.info(f"Profile: {events} spans written to {trace_path} (open in chrome://tracing or Perfetto)")
+    print(f"    {'stage':<28} {'calls':>7} {'total':>10} {'mean':>10} {'max':>10}")
+    for name, count, total, mean, longest in profiler.summary():
+        print(f"    {name:<28} {count:>7} {total * 1000:8.2f}ms {mean * 1000:8.3f}ms {longest * 1000:8.2f}ms")
+
+def run_client(args):
+    """Thin client: submits the targets to a running --serve daemon and prints its NDJSON events."""
+    import json
+    from src.core.client import Client
+    try:
+        with Client(args.connect or None) as client:
+            for event in client.analyze(args.target, no_cache=args.no_cache):
+                print(json.dumps(event), flush=True)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print("[-] Error: No server listening (start one with: python main.py --serve)", file=sys.stderr)
+        sys.exit(1)
 
 def main():
-    if len(sys.argv) < 2:
+    parser = argparse.ArgumentParser(
+        usage="python main.py <target_file_or_string> | --batch <dir> | --serve | --connect <target>...")
+    parser.add_argument("target", nargs="*", help="File path, URL or raw string to analyze")
+    parser.add_argument("--batch", metavar="DIR", help="Analyze every file in a challenge directory")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Process pool size for --batch/--serve (default: CPU count)")
+    parser.add_argument("--top-k", type=int, default=None, metavar="N",
+                        help="Run up to N best-ranked engines per target; the first flag wins (default: 3)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignore the persistent result cache and re-run every engine")
+    parser.add_argument("--ndjson", metavar="FILE",
+                        help="Append structured findings as NDJSON to FILE ('-' for stdout)")
+    parser.add_argument("--profile", metavar="TRACE", nargs="?", const="profile.trace.json",
+                        help="Time every stage; write a Chrome trace (default: profile.trace.json)")
+    parser.add_argument("--cprofile", metavar="FILE", nargs="?", const="profile.prof",
+                        help="Also run under cProfile and dump stats (default: profile.prof)")
+    parser.add_argument("--serve", metavar="SOCKET", nargs="?", const="",
+                        help="Run as a daemon with warm engines on a Unix socket "
+                             "(default: $CTF_COPILOT_SOCKET or a per-user socket in /tmp)")
+    parser.add_argument("--connect", metavar="SOCKET", nargs="?", const="",
+                        help="Send the targets to a running --serve daemon and stream back NDJSON")
+    args = parser.parse_args()
+
+    # The client path stays free of engine imports: that is the point of the daemon
+    if args.connect is not None:
+        if not args.target:
+            parser.error("--connect needs at least one target")
+        return run_client(args)
+
+    if not args.target and not args.batch and args.serve is None:
         print("Usage: python main.py <target_file_or_string>")
+        print("       python main.py --batch <dir> [--workers N]")
+        print("       python main.py --serve [SOCKET] [--workers N]")
+        print("       python main.py --connect [SOCKET] <target>...")
         return
 
-    target = sys.argv[1]
-    
+    from src.core.orchestrator import Orchestrator
+    from src.core.output_manager import OutputManager, NDJSONSink
+    from src.utils import profiler
+
+    sinks = [NDJSONSink.open(args.ndjson)] if args.ndjson else []
+    out = OutputManager(sinks=sinks)
+
+    # With NDJSON on stdout, the human-readable console moves to stderr
+    console = sys.stderr if args.ndjson == '-' else sys.stdout
+
+    if args.profile:
+        profiler.enable()
+    cprof = None
+    if args.cprofile:
+        import cProfile
+        cprof = cProfile.Profile()
+
     # Initialize and Run
-    copilot = Orchestrator()
-    copilot.run(target)
+    copilot = Orchestrator(use_cache=not args.no_cache, out=out, top_k=args.top_k)
+    try:
+        with contextlib.redirect_stdout(console):
+            if cprof:
+                cprof.enable()
+            try:
+                if args.serve is not None:
+                    from src.core.server import AnalysisServer
+                    AnalysisServer(args.serve or None, workers=args.workers,
+                                   use_cache=not args.no_cache, out=out).serve_forever()
+                elif args.batch:
+                    if not os.path.isdir(args.batch):
+                        print(f"[-] Error: Not a directory: {args.batch}")
+                        return
+                    copilot.run_many(args.batch, workers=args.workers)
+                else:
+                    for target in args.target:
+                        copilot.run(target)
+            finally:
+                if cprof:
+                    cprof.disable()
+
+            if args.profile:
+                print_profile(out, args.profile)
+            if cprof:
+                import pstats
+                cprof.dump_stats(args.cprofile)
+                out.info(f"cProfile stats written to {args.cprofile} (top 20 by cumulative time):")
+                pstats.Stats(cprof, stream=sys.stdout).sort_stats("cumulative").print_stats(20)
+    finally:
+        out.close()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
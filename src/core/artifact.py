@@ -0,0 +1,72 @@
+"""
+Component: Artifact
+Role: Shared per-target view of the input so every stage reads the bytes only once.
+"""
+import os
+import mmap
+import hashlib
+from src.utils.profiler import span
+
+class Artifact:
+    def __init__(self, target):
+        self.target = target
+        self.is_file = os.path.isfile(target)
+        self._file = None
+        self._data = None
+        self._digests = {}
+
+    @property
+    def data(self):
+        """
+        The raw content. Files are memory-mapped on first access, so large inputs
+        are paged in by the OS rather than copied into the Python heap.
+        """
+        if self._data is None:
+            with span("artifact.open"):
+                self._load()
+        return self._data
+
+    def _load(self):
+        if not self.is_file:
+            self._data = self.target.encode('utf-8', errors='ignore')
+        elif os.path.getsize(self.target) == 0:
+            self._data = b""
+        else:
+            self._file = open(self.target, 'rb')
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @property
+    def size(self):
+        return len(self.data)
+
+    @property
+    def sha256(self):
+        return self._digest('sha256')
+
+    @property
+    def md5(self):
+        return self._digest('md5')
+
+    def text(self):
+        """Content decoded as text (lossy), for engines that work on strings."""
+        return bytes(self.data).decode('utf-8', errors='ignore')
+
+    def _digest(self, name):
+        if name not in self._digests:
+            with span(f"artifact.{name}"):
+                self._digests[name] = hashlib.new(name, self.data).hexdigest()
+        return self._digests[name]
+
+    def close(self):
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        if self._file:
+            self._file.close()
+        self._file = None
+        self._data = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
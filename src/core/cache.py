@@ -0,0 +1,105 @@
+"""
+Component: Analysis Cache
+Role: Persistent, content-addressed store of engine results with size-bounded LRU eviction.
+"""
+import os
+import json
+import hashlib
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "ctf-copilot")
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+class AnalysisCache:
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.environ.get("CTF_COPILOT_CACHE", DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self._size = None       # Running total of the cache files, measured on the first put
+
+    @staticmethod
+    def key(content_hash, engine_name, engine_version, config_digest=""):
+        """
+        Cache key: SHA-256 of the content plus the engine name and version, and a digest
+        of the config the engine reads, so changed settings are never answered from the cache.
+        """
+        raw = f"{content_hash}:{engine_name}:{engine_version}:{config_digest}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], key + ".json")
+
+    def get(self, key):
+        """Returns the cached entry (a dict) or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key, entry):
+        """Stores an entry atomically, then evicts old entries if over budget."""
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+                size = f.tell()
+            replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp, path)
+        except OSError:
+            return
+
+        # Only the first put walks the cache directory. Other processes writing to it
+        # are not counted, so the total is an estimate, corrected by every eviction.
+        if self._size is None:
+            self._size = sum(size for _, size, _ in self._entries())
+        else:
+            self._size += size - replaced
+        if self._size > self.max_bytes:
+            self._evict()
+
+    def clear(self):
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._size = 0
+
+    def _entries(self):
+        """Lists (path, size, mtime) of every cache file."""
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, st.st_size, st.st_mtime))
+        return entries
+
+    def _evict(self):
+        """Removes least recently used entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        if total > self.max_bytes:
+            for path, size, _ in sorted(entries, key=lambda e: e[2]):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._size = total
@@ -5,11 +5,36 @@ Role: Identifies challenge type (Crypto, Web, Pwn, Forensics) based on input sig
 
 import os
 import re
-try:
-    import magic
-    MAGIC_AVAILABLE = True
-except ImportError:
-    MAGIC_AVAILABLE = False
+import importlib.util
+from src.core.signatures import HEADER_SIZE, identify_header, looks_like_text
+from src.utils.profiler import span
+
+# python-magic is only a fallback, so it is imported on first use rather than at startup
+MAGIC_AVAILABLE = importlib.util.find_spec("magic") is not None
+
+# Shared libmagic handle, created on first use (loading the database is the slow part)
+_magic_instance = None
+
+def _get_magic():
+    global _magic_instance
+    if _magic_instance is None:
+        import magic
+        _magic_instance = magic.Magic(mime=True)
+    return _magic_instance
+
+# Runner-up categories per primary category, as (category, share of the confidence).
+# A binary is as often a rev challenge as a pwn one, and anything with bytes in it
+# may hide a plaintext flag the forensics strings pass would catch.
+ALTERNATIVES = {
+    'pwn': [('rev', 0.4)],
+    'rev': [('forensics', 0.2)],
+    'forensics': [('rev', 0.1)],
+}
+
+# Text file content shapes
+URL_RE = re.compile(r'https?://[^\s"\'<>]+')
+ENCODED_RE = re.compile(r'^[A-Za-z0-9+/=_\-\s]+$')
+DOMAIN_RE = re.compile(r'^[\w-]+(\.[\w-]+)*\.[a-z]{2,}(:\d+)?(/\S*)?$', re.IGNORECASE)
 
 class Classifier:
     def __init__(self):
@@ -19,25 +44,43 @@ class Classifier:
             'application/x-pie-executable': 'pwn',  # Linux ELF (PIE)
             'application/x-dosexec': 'pwn',         # Windows PE
             'application/x-sharedlib': 'rev',       # Shared libraries
+            'application/x-object': 'rev',          # Relocatable objects
+            'application/x-mach-binary': 'pwn',     # macOS Mach-O
+            'application/x-bytecode.python': 'rev', # Compiled .pyc
             'text/x-python': 'rev',                 # Source code
             'text/x-c': 'rev',
             'image/jpeg': 'forensics',
             'image/png': 'forensics',
+            'image/gif': 'forensics',
             'application/zip': 'forensics',         # Archives usually hide stuff
             'application/x-tar': 'forensics',
-            'application/vnd.tcpdump.pcap': 'forensics' # Wireshark captures
+            'application/gzip': 'forensics',
+            'application/x-7z-compressed': 'forensics',
+            'application/x-bzip2': 'forensics',
+            'application/x-xz': 'forensics',
+            'application/pdf': 'forensics',
+            'application/vnd.tcpdump.pcap': 'forensics', # Wireshark captures
+            'application/x-pcapng': 'forensics'
         }
 
     def identify(self, target):
         """
         Analyzes the target (file path or string) and returns the Category.
         """
-        # 1. Check if it is a valid file path
-        if os.path.exists(target):
-            return self._analyze_file(target)
-        
-        # 2. Treat as string/text input
-        return self._analyze_text(target)
+        return self.rank(target)[0][0]
+
+    def rank(self, target):
+        """
+        Returns every plausible category as (category, confidence) pairs, best first.
+        Confidences sum to 1; 'misc' stands for "no engine applies".
+        """
+        with span("classifier.identify"):
+            # 1. Check if it is a valid file path
+            if os.path.exists(target):
+                return self._analyze_file(target)
+            
+            # 2. Treat as string/text input
+            return self._analyze_text(target)
 
     def _analyze_file(self, filepath):
         """Uses Magic Bytes to detect file type."""
@@ -45,51 +88,92 @@ class Classifier:
         # PRIORITY 1: Check Extension for Source Code (Overrides magic for scripts)
         # Magic often mistakes small .py files for generic text/plain
         if filepath.lower().endswith('.py'):
-            return 'rev'
+            return self._with_alternatives('rev')
         if filepath.lower().endswith('.c') or filepath.lower().endswith('.cpp'):
-            return 'rev'
-
-        # PRIORITY 2: Magic Bytes
-        if not MAGIC_AVAILABLE:
-            return 'misc'
+            return self._with_alternatives('rev')
 
+        # PRIORITY 2: Built-in signature table (only the first few KB are read)
         try:
-            mime = magic.Magic(mime=True)
-            file_type = mime.from_file(filepath)
-            print(f"[+] Detected File Type: {file_type}")
-
-            # SMART CHECK: If generic binary, check specific magic bytes manually
-            if file_type == 'application/octet-stream':
-                try:
-                    with open(filepath, 'rb') as f:
-                        header = f.read(4)
-                    if header.startswith(b'\x7fELF') or header.startswith(b'MZ'):
-                        return 'pwn'
-                except Exception:
-                    pass
-
-            # Match against our standard map
-            category = self.mime_map.get(file_type, 'misc')
-            
-            # Special check: If it's a text file, it might be a key or source
-            if 'text' in file_type and category == 'misc':
-                return 'crypto' 
-            
-            return category
-
+            with span("classifier.read_header"), open(filepath, 'rb') as f:
+                header = f.read(HEADER_SIZE)
         except Exception as e:
             print(f"[!] Classification Error: {e}")
-            return 'misc'
+            return [('misc', 1.0)]
+        if not header:
+            return [('misc', 1.0)]
+
+        file_type = self._detect_type(filepath, header)
+        print(f"[+] Detected File Type: {file_type}")
+
+        # Match against our standard map
+        category = self.mime_map.get(file_type)
+        if category:
+            return self._with_alternatives(category)
+        
+        # Special check: If it's a text file, it might be a key, an encoded blob or a URL
+        if 'text' in file_type:
+            return self._rank_text_file(header)
+
+        # Unknown binary blob: nothing matched, but it is still worth carving
+        return [('misc', 0.4), ('forensics', 0.35), ('rev', 0.25)]
+
+    @staticmethod
+    def _with_alternatives(category, confidence=1.0):
+        ranked = [(category, confidence)]
+        for alternative, share in ALTERNATIVES.get(category, []):
+            ranked.append((alternative, round(confidence * share, 3)))
+        ranked[0] = (category, round(confidence - sum(score for _, score in ranked[1:]), 3))
+        return sorted(ranked, key=lambda item: item[1], reverse=True)
+
+    def _rank_text_file(self, header):
+        """Ranks a text file by what its first KB looks like."""
+        text = header.decode('utf-8', errors='ignore').strip()
+        if URL_RE.search(text):
+            # A link in a note is usually the challenge itself
+            return [('web', 0.6), ('crypto', 0.25), ('forensics', 0.15)]
+        if text and ENCODED_RE.match(text) and len(text) > 8:
+            return [('crypto', 0.85), ('forensics', 0.15)]
+        return [('crypto', 0.5), ('forensics', 0.3), ('rev', 0.2)]
+
+    def _detect_type(self, filepath, header):
+        """
+        Resolves a MIME type: signature table first, then a plain-text heuristic,
+        and libmagic only for whatever is left (if it is installed).
+        """
+        file_type = identify_header(header)
+        if file_type:
+            return file_type
+
+        if looks_like_text(header):
+            # Sniff the common source languages libmagic would otherwise report
+            first_line = header.split(b'\n', 1)[0]
+            if first_line.startswith(b'#!') and b'python' in first_line:
+                return 'text/x-python'
+            if re.search(rb'^\s*#\s*include\s*[<"]', header, re.MULTILINE):
+                return 'text/x-c'
+            return 'text/plain'
+
+        if MAGIC_AVAILABLE:
+            try:
+                return _get_magic().from_file(filepath)
+            except Exception as e:
+                print(f"[!] libmagic Error: {e}")
+
+        return 'application/octet-stream'
 
     def _analyze_text(self, text):
         """Uses Regex patterns to detect Strings, URLs, hashes."""
         if text.startswith('http://') or text.startswith('https://'):
-            return 'web'
+            return [('web', 1.0)]
         
         if re.match(r'^[A-Za-z0-9+/]+={0,2}$', text) and len(text) > 8:
-            return 'crypto'
+            return [('crypto', 1.0)]
         
         if re.match(r'^[a-fA-F0-9]+$', text) and len(text) > 8:
-            return 'crypto'
-            
-        return 'misc'
+            return [('crypto', 1.0)]
+
+        if DOMAIN_RE.match(text):
+            return [('web', 0.7), ('crypto', 0.3)]
+
+        # Anything else may still be a cipher (ROT13, reversed, decimal bytes...)
+        return [('misc', 0.6), ('crypto', 0.4)]
@@ -0,0 +1,88 @@
+"""
+Component: Client
+Role: Thin client for the analysis server (main.py --serve).
+Standard library only, so a job costs a socket round trip instead of an
+interpreter start plus every engine import.
+
+Protocol: newline-delimited JSON in both directions.
+    -> {"id": 1, "target": "/abs/path/or/string", "no_cache": false, "output": false}
+    <- {"id": 1, "event": "accepted", "target": ...}
+    <- {"id": 1, "event": "finding", "type": "flag", "flag": ..., ...}   (zero or more)
+    <- {"id": 1, "event": "done", "category": ..., "flags": [...], "elapsed": ..., "error": null}
+Other requests: {"op": "ping"} -> "pong", {"op": "shutdown"} -> "bye".
+"""
+import os
+import json
+import socket
+import tempfile
+
+def default_socket_path():
+    """$CTF_COPILOT_SOCKET, else a per-user socket in the runtime/temp directory."""
+    if os.environ.get("CTF_COPILOT_SOCKET"):
+        return os.environ["CTF_COPILOT_SOCKET"]
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return os.path.join(base, f"ctf-copilot-{os.getuid()}.sock")
+
+class Client:
+    def __init__(self, socket_path=None, timeout=None):
+        self.socket_path = socket_path or default_socket_path()
+        self.timeout = timeout
+        self._sock = None
+        self._file = None
+
+    def connect(self):
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(self.timeout)
+        self._sock.connect(self.socket_path)
+        self._file = self._sock.makefile("rb")
+        return self
+
+    def close(self):
+        if self._file:
+            self._file.close()
+        if self._sock:
+            self._sock.close()
+        self._sock = self._file = None
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def send(self, message):
+        self._sock.sendall(json.dumps(message).encode() + b"\n")
+
+    def receive(self):
+        """Next event from the server, or None once it closed the connection."""
+        line = self._file.readline()
+        return json.loads(line) if line else None
+
+    def analyze(self, targets, no_cache=False, output=False):
+        """
+        Submits every target at once and yields events as the server streams them,
+        in completion order, until each job has sent its "done" event.
+        """
+        pending = set()
+        for job_id, target in enumerate(targets):
+            # The server has its own working directory: send absolute paths
+            if os.path.exists(target):
+                target = os.path.abspath(target)
+            self.send({"id": job_id, "target": target, "no_cache": no_cache, "output": output})
+            pending.add(job_id)
+
+        while pending:
+            event = self.receive()
+            if event is None:
+                raise ConnectionError("server closed the connection with jobs pending")
+            if event.get("event") in ("done", "error"):
+                pending.discard(event.get("id"))
+            yield event
+
+    def ping(self):
+        self.send({"op": "ping"})
+        return self.receive()
+
+    def shutdown(self):
+        self.send({"op": "shutdown"})
+        return self.receive()
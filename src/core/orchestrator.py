@@ -2,55 +2,465 @@
 Component: Orchestrator
 Role: Manages execution flow. Routes input -> Classifier -> Engine.
 """
+import io
+import os
+import sys
+import time
+import signal
+import threading
+import contextlib
+import multiprocessing
+from multiprocessing.connection import wait
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
+from src.core.artifact import Artifact
+from src.core.cache import AnalysisCache
 from src.core.classifier import Classifier
 from src.core.output_manager import OutputManager
+from src.engines import EngineRegistry
+from src.utils import hash_cracker, profiler, rsa_attacks
+from src.utils.config import config_digest, load_config
+from src.utils.flag_extractor import FlagExtractor
+from src.utils.profiler import span
+from src.wrappers.tool_runner import ToolRunner
 
-# Import your engines
-from src.engines.crypto_engine import CryptoEngine
-from src.engines.web_engine import WebEngine
-from src.engines.pwn_engine import PwnEngine
-from src.engines.forensics_engine import ForensicsEngine
-from src.engines.rev_engine import RevEngine
+class _Tee(io.StringIO):
+    """Captures engine output while still passing it through to the console."""
+    def __init__(self, stream):
+        super().__init__()
+        self.stream = stream
+
+    def write(self, s):
+        self.stream.write(s)
+        return super().write(s)
+
+    def flush(self):
+        self.stream.flush()
+
+class _PipeSink:
+    """Forwards findings from a fan-out engine process to the parent as they happen."""
+    def __init__(self, conn):
+        self.conn = conn
+        self._lock = threading.Lock()
+
+    def write(self, record):
+        with self._lock:
+            self.conn.send(('finding', record))
+
+    def close(self):
+        pass
 
 class Orchestrator:
-    def __init__(self):
-        self.out = OutputManager()
+    TOP_K = 3               # Engines tried per target, best-ranked first
+    MIN_CONFIDENCE = 0.2    # Categories ranked below this are not worth an engine run
+
+    def __init__(self, use_cache=True, out=None, top_k=None):
+        self.out = out or OutputManager()
         self.classifier = Classifier()
+        self.use_cache = use_cache
+        self.cache = AnalysisCache() if use_cache else None
         
-        # Map classifier output strings to actual Engine Classes
-        self.engine_map = {
-            'crypto': CryptoEngine,
-            'web': WebEngine,
-            'pwn': PwnEngine,
-            'forensics': ForensicsEngine,
-            'rev': RevEngine,
-            'misc': None 
-        }
+        # Map classifier output strings to actual Engine Classes.
+        # Engines are imported lazily, so only the chosen engine's dependencies load.
+        self.engine_map = EngineRegistry()
+
+        self.config = load_config()
+        settings = self.config.get("orchestrator", {})
+        self.top_k = top_k or settings.get("top_k", self.TOP_K)
+        self.min_confidence = settings.get("min_confidence", self.MIN_CONFIDENCE)
 
     def run(self, target):
+        """Analyzes one target. Returns the list of structured findings."""
+        with span("orchestrator.run", target=target):
+            return self._run(target)
+
+    def _run(self, target):
         self.out.banner()
         self.out.info(f"Orchestrating analysis for: {target}")
         
         # 1. Identify the threat
-        category = self.classifier.identify(target)
+        ranked = self.classifier.rank(target)
         
         # Colorize the classification result
-        self.out.highlight("Classification Result", category.upper())
-        
-        # 2. Select the correct engine
-        engine_class = self.engine_map.get(category)
+        self.out.highlight("Classification Result", ranked[0][0].upper())
+        if len(ranked) > 1:
+            self.out.highlight("Ranking", ", ".join(f"{c} {score:.2f}" for c, score in ranked))
         
-        if not engine_class:
-            self.out.warning(f"No automated engine available for '{category}' yet.")
-            return
+        # 2. Select the engines worth running
+        candidates = self._candidates(ranked)
+        if not candidates:
+            self.out.warning(f"No automated engine available for '{ranked[0][0]}' yet.")
+            return []
 
         # 3. Instantiate and Execute
+        return self._dispatch(target, candidates)
+
+    def _candidates(self, ranked):
+        """Top-k categories that have an engine and enough confidence, best first."""
+        candidates = []
+        for category, score in ranked:
+            if len(candidates) == self.top_k:
+                break
+            if score >= self.min_confidence and self.engine_map.has_engine(category):
+                candidates.append(category)
+        return candidates
+
+    def _dispatch(self, target, candidates):
+        """Runs the candidate engines and returns every finding they recorded."""
+        if len(candidates) == 1:
+            findings, _ = self._run_sequential(target, candidates)
+            return findings
+        return self._fan_out(target, candidates)
+
+    def _run_sequential(self, target, candidates):
+        """
+        Runs the candidate engines one after another, stopping at the first flag.
+        Returns (findings, winning category or None).
+        """
+        findings = []
+        with Artifact(target) as artifact:
+            for category in candidates:
+                try:
+                    self.out.info(f"Handing over to {category.capitalize()} Engine...")
+                    engine_class = self.engine_map.get(category)
+                    _, engine_findings = self._execute(engine_class, target, artifact)
+                except Exception as e:
+                    self.out.error(f"Engine Failure: {e}")
+                    continue
+                findings.extend(engine_findings)
+                if any(f.get('flag') for f in engine_findings):
+                    return findings, category
+        return findings, None
+
+    def _fan_out(self, target, candidates):
+        """
+        Runs every candidate engine in its own process. Findings stream back live;
+        the first flag wins and the engines still running are terminated.
+        Each engine's console output is printed as a block once it finishes.
+        """
+        names = ", ".join(c.capitalize() for c in candidates)
+        self.out.info(f"Handing over to {names} Engines in parallel...")
+
+        # Not fork: this process may own live threads (the NDJSON writer) whose locks
+        # a forked child would inherit mid-use. A fork server starts clean, imports
+        # this module once, and forks each engine process from there.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        if 'forkserver' in methods:
+            context.set_forkserver_preload([__name__])
+
+        running = {}
+        for category in candidates:
+            reader, writer = context.Pipe(duplex=False)
+            process = context.Process(target=_engine_worker, daemon=True,
+                                      args=(category, target, self.use_cache,
+                                            profiler.is_enabled(), writer))
+            process.start()
+            _own_group(process.pid)
+            writer.close()  # The child holds the only write end, so EOF means it exited
+            running[reader] = (category, process)
+
+        findings = []
+        winner = None
+        cancelled = []
+        with span("orchestrator.fan_out", engines=len(candidates)):
+            while running:
+                for reader in wait(list(running)):
+                    if reader not in running:
+                        continue  # Cancelled earlier in this batch
+                    category, process = running[reader]
+                    try:
+                        kind, payload = reader.recv()
+                    except EOFError:
+                        self.out.error(f"{category.capitalize()} Engine Failure: "
+                                       f"process exited with code {process.exitcode}")
+                        self._reap(running, reader)
+                        continue
+
+                    if kind == 'finding':
+                        findings.append(payload)
+                        self.out.emit(payload)
+                        if payload.get('flag') and winner is None:
+                            winner = category
+                            for other in list(running):
+                                if other is not reader:
+                                    cancelled.append(running[other][0])
+                                    self._reap(running, other, terminate=True)
+                        continue
+
+                    output, spans, error = payload
+                    profiler.add_records(spans)
+                    self.out.info(f"{category.capitalize()} Engine finished:")
+                    sys.stdout.write(output)
+                    if error:
+                        self.out.error(f"Engine Failure: {error}")
+                    self._reap(running, reader)
+
+        if winner:
+            self.out.success(f"First flag from the {winner.capitalize()} Engine")
+        if cancelled:
+            self.out.info(f"Cancelled: {', '.join(c.capitalize() for c in cancelled)}")
+        return findings
+
+    @staticmethod
+    def _reap(running, reader, terminate=False):
+        _, process = running.pop(reader)
+        if terminate:
+            # SIGTERM to the engine's whole process group; its handler also kills the
+            # tools it started, which live in sessions of their own (see _cancel)
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+            except (AttributeError, OSError):
+                process.terminate()
+        process.join()
+        reader.close()
+
+    def _execute(self, engine_class, target, artifact):
+        """
+        Runs one engine on a target, serving repeat runs on identical content
+        from the persistent cache. Returns (console output, findings).
+        """
+        key = None
+        if self.cache and getattr(engine_class, 'CACHEABLE', True):
+            sections = FlagExtractor.CONFIG_SECTIONS + getattr(engine_class, 'CONFIG_SECTIONS', ())
+            key = AnalysisCache.key(artifact.sha256, engine_class.__name__,
+                                    getattr(engine_class, 'VERSION', '0'),
+                                    config_digest(self.config, sections))
+            with span("cache.get"):
+                entry = self.cache.get(key)
+            if entry is not None:
+                self.out.info(f"Cached result for {artifact.sha256[:16]} (use --no-cache to re-run)")
+                sys.stdout.write(entry['output'])
+                # The console text is replayed above; findings only go to the sinks
+                findings = [dict(f, target=target, cached=True) for f in entry.get('findings', [])]
+                for record in findings:
+                    self.out.emit(record)
+                return entry['output'], findings
+
+        engine = engine_class(out=self.out)
+        tee = _Tee(sys.stdout)
+        self.out.begin(target, engine_class.__name__)
+        try:
+            with contextlib.redirect_stdout(tee), span(f"engine.{engine_class.__name__}"):
+                engine.execute(target, artifact)
+        finally:
+            findings = self.out.end()
+        output = tee.getvalue()
+
+        if key:
+            self.cache.put(key, {'target': target, 'engine': engine_class.__name__,
+                                 'output': output, 'findings': findings})
+        return output, findings
+
+    def run_many(self, targets, workers=None):
+        """
+        Analyzes many targets on a process pool.
+        'targets' is either a directory (walked recursively) or a list of targets.
+        Results are reported in completion order and returned as a list of dicts.
+        """
+        if isinstance(targets, str):
+            targets = self.collect_targets(targets)
+
+        self.out.banner()
+        self.out.info(f"Batch analysis of {len(targets)} targets "
+                      f"on {workers or os.cpu_count()} workers")
+
+        results = []
+        start = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_analyze_target, t, self.use_cache, profiler.is_enabled()): t
+                       for t in targets}
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {'target': futures[future], 'category': 'misc',
+                              'flags': [], 'findings': [], 'spans': [], 'elapsed': 0.0,
+                              'output': '', 'error': str(e)}
+                results.append(result)
+                profiler.add_records(result.get('spans', []))
+                # Workers have no sinks of their own; forward their findings here
+                for record in result['findings']:
+                    self.out.emit(record)
+                self._report(result)
+
+        self._shared_primes(results)
+        wall = time.perf_counter() - start
+        self._summary(results, wall)
+        return results
+
+    def _shared_primes(self, results):
+        """
+        Batch GCD over the RSA moduli of every target: keys from different files that
+        share a prime factor each other, which no single engine run can see.
+        """
+        keys = []
+        for result in results:
+            for record in result['findings']:
+                if record.get('type') == 'rsa_key':
+                    c = int(record['c'], 16) if record.get('c') else None
+                    keys.append((result, rsa_attacks.RsaKey(int(record['n'], 16), record['e'], c,
+                                                            record.get('detail'))))
+        moduli = len({key.n for _, key in keys})
+        if moduli < 2:
+            return
+
+        with span("orchestrator.batch_gcd", keys=len(keys)):
+            shared = rsa_attacks.shared_factors([key for _, key in keys])
+        self.out.info(f"Batch GCD: {len({key.n for key, _ in shared})} of {moduli} RSA moduli share a prime")
+        owners = {id(key): result for result, key in keys}
+        extractor = FlagExtractor()
+        for key, p in shared:
+            result = owners[id(key)]
+            m = rsa_attacks.decrypt(key, p) if key.c is not None else None
+            flag = extractor.check(rsa_attacks.to_bytes(m).decode('latin-1')) if m is not None else None
+            if flag and flag not in result['flags']:
+                result['flags'].append(flag)
+                self.out.finding('flag', detail=f"RSA batch GCD across targets ({key.source})",
+                                 flag=flag, target=result['target'], engine='Orchestrator')
+
+    @staticmethod
+    def collect_targets(directory):
+        """Walks a challenge directory and returns every regular file in it."""
+        targets = []
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                path = os.path.join(root, name)
+                if os.path.isfile(path):
+                    targets.append(path)
+        return targets
+
+    def _report(self, result):
+        """Prints the outcome of a single batch target."""
+        label = f"{result['target']} [{result['category']}] ({result['elapsed']:.2f}s)"
+        if result['error']:
+            self.out.error(f"{label} Engine Failure: {result['error']}")
+        elif result['flags']:
+            via = f" via {result['winner']}" if result.get('winner') not in (None, result['category']) else ""
+            self.out.success(f"{label} -> {', '.join(result['flags'])}{via}")
+        else:
+            self.out.info(label)
+
+    def _summary(self, results, wall):
+        """Prints the per-target table and the total wall time of a batch."""
+        print("")
+        self.out.info("Batch Summary")
+        for r in results:
+            status = 'ERROR' if r['error'] else ('FLAG' if r['flags'] else '-')
+            self.out.highlight(os.path.basename(r['target']) or r['target'],
+                               f"{r['category']:<10} {r['elapsed']:7.2f}s  {status}")
+
+        solved = sum(1 for r in results if r['flags'])
+        cpu = sum(r['elapsed'] for r in results)
+        self.out.highlight("Targets", len(results))
+        self.out.highlight("Solved", solved)
+        self.out.highlight("Engine Time", f"{cpu:.2f}s")
+        self.out.highlight("Wall Time", f"{wall:.2f}s")
+
+
+# Per-process orchestrators reused by pool workers across targets, keyed by use_cache
+_WORKER_ORCHESTRATORS = {}
+
+def _worker_orchestrator(use_cache):
+    if use_cache not in _WORKER_ORCHESTRATORS:
+        _WORKER_ORCHESTRATORS[use_cache] = Orchestrator(use_cache=use_cache)
+    return _WORKER_ORCHESTRATORS[use_cache]
+
+def warm_worker():
+    """Pool initializer: imports every engine up front so the first job pays no import cost."""
+    hash_cracker.disable_pool()
+    orchestrator = _worker_orchestrator(True)
+    with contextlib.redirect_stdout(io.StringIO()):
+        orchestrator.classifier.identify(__file__)
+    for category in orchestrator.engine_map:
+        orchestrator.engine_map.get(category)
+
+def _own_group(pid=0):
+    """Makes a fan-out process the leader of its own process group (called on both sides, racing)."""
+    if hasattr(os, "setpgid"):
         try:
-            # Note: Ideally, engines would also accept 'self.out' to print colors,
-            # but for now we just run them as-is.
-            engine = engine_class()
-            self.out.info(f"Handing over to {category.capitalize()} Engine...")
-            engine.execute(target)
-        except Exception as e:
-            self.out.error(f"Engine Failure: {e}")
\ No newline at end of file
+            os.setpgid(pid, pid)
+        except OSError:
+            pass    # Already done by the other side, or the process is gone
+
+def _cancel(signum, frame):
+    """SIGTERM in a fan-out process: another engine won. Stop this one's tools, then exit."""
+    ToolRunner.kill_all()
+    os._exit(128 + signum)
+
+def _engine_worker(category, target, use_cache, profile, conn):
+    """
+    Fan-out process: runs one engine on one target. Findings are sent as they are
+    recorded; the captured console output, spans and error follow once it is done.
+    """
+    _own_group()
+    signal.signal(signal.SIGTERM, _cancel)
+    hash_cracker.disable_pool()     # Daemonic: may not start a pool of its own
+    if profile:
+        profiler.enable()
+        profiler.reset()
+    out = OutputManager(sinks=[_PipeSink(conn)])
+    orchestrator = Orchestrator(use_cache=use_cache, out=out)
+    buffer = io.StringIO()
+    error = None
+    try:
+        # Resolve (import) the engine outside the redirect: pwntools needs a real stdout
+        engine_class = orchestrator.engine_map.get(category)
+        with contextlib.redirect_stdout(buffer), Artifact(target) as artifact:
+            orchestrator._execute(engine_class, target, artifact)
+    except Exception as e:
+        error = str(e)
+    conn.send(('done', (buffer.getvalue(), profiler.records() if profile else [], error)))
+    conn.close()
+
+def _analyze_target(target, use_cache=True, profile=False):
+    """
+    Process pool worker: classifies and runs one target, capturing engine output.
+    Lives at module level so it can be pickled by the pool.
+    The candidate engines run one after another here: the pool already keeps
+    every CPU busy with other targets (which is also why hash cracking runs inline).
+    """
+    hash_cracker.disable_pool()
+    start = time.perf_counter()
+    buffer = io.StringIO()
+    category = 'misc'
+    winner = None
+    error = None
+
+    findings = []
+    if profile:
+        # Pool workers are reused, so only ship back this target's spans
+        profiler.enable()
+        profiler.reset()
+
+    orchestrator = _worker_orchestrator(use_cache)
+    try:
+        with contextlib.redirect_stdout(buffer):
+            ranked = orchestrator.classifier.rank(target)
+        category = ranked[0][0]
+        candidates = orchestrator._candidates(ranked)
+        # Resolve (import) the engines outside the redirect: pwntools needs a real stdout
+        for candidate in candidates:
+            orchestrator.engine_map.get(candidate)
+        if candidates:
+            with contextlib.redirect_stdout(buffer):
+                findings, winner = orchestrator._run_sequential(target, candidates)
+    except Exception as e:
+        error = str(e)
+
+    output = buffer.getvalue()
+    flags = sorted({f['flag'] for f in findings if f.get('flag')})
+
+    return {
+        'target': target,
+        'category': category,
+        'winner': winner,
+        'flags': flags,
+        'findings': findings,
+        'spans': profiler.records() if profile else [],
+        'elapsed': time.perf_counter() - start,
+        'output': output,
+        'error': error,
+    }
@@ -1,13 +1,75 @@
 """
 Component: Output Module
-Role: Handles standardized, colored output for the CLI.
+Role: Handles standardized, colored output for the CLI and structured findings
+      (NDJSON) for machine consumers such as scoreboard tooling.
 """
+import sys
+import json
+import time
+import queue
+import threading
 from colorama import init, Fore, Style
 
+class NDJSONSink:
+    """
+    Buffered newline-delimited JSON writer. Records are queued by the caller and
+    serialized/written in batches by a background thread, so the hot path never
+    blocks on I/O.
+    """
+    def __init__(self, stream, batch_size=256, owns_stream=False):
+        self.stream = stream
+        self.owns_stream = owns_stream
+        self.batch_size = batch_size
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._writer, name="ndjson-sink", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def open(cls, path):
+        """Appends to a file; '-' means stdout."""
+        if path == '-':
+            return cls(sys.stdout)
+        return cls(open(path, 'a', encoding='utf-8'), owns_stream=True)
+
+    def write(self, record):
+        self._queue.put(record)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        if self.owns_stream:
+            self.stream.close()
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            # Drain whatever else is already waiting, up to one batch
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            done = None in batch
+            lines = [json.dumps(r, default=str) + "\n" for r in batch if r is not None]
+            if lines:
+                self.stream.write("".join(lines))
+                self.stream.flush()
+            if done:
+                return
+
 class OutputManager:
-    def __init__(self):
+    def __init__(self, sinks=None, console=True):
         # Initialize colorama (autoreset=True resets color after each print)
         init(autoreset=True)
+        self.sinks = list(sinks or [])
+        self.console = console
+        # Current target/engine, per thread, stamped onto every finding
+        self._local = threading.local()
 
     def success(self, message):
         """Prints a success message (Green)."""
@@ -33,4 +95,62 @@ class OutputManager:
         """Prints the tool banner."""
         print(f"{Fore.MAGENTA}---------------------------------------")
         print(f"{Fore.MAGENTA}      CTF COPILOT - v1.0 Alpha         ")
-        print(f"{Fore.MAGENTA}---------------------------------------{Style.RESET_ALL}")
\ No newline at end of file
+        print(f"{Fore.MAGENTA}---------------------------------------{Style.RESET_ALL}")
+
+    # --- Structured findings ---
+
+    def begin(self, target, engine):
+        """Starts collecting findings for one engine run on one target."""
+        self._local.context = {'target': target, 'engine': engine,
+                               'start': time.perf_counter(), 'findings': []}
+
+    def end(self):
+        """Stops collecting and returns the findings recorded since begin()."""
+        context = getattr(self._local, 'context', None)
+        self._local.context = None
+        return context['findings'] if context else []
+
+    def finding(self, kind, detail=None, flag=None, offset=None, quiet=False, **extra):
+        """
+        Records a structured finding (kind: 'flag', 'header', 'packer', ...),
+        renders it on the console and forwards it to every sink.
+        'quiet' skips the console rendering when the engine prints its own view.
+        """
+        context = getattr(self._local, 'context', None) or {}
+        start = context.get('start')
+        record = {
+            'target': context.get('target'),
+            'engine': context.get('engine'),
+            'type': kind,
+            'flag': flag,
+            'offset': offset,
+            'detail': detail,
+            'duration': round(time.perf_counter() - start, 6) if start else None,
+        }
+        record.update(extra)
+
+        if 'findings' in context:
+            context['findings'].append(record)
+        if self.console and not quiet:
+            self.render(record)
+        self.emit(record)
+        return record
+
+    def emit(self, record):
+        """Forwards an already-built record to the sinks only (no console output)."""
+        for sink in self.sinks:
+            sink.write(record)
+
+    def render(self, record):
+        """Colored console rendering of a finding."""
+        where = f" @ 0x{record['offset']:x}" if record.get('offset') is not None else ""
+        if record['flag']:
+            label = f" [{record['detail']}]" if record.get('detail') else ""
+            print(f"{Fore.GREEN}[+] FLAG{label}{where}: {Style.BRIGHT}{record['flag']}")
+        else:
+            print(f"{Fore.GREEN}[+]{Style.RESET_ALL} {record['type']}{where}: {record['detail']}")
+
+    def close(self):
+        """Flushes and closes every sink."""
+        for sink in self.sinks:
+            sink.close()
@@ -0,0 +1,154 @@
+"""
+Component: Analysis Server
+Role: Long-lived daemon (main.py --serve). Keeps a process pool with every engine
+already imported and accepts jobs over a local Unix socket, streaming results
+back as NDJSON (see src/core/client.py for the protocol). Connections are served
+concurrently and a connection may pipeline any number of jobs.
+"""
+import os
+import json
+import signal
+import asyncio
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from src.core.client import default_socket_path
+from src.core.orchestrator import _analyze_target, warm_worker
+from src.core.output_manager import OutputManager
+
+class AnalysisServer:
+    def __init__(self, socket_path=None, workers=None, use_cache=True, out=None):
+        self.socket_path = socket_path or default_socket_path()
+        self.workers = workers or os.cpu_count() or 1
+        self.use_cache = use_cache
+        self.out = out or OutputManager()
+        self.jobs = 0
+        self._pool = None
+        self._stop = None
+        self._loop = None
+
+    def serve_forever(self):
+        asyncio.run(self.serve())
+
+    async def serve(self, ready=None):
+        """Runs until SIGINT/SIGTERM or a shutdown request. 'ready' (an Event) is set once listening."""
+        loop = self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        self._pool = await self._start_pool()
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)  # Stale socket from a previous run
+        server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+                loop.add_signal_handler(sig, self._stop.set)
+
+        self.out.success(f"Serving on {self.socket_path} with {self.workers} warm workers")
+        if ready:
+            ready.set()
+        try:
+            async with server:
+                await self._stop.wait()
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                with contextlib.suppress(NotImplementedError, RuntimeError, ValueError):
+                    loop.remove_signal_handler(sig)
+            self._pool.shutdown(cancel_futures=True)
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(self.socket_path)
+            self.out.info(f"Server stopped after {self.jobs} jobs.")
+
+    def stop(self):
+        """Asks the server to shut down; safe to call from any thread."""
+        if self._stop:
+            with contextlib.suppress(RuntimeError):  # Loop already closed
+                self._loop.call_soon_threadsafe(self._stop.set)
+
+    async def _start_pool(self):
+        """Starts the pool and waits until every worker has imported the engines."""
+        pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(pool, os.getpid) for _ in range(self.workers)))
+        return pool
+
+    async def _handle(self, reader, writer):
+        """One client connection: reads requests line by line, runs jobs concurrently."""
+        lock = asyncio.Lock()
+        jobs = set()
+
+        async def send(message):
+            async with lock:
+                writer.write(json.dumps(message, default=str).encode() + b"\n")
+                await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    await send({"event": "error", "error": "invalid JSON"})
+                    continue
+
+                op = request.get("op", "analyze")
+                if op == "analyze":
+                    job = asyncio.create_task(self._job(request, send))
+                    jobs.add(job)
+                    job.add_done_callback(jobs.discard)
+                elif op == "ping":
+                    await send({"id": request.get("id"), "event": "pong",
+                                "workers": self.workers, "jobs": self.jobs})
+                elif op == "shutdown":
+                    await send({"id": request.get("id"), "event": "bye"})
+                    self.stop()
+                    break
+                else:
+                    await send({"id": request.get("id"), "event": "error",
+                                "error": f"unknown op: {op}"})
+            # Let this client's in-flight jobs finish before hanging up
+            if jobs:
+                await asyncio.gather(*jobs, return_exceptions=True)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _job(self, request, send):
+        try:
+            await self._run_job(request, send)
+        except ConnectionError:
+            pass  # Client went away; the result is dropped
+
+    async def _run_job(self, request, send):
+        job_id = request.get("id")
+        target = request.get("target")
+        if not isinstance(target, str) or not target:
+            await send({"id": job_id, "event": "error", "error": "missing target"})
+            return
+
+        use_cache = self.use_cache and not request.get("no_cache")
+        await send({"id": job_id, "event": "accepted", "target": target})
+        loop = asyncio.get_running_loop()
+        pool = self._pool
+        try:
+            result = await loop.run_in_executor(pool, _analyze_target, target, use_cache)
+        except BrokenProcessPool as e:
+            # A worker died (e.g. OOM); replace the pool once so later jobs still run
+            if self._pool is pool:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers, initializer=warm_worker)
+            result = {'target': target, 'category': 'misc', 'flags': [], 'findings': [],
+                      'elapsed': 0.0, 'output': '', 'error': f"worker crashed: {e}"}
+        self.jobs += 1
+
+        for record in result['findings']:
+            await send(dict(record, id=job_id, event="finding"))
+        done = {key: result[key] for key in ('target', 'category', 'flags', 'elapsed', 'error')}
+        if request.get("output"):
+            done['output'] = result['output']
+        await send(dict(done, id=job_id, event="done"))
+
+        status = ', '.join(result['flags']) or result['error'] or '-'
+        self.out.info(f"{target} [{result['category']}] {result['elapsed'] * 1000:.0f}ms {status}")
@@ -0,0 +1,137 @@
+"""
+Component: File Signatures
+Role: Built-in magic-byte table so classification does not depend on libmagic.
+"""
+import struct
+
+# Bytes read from the start of each file; enough for tar headers and ELF program headers
+HEADER_SIZE = 4096
+
+# (offset, magic bytes, MIME type). Longer magics win over shorter ones at the same offset.
+SIGNATURES = [
+    # Executables
+    (0, b"\x7fELF", "application/x-executable"),           # Refined by _refine_elf
+    (0, b"MZ", "application/x-dosexec"),
+    (0, b"\xfe\xed\xfa\xce", "application/x-mach-binary"),  # Mach-O 32-bit BE
+    (0, b"\xce\xfa\xed\xfe", "application/x-mach-binary"),  # Mach-O 32-bit LE
+    (0, b"\xfe\xed\xfa\xcf", "application/x-mach-binary"),  # Mach-O 64-bit BE
+    (0, b"\xcf\xfa\xed\xfe", "application/x-mach-binary"),  # Mach-O 64-bit LE
+    (0, b"\xca\xfe\xba\xbe", "application/x-mach-binary"),  # Mach-O universal (also Java class)
+    # Images
+    (0, b"\x89PNG\r\n\x1a\n", "image/png"),
+    (0, b"\xff\xd8\xff", "image/jpeg"),
+    (0, b"GIF87a", "image/gif"),
+    (0, b"GIF89a", "image/gif"),
+    # Archives and compressed streams
+    (0, b"PK\x03\x04", "application/zip"),
+    (0, b"PK\x05\x06", "application/zip"),                 # Empty archive
+    (0, b"PK\x07\x08", "application/zip"),                 # Spanned archive
+    (257, b"ustar", "application/x-tar"),
+    (0, b"\x1f\x8b", "application/gzip"),
+    (0, b"7z\xbc\xaf\x27\x1c", "application/x-7z-compressed"),
+    (0, b"BZh", "application/x-bzip2"),
+    (0, b"\xfd7zXZ\x00", "application/x-xz"),
+    # Network captures
+    (0, b"\xd4\xc3\xb2\xa1", "application/vnd.tcpdump.pcap"),  # LE, microseconds
+    (0, b"\xa1\xb2\xc3\xd4", "application/vnd.tcpdump.pcap"),  # BE, microseconds
+    (0, b"\x4d\x3c\xb2\xa1", "application/vnd.tcpdump.pcap"),  # LE, nanoseconds
+    (0, b"\xa1\xb2\x3c\x4d", "application/vnd.tcpdump.pcap"),  # BE, nanoseconds
+    (0, b"\x0a\x0d\x0d\x0a", "application/x-pcapng"),
+    # Documents
+    (0, b"%PDF-", "application/pdf"),
+]
+
+def _build_index(signatures):
+    """
+    Groups signatures by offset, then by their first two bytes, so a lookup is one
+    dict probe per distinct offset instead of a scan over the whole table.
+    """
+    index = {}
+    for offset, magic, mime in signatures:
+        bucket = index.setdefault(offset, {}).setdefault(magic[:2], [])
+        bucket.append((magic, mime))
+    for buckets in index.values():
+        for bucket in buckets.values():
+            bucket.sort(key=lambda entry: len(entry[0]), reverse=True)
+    return index
+
+_INDEX = _build_index(SIGNATURES)
+
+def identify_header(header):
+    """Returns the MIME type for a file header, or None when no signature matches."""
+    for offset, buckets in _INDEX.items():
+        for magic, mime in buckets.get(header[offset:offset + 2], ()):
+            if header.startswith(magic, offset):
+                if mime == "application/x-executable":
+                    return _refine_elf(header)
+                return mime
+
+    if _is_pyc(header):
+        return "application/x-bytecode.python"
+    return None
+
+def looks_like_text(header):
+    """Heuristic for plain text: no NUL bytes and almost entirely printable/UTF-8."""
+    if not header or b"\x00" in header:
+        return False
+    try:
+        text = header.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off by the header boundary is still text
+        if e.start < len(header) - 3:
+            return False
+        text = header[:e.start].decode('utf-8')
+    printable = sum(1 for c in text if c.isprintable() or c in "\r\n\t\f")
+    return printable >= 0.95 * len(text)
+
+# CPython bytecode magic numbers: every 3.x release (3.0 = 3000 ... 3.14 in the 3600s)
+# and the 2.3 - 2.7 ones, which are few and far apart
+PYC_MAGIC_3X = range(3000, 3700)
+PYC_MAGIC_2X = {62011, 62021, 62041, 62051, 62061, 62071, 62081, 62091, 62092,
+                62101, 62111, 62121, 62131, 62151, 62161, 62171, 62181, 62191, 62201, 62211}
+PYC_FLAGS_SINCE = 3390          # 3.7 (PEP 552) added a flags word: 0, 1 (hash) or 3 (checked hash)
+
+def _is_pyc(header):
+    """CPython bytecode: a known 2-byte version magic, '\\r\\n', then a flags/timestamp word."""
+    if len(header) < 16 or header[2:4] != b"\r\n":
+        return False
+    magic = struct.unpack("<H", header[:2])[0]
+    if magic not in PYC_MAGIC_3X and magic not in PYC_MAGIC_2X:
+        return False
+    if magic in PYC_MAGIC_3X and magic >= PYC_FLAGS_SINCE and \
+            struct.unpack("<I", header[4:8])[0] not in (0, 1, 3):
+        return False
+    # A header that reads as text is a note, whatever its first bytes happen to be
+    return not looks_like_text(header)
+
+def _refine_elf(header):
+    """Distinguishes ELF executables, PIE executables and shared libraries via e_type and PT_INTERP."""
+    if len(header) < 52:
+        return "application/x-executable"
+
+    endian = "<" if header[5] == 1 else ">"
+    is_64 = header[4] == 2
+    e_type = struct.unpack_from(endian + "H", header, 16)[0]
+
+    if e_type == 1:
+        return "application/x-object"
+    if e_type != 3:  # ET_EXEC and anything exotic
+        return "application/x-executable"
+
+    # ET_DYN: PIE executables request an interpreter, shared libraries usually do not
+    try:
+        if is_64:
+            e_phoff = struct.unpack_from(endian + "Q", header, 32)[0]
+            e_phentsize, e_phnum = struct.unpack_from(endian + "HH", header, 54)
+        else:
+            e_phoff = struct.unpack_from(endian + "I", header, 28)[0]
+            e_phentsize, e_phnum = struct.unpack_from(endian + "HH", header, 42)
+
+        for i in range(e_phnum):
+            p_type = struct.unpack_from(endian + "I", header, e_phoff + i * e_phentsize)[0]
+            if p_type == 3:  # PT_INTERP
+                return "application/x-pie-executable"
+    except struct.error:
+        # Program headers beyond the header window; assume the common case
+        return "application/x-pie-executable"
+    return "application/x-sharedlib"
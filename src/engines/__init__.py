@@ -0,0 +1,59 @@
+"""
+Engine Registry
+Maps classifier categories to engine classes, importing each engine module only
+when its category is actually requested (pwntools, requests, etc. are slow to import).
+"""
+import importlib
+
+# category -> "module:ClassName"
+DEFAULT_ENGINES = {
+    'crypto': 'src.engines.crypto_engine:CryptoEngine',
+    'web': 'src.engines.web_engine:WebEngine',
+    'pwn': 'src.engines.pwn_engine:PwnEngine',
+    'forensics': 'src.engines.forensics_engine:ForensicsEngine',
+    'rev': 'src.engines.rev_engine:RevEngine',
+    'misc': None,
+}
+
+class EngineRegistry:
+    def __init__(self, engines=None):
+        self._specs = dict(DEFAULT_ENGINES if engines is None else engines)
+        self._loaded = {}
+
+    def register(self, category, spec):
+        """Registers an engine as a "module:ClassName" string or a class object."""
+        self._specs[category] = spec
+        self._loaded.pop(category, None)
+
+    def get(self, category, default=None):
+        """Returns the engine class for a category, importing its module on first use."""
+        if category not in self._specs:
+            return default
+        if category not in self._loaded:
+            self._loaded[category] = self._resolve(self._specs[category])
+        return self._loaded[category]
+
+    def __getitem__(self, category):
+        if category not in self._specs:
+            raise KeyError(category)
+        return self.get(category)
+
+    def has_engine(self, category):
+        """True if the category maps to an engine (misc has none), without importing it."""
+        return self._specs.get(category) is not None
+
+    def __contains__(self, category):
+        return category in self._specs
+
+    def __iter__(self):
+        return iter(self._specs)
+
+    def is_loaded(self, category):
+        return category in self._loaded
+
+    @staticmethod
+    def _resolve(spec):
+        if spec is None or not isinstance(spec, str):
+            return spec
+        module_name, _, class_name = spec.partition(':')
+        return getattr(importlib.import_module(module_name), class_name)
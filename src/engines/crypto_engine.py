@@ -3,74 +3,441 @@ Engine: Crypto
 Role: Automated workflow for basic encoding and cipher challenges.
 """
 import os
+import re
+import math
+import time
+import heapq
 import base64
+import binascii
 import codecs
+import urllib.parse
+from collections import Counter
+from src.core.artifact import Artifact
+from src.core.output_manager import OutputManager
+from src.utils.config import load_config
 from src.utils.flag_extractor import FlagExtractor
+from src.utils.profiler import span
+from src.utils import hash_cracker, rsa_attacks, xor_cracker
+
+# Wordlists used for hash cracking when the config names none
+DEFAULT_WORDLISTS = ["/usr/share/wordlists/rockyou.txt", "/usr/share/dict/words"]
 
 class CryptoEngine:
-    def __init__(self):
+    VERSION = "1.7"
+    CONFIG_SECTIONS = ("crypto", "hashes")     # Config read by __init__, part of the cache key
+
+    # Search limits, overridable through the "crypto" section of the config file
+    MAX_DEPTH = 6
+    MAX_NODES = 20000
+    TIME_BUDGET = 3.0
+    # Intermediate results scoring below this are pruned (see _score)
+    MIN_SCORE = 0.15
+    # XOR cracking: longest repeating key tried, largest input attacked (a key repeats
+    # within the first few KB, so more bytes only cost time)
+    MAX_KEY_LENGTH = xor_cracker.MAX_KEY_LENGTH
+    MAX_XOR_BYTES = 64 * 1024
+
+    def __init__(self, out=None, max_depth=None, max_nodes=None, time_budget=None):
+        self.out = out or OutputManager()
         self.extractor = FlagExtractor()
+        settings = load_config().get("crypto", {})
+        self.max_depth = max_depth or settings.get("max_depth", self.MAX_DEPTH)
+        self.max_nodes = max_nodes or settings.get("max_nodes", self.MAX_NODES)
+        self.time_budget = time_budget or settings.get("time_budget", self.TIME_BUDGET)
+        self.max_key_length = settings.get("max_key_length", self.MAX_KEY_LENGTH)
+        self.max_xor_bytes = settings.get("max_xor_bytes", self.MAX_XOR_BYTES)
+        # Known plaintext for XOR: every flag prefix followed by '{', in both cases
+        prefixes = self.extractor.literal_prefixes() or []
+        self.cribs = [c + b"{" for p in prefixes for c in dict.fromkeys((p, p.upper()))]
+        # Hash cracking: wordlists streamed to a process pool, see the "hashes" config section
+        hashes = load_config().get("hashes", {})
+        self.wordlists = hashes.get("wordlists", [path for path in DEFAULT_WORDLISTS if os.path.exists(path)])
+        self.hash_rules = hashes.get("rules", [])
+        self.hash_workers = hashes.get("workers")
+        # RSA: Fermat iterations shared by all the keys of one target
+        self.fermat_rounds = settings.get("fermat_rounds", rsa_attacks.FERMAT_ROUNDS)
+        # Flag-format candidates: every word is also tried as PREFIX{word}
+        self.hash_wrappers = []
+        if hashes.get("flag_candidates", True):
+            formats = self.extractor.literal_prefixes(lower=False) or []
+            self.hash_wrappers = list(dict.fromkeys(c for p in formats for c in (p, p.lower(), p.upper())))
 
-    def execute(self, target):
+        # List of decoding strategies to try
+        self.strategies = [
+            ("Base64", self._try_base64),
+            ("Base32", self._try_base32),
+            ("Base85", self._try_base85),
+            ("Hex", self._try_hex),
+            ("URL", self._try_url),
+            ("Binary", self._try_binary),
+            ("Decimal", self._try_decimal),
+            ("Reverse", self._try_reverse),
+            ("ROT13", self._try_rot13)
+        ]
+        self._strategy_map = dict(self.strategies)
+        # Memo of (strategy, input) -> output, so chains sharing a prefix decode it once
+        self._memo = {}
+
+    def execute(self, target, artifact=None):
         # 1. SMART LOAD: If target is a file path, read the content.
         if os.path.exists(target):
-            print(f"[*] [Crypto] detected file path. Reading content from: {target}")
+            self.out.info(f"[Crypto] detected file path. Reading content from: {target}")
             try:
-                with open(target, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read().strip()
+                artifact = artifact or Artifact(target)
+                content = artifact.text().strip()
             except Exception as e:
-                print(f"[!] Error reading file: {e}")
+                self.out.warning(f"Error reading file: {e}")
                 return
         else:
             # It's just a raw string
             content = target
 
-        print(f"[*] [Crypto] Attempting generic decodes on: {content[:30]}...")
-        
-        # List of decoding strategies to try
-        strategies = [
-            ("Base64", self._try_base64),
-            ("Hex", self._try_hex),
-            ("Reverse", self._try_reverse),
-            ("ROT13", self._try_rot13)
-        ]
+        # RSA parameters (PEM/DER keys, n=/e=/c= values) get the factoring attacks instead
+        keys = rsa_attacks.parse(artifact.data if artifact is not None else content)
+        if keys:
+            with span("crypto.rsa"):
+                self._attack_rsa(keys)
+            return
+
+        # Hex digests look like hex-encoded data but only a dictionary attack gets anything out of them
+        hashes = content.split()
+        if hashes and all(hash_cracker.identify(h) and not bytes.fromhex(h).isascii() for h in hashes):
+            with span("crypto.hashes"):
+                if self._crack_hashes(hashes):
+                    return
+
+        self.out.info(f"[Crypto] Attempting generic decodes on: {content[:30]}...")
+
+        # Single-step decodes first, so readable intermediate results are still shown
+        for name, _ in self.strategies:
+            result = self._decode(name, content)
+            if result and not self.extractor.check(result):
+                # Only print if it looks like readable text (no weird bytes)
+                if result.isprintable() and len(result) > 4:
+                    self.out.highlight(f"[{name}] Decoded", result)
+
+        self.out.info(f"[Crypto] Searching decoder chains (depth <= {self.max_depth})...")
+        with span("crypto.search"):
+            chain, flag, stats = self.search(content)
+
+        if flag:
+            self.out.finding('flag', detail=' -> '.join(chain) or 'Plaintext', flag=flag, chain=chain)
+        else:
+            self.out.error("No obvious flags found with basic decoders.")
+        self.out.highlight("Search", f"{stats['nodes']} chains explored in {stats['elapsed']:.2f}s"
+                                     f"{', budget exhausted' if stats['exhausted'] else ''}")
+        if not flag:
+            with span("crypto.xor"):
+                self._xor_inputs(content, artifact)
+
+    def _attack_rsa(self, keys):
+        """Runs every fast RSA attack on the keys; decrypts each ciphertext whose key falls."""
+        sizes = sorted({key.n.bit_length() for key in keys})
+        self.out.info(f"[Crypto] {len(keys)} RSA key(s) ({', '.join(map(str, sizes))} bits). Running attacks...")
+        for key in keys:
+            # Quiet: a batch run looks for primes shared across targets (Orchestrator.run_many)
+            self.out.finding('rsa_key', detail=key.source, quiet=True, n=hex(key.n), e=key.e,
+                             c=hex(key.c) if key.c is not None else None)
+
+        plaintexts = []     # (key, attack, plaintext int)
+        factors = {}        # n -> (attack, prime)
+        rounds = max(1000, self.fermat_rounds // len(keys))
+        for key in keys:
+            m = rsa_attacks.small_e(key)
+            if m is not None:
+                plaintexts.append((key, "small e root", m))
+                continue
+            if key.n in factors:
+                continue
+            with span("rsa.factor"):
+                for attack, find in (("Fermat", lambda: rsa_attacks.fermat(key.n, rounds)),
+                                     ("Wiener", lambda: rsa_attacks.wiener(key.n, key.e))):
+                    p = find()
+                    if p:
+                        factors[key.n] = (attack, p)
+                        break
+
+        ciphered = [key for key in keys if key.c is not None]
+        for i, first in enumerate(ciphered):
+            for second in ciphered[i + 1:]:
+                m = rsa_attacks.common_modulus(first, second)
+                if m is not None:
+                    plaintexts.append((first, "common modulus", m))
+        if len({key.n for key in keys}) > 1:
+            with span("rsa.batch_gcd"):
+                for key, p in rsa_attacks.shared_factors(keys):
+                    factors.setdefault(key.n, ("batch GCD", p))
 
-        found_flag = False
+        for key in keys:
+            if key.n in factors:
+                attack, p = factors[key.n]
+                if key.c is not None:
+                    m = rsa_attacks.decrypt(key, p)
+                    if m is not None:
+                        plaintexts.append((key, attack, m))
+        for n, (attack, p) in factors.items():
+            self.out.finding('rsa_factored', detail=f"{attack}: {n.bit_length()}-bit n = p * q",
+                             p=hex(p), q=hex(n // p))
 
-        for name, method in strategies:
+        found = False
+        for key, attack, m in plaintexts:
+            text = rsa_attacks.to_bytes(m).decode('latin-1')
+            flag = self.extractor.check(text)
+            if flag:
+                found = True
+                self.out.finding('flag', detail=f"RSA {attack} ({key.source})", flag=flag)
+            else:
+                self.out.highlight(f"[RSA {attack}] Decrypted", text[:80])
+        if not found:
+            self.out.error("No flags recovered from RSA attacks.")
+        return found
+
+    def _crack_hashes(self, hashes):
+        """Identifies and cracks hex digests. Returns True once every hash is cracked."""
+        for digest in dict.fromkeys(hashes):
+            self.out.highlight("Hash type", f"{digest[:16]}... ({len(digest) * 4} bits): "
+                                            f"{', '.join(hash_cracker.identify(digest))}")
+        try:
+            cracker = hash_cracker.HashCracker(workers=self.hash_workers, rules=self.hash_rules,
+                                               wrappers=self.hash_wrappers)
+        except ValueError as e:
+            self.out.warning(f"Hash cracking disabled: {e}")
+            return False
+        if not self.wordlists:
+            self.out.warning("No wordlist found (set hashes.wordlists in the config); "
+                             "trying built-in common passwords only.")
+        self.out.info(f"[Crypto] Cracking {len(set(hashes))} hash(es) with "
+                      f"{len(self.wordlists)} wordlist(s) on {cracker.workers} worker(s)...")
+        try:
+            results, stats = cracker.crack(hashes, self.wordlists)
+        except OSError as e:
+            self.out.warning(f"Wordlist error: {e}")
+            return False
+
+        for digest in dict.fromkeys(h.lower() for h in hashes):
+            if digest not in results:
+                continue
+            algorithm, plaintext = results[digest]
+            text = plaintext.decode('utf-8', errors='replace')
+            flag = self.extractor.check(text)
+            if flag:
+                self.out.finding('flag', detail=f"{algorithm} preimage", flag=flag, hash=digest)
+            else:
+                self.out.finding('hash_cracked', detail=f"{algorithm}({text})", hash=digest,
+                                 algorithm=algorithm, plaintext=text)
+        self.out.highlight("Hashes", f"{stats['hashes']} hashes of {stats['words']} words in "
+                                     f"{stats['elapsed']:.2f}s ({stats['rate']:,.0f} hashes/s)")
+        if not results:
+            self.out.error("No hash cracked.")
+        return len(results) == len({h.lower() for h in hashes})
+
+    def _xor_inputs(self, content, artifact):
+        """Attacks the raw file bytes, or the string as hex/base64, as XOR ciphertext."""
+        if not xor_cracker.NUMPY_AVAILABLE:
+            self.out.warning("numpy not installed; skipping XOR cracking.")
+            return
+        inputs = []
+        if artifact is not None and artifact.is_file:
+            inputs.append(("file", bytes(artifact.data[:self.max_xor_bytes])))
+        for name, decode in (("hex", self._raw_hex), ("base64", self._raw_base64)):
             try:
-                result = method(content)
-                if result:
-                    # check if the result looks like a flag
-                    flag = self.extractor.check(result)
-                    if flag:
-                        print(f"\n[+] SUCCESS! Strategy [{name}] found a flag:")
-                        print(f"    >> {flag}")
-                        found_flag = True
-                    else:
-                        # Only print if it looks like readable text (no weird bytes)
-                        if result.isprintable() and len(result) > 4:
-                            print(f"    - [{name}] Decoded: {result}")
+                raw = decode(content)
+            except (ValueError, binascii.Error):
+                raw = None
+            if raw:
+                inputs.append((name, raw[:self.max_xor_bytes]))
+
+        # Every input shares one time budget, like the decoder chain search
+        deadline = time.perf_counter() + self.time_budget
+        for name, data in inputs:
+            if time.perf_counter() > deadline:
+                self.out.warning("XOR time budget exhausted.")
+                break
+            self.out.info(f"[Crypto] Cracking XOR on {len(data)} {name} bytes...")
+            result, flag = self.crack_xor(data, deadline)
+            if flag:
+                self.out.finding('flag', detail=f"XOR key {result.key.hex()} (length {len(result.key)})",
+                                 flag=flag, key=result.key.hex())
+                return
+            if result:
+                preview = result.plaintext[:80].decode('latin-1')
+                self.out.highlight(f"[XOR {result.key.hex()}] Decoded", preview)
+        if inputs:
+            self.out.error("No flags found with XOR keys.")
+
+    def crack_xor(self, data, deadline=None):
+        """
+        Single-byte and repeating-key XOR. Returns (best plausible XorResult or None, flag or None).
+        Key lengths are tried most likely first and the search stops at the first length
+        with a flag, or once time.perf_counter() passes 'deadline'. Wrong crib
+        placements can spell out a flag-shaped string too, so of that length's
+        candidates the most English-like one wins, and only a plaintext that is
+        printable throughout and reads clearly better than the data as it is
+        (plain text is its own best "decryption") counts.
+        """
+        best = None
+        baseline = xor_cracker.score(data)
+        for length in [1] + xor_cracker.key_lengths(data, self.max_key_length):
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            scores = xor_cracker.column_scores(data, length)
+            candidates = [xor_cracker.solve(data, length)]
+            for crib in self.cribs:
+                if deadline is not None and time.perf_counter() > deadline:
+                    break
+                candidates += xor_cracker.crib_keys(data, length, crib, scores)
+            candidates.sort(key=lambda result: result.score, reverse=True)
+            for result in candidates:
+                if result.printable < xor_cracker.MIN_PRINTABLE or \
+                        result.score < baseline + xor_cracker.MIN_GAIN:
+                    continue
+                flag = self.extractor.check(result.plaintext.decode('latin-1'))
+                if flag:
+                    return result, flag
+                if best is None or result.score > best.score:
+                    best = result
+        return best, None
+
+    @staticmethod
+    def _raw_hex(data):
+        clean = re.sub(r"\s|0x", "", data)
+        if not re.fullmatch(r"(?:[0-9a-fA-F]{2})+", clean):
+            return None
+        return bytes.fromhex(clean)
+
+    @staticmethod
+    def _raw_base64(data):
+        clean = re.sub(r"\s", "", data)
+        if not re.fullmatch(r"[A-Za-z0-9+/]+={0,2}", clean) or len(clean) % 4:
+            return None
+        return base64.b64decode(clean)
+
+    def search(self, content):
+        """
+        Best-first search over decoder chains.
+        Returns (chain, flag, stats); chain is the list of strategy names applied in order.
+        Identical intermediate results are expanded only once, results that stop looking
+        like encoded text are pruned, and the search stops at the first flag or when
+        the node/time budget runs out.
+        """
+        start = time.perf_counter()
+        stats = {'nodes': 0, 'elapsed': 0.0, 'exhausted': False}
+
+        flag = self.extractor.check(content)
+        if flag:
+            return [], flag, stats
+
+        # Heap entries: (-score, depth, tie-breaker, text, chain)
+        counter = 0
+        heap = [(-self._score(content), 0, counter, content, ())]
+        seen = {content}
+
+        while heap:
+            if stats['nodes'] >= self.max_nodes or time.perf_counter() - start > self.time_budget:
+                stats['exhausted'] = True
+                break
+
+            _, depth, _, text, chain = heapq.heappop(heap)
+            if depth >= self.max_depth:
+                continue
+
+            for name, _ in self.strategies:
+                result = self._decode(name, text)
+                if not result or result in seen:
+                    continue
+                seen.add(result)
+                stats['nodes'] += 1
+
+                flag = self.extractor.check(result)
+                if flag:
+                    stats['elapsed'] = time.perf_counter() - start
+                    return list(chain) + [name], flag, stats
+
+                score = self._score(result)
+                if score < self.MIN_SCORE:
+                    continue
+
+                counter += 1
+                heapq.heappush(heap, (-score, depth + 1, counter, result, chain + (name,)))
+
+        stats['elapsed'] = time.perf_counter() - start
+        return [], None, stats
+
+    def _decode(self, name, data):
+        """Applies one strategy through the memo table. Returns None when it does not apply."""
+        key = (name, data)
+        if key not in self._memo:
+            try:
+                with span(f"crypto.{name}"):
+                    result = self._strategy_map[name](data)
             except Exception:
-                pass 
+                result = None
+            # A decoder that changes nothing is a dead end
+            self._memo[key] = result if result and result != data else None
+        return self._memo[key]
 
-        if not found_flag:
-            print("[-] No obvious flags found with basic decoders.")
+    @staticmethod
+    def _score(text):
+        """
+        Printability minus normalized Shannon entropy, in [-1, 1].
+        Encoded layers are fully printable; garbage from a wrong decoder is not.
+        """
+        if not text:
+            return -1.0
+        printable = sum(1 for c in text if c.isprintable() or c in "\r\n\t") / len(text)
+        counts = Counter(text)
+        entropy = -sum(n / len(text) * math.log2(n / len(text)) for n in counts.values())
+        return printable - entropy / 8
 
     # --- Strategies ---
 
     def _try_base64(self, data):
+        clean = re.sub(r"\s", "", data).replace('-', '+').replace('_', '/')
+        if not re.fullmatch(r"[A-Za-z0-9+/]+={0,2}", clean):
+            return None
         # Add padding if missing
-        padding = len(data) % 4
+        clean = clean.rstrip('=')
+        padding = len(clean) % 4
         if padding:
-            data += '=' * (4 - padding)
-        return base64.b64decode(data).decode('utf-8', errors='ignore')
+            clean += '=' * (4 - padding)
+        return base64.b64decode(clean).decode('utf-8', errors='ignore')
+
+    def _try_base32(self, data):
+        clean = re.sub(r"\s", "", data).upper().rstrip('=')
+        if not re.fullmatch(r"[A-Z2-7]+", clean):
+            return None
+        clean += '=' * (-len(clean) % 8)
+        return base64.b32decode(clean).decode('utf-8', errors='ignore')
+
+    def _try_base85(self, data):
+        clean = data.strip()
+        if clean.startswith('<~') and clean.endswith('~>'):
+            return base64.a85decode(clean, adobe=True).decode('utf-8', errors='ignore')
+        return base64.b85decode(clean).decode('utf-8', errors='ignore')
 
     def _try_hex(self, data):
         # Remove spaces or 0x prefixes
         clean = data.replace(" ", "").replace("0x", "")
         return bytes.fromhex(clean).decode('utf-8', errors='ignore')
 
+    def _try_url(self, data):
+        if '%' not in data:
+            return None
+        return urllib.parse.unquote(data, errors='ignore')
+
+    def _try_binary(self, data):
+        clean = re.sub(r"[\s,]", "", data)
+        if not clean or len(clean) % 8 or set(clean) - {'0', '1'}:
+            return None
+        raw = int(clean, 2).to_bytes(len(clean) // 8, 'big')
+        return raw.decode('utf-8', errors='ignore')
+
+    def _try_decimal(self, data):
+        parts = re.split(r"[\s,]+", data.strip())
+        if len(parts) < 2 or not all(p.isdigit() and int(p) < 256 for p in parts):
+            return None
+        return bytes(int(p) for p in parts).decode('utf-8', errors='ignore')
+
     def _try_reverse(self, data):
         return data[::-1]
 
@@ -3,56 +3,196 @@ Engine: Forensics
 Role: Automated workflow for file analysis (Strings, Metadata).
 """
 import os
-import re
+import asyncio
+from src.core.artifact import Artifact
+from src.core.output_manager import OutputManager
+from src.utils.archive_walker import ArchiveWalker
+from src.utils.config import load_config
 from src.utils.flag_extractor import FlagExtractor
+from src.utils import png_decoder
+from src.utils.pcap_reader import PcapScanner
+from src.utils.stego import PLANES, ORDERS, StegoScanner
+from src.utils.profiler import span
+from src.utils.strings_scanner import ENCODINGS, byte_offset, scan_strings
+from src.wrappers.tool_runner import ToolRunner
+
+# External helpers run when installed: (name, argv builder)
+EXTERNAL_TOOLS = [
+    ("exiftool", lambda path: ["exiftool", path]),
+    ("binwalk", lambda path: ["binwalk", path]),
+]
 
 class ForensicsEngine:
-    def __init__(self):
+    VERSION = "1.6"
+    CONFIG_SECTIONS = ("archives", "pcap", "stego", "strings")
+
+    def __init__(self, out=None):
+        self.out = out or OutputManager()
         self.extractor = FlagExtractor()
+        self.runner = ToolRunner(timeout=60)
+        # Zip bomb guards, overridable through the "archives" section of the config file
+        limits = load_config().get("archives", {})
+        self.walker = ArchiveWalker(self.extractor,
+                                    max_depth=limits.get("max_depth", 5),
+                                    max_total=limits.get("max_total_bytes", 512 * 1024 * 1024))
+        # Network captures: per-flow buffer and decoded HTTP body limits from the "pcap" section
+        capture = load_config().get("pcap", {})
+        self.pcap = PcapScanner(self.extractor,
+                                max_flows=capture.get("max_flows", 8192),
+                                max_body=capture.get("max_body_bytes", 64 * 1024 * 1024))
+        # LSB stego: bit planes and scan orders from the "stego" section
+        stego = load_config().get("stego", {})
+        self.stego = StegoScanner(self.extractor,
+                                  planes=stego.get("planes", PLANES),
+                                  orders=stego.get("orders", ORDERS))
+        # Strings pass: minimum length and encodings from the "strings" config section
+        strings = load_config().get("strings", {})
+        self.min_length = strings.get("min_length", 4)
+        self.encodings = tuple(strings.get("encodings", ENCODINGS))
 
-    def execute(self, filepath):
-        print(f"[*] [Forensics] Starting analysis on file: {filepath}")
+    def execute(self, filepath, artifact=None):
+        self.out.info(f"[Forensics] Starting analysis on file: {filepath}")
         
         if not os.path.exists(filepath):
-            print(f"[-] Error: File not found: {filepath}")
+            self.out.error(f"Error: File not found: {filepath}")
             return
 
         # Strategy 1: The "Strings" Method (Read file, look for readable text)
-        print("[*] Running 'strings' extraction...")
-        found_flags = self._analyze_strings(filepath)
+        self.out.info("Running 'strings' extraction...")
+        artifact = artifact or Artifact(filepath)
+        with span("forensics.strings"):
+            found_flags = self._analyze_strings(artifact)
         
-        if found_flags:
-            print("\n[+] SUCCESS! Found potential flags in file binary:")
-            for flag in found_flags:
-                print(f"    >> {flag}")
+        for offset, flag, encoding in found_flags:
+            self.out.finding('flag', detail='strings', flag=flag, offset=offset, encoding=encoding)
+        if not found_flags:
+            self.out.error("No obvious flags found in plaintext strings.")
+
+        # Strategy 2: Archives (zip/tar/gzip/bz2/xz), searched member by member in memory
+        if self.walker.archive_type(artifact.data[:4096]):
+            with span("forensics.archives"):
+                self._analyze_archive(filepath)
+
+        # Strategy 3: Network captures, streamed packet by packet with TCP reassembly
+        if self.pcap.capture_type(artifact.data[:4096]):
+            with span("forensics.pcap"):
+                self._analyze_capture(filepath)
+
+        # Strategy 4: Images, every channel/bit-plane combination searched for hidden data
+        if artifact.data[:8] == png_decoder.PNG_SIGNATURE:
+            with span("forensics.stego"):
+                self._analyze_stego(artifact)
+
+        # Strategy 5: Metadata / embedded files through whichever external tools are installed
+        with span("forensics.external_tools"):
+            self._run_external_tools(filepath)
+
+    def _analyze_archive(self, filepath):
+        """Recursively scans every archive member without extracting to disk."""
+        self.out.info("Archive detected. Searching members recursively...")
+        findings, stats = self.walker.scan(filepath, os.path.basename(filepath))
+
+        for member, offset, flag in findings:
+            self.out.finding('flag', detail=member, flag=flag, offset=offset, member=member)
+        self.out.highlight("Archive", f"{stats['members']} members, "
+                                      f"{stats['bytes'] / 1e6:.1f} MB decompressed")
+        if stats['limited']:
+            self.out.warning("Decompression limit reached (possible zip bomb); search stopped early.")
         else:
-            print("[-] No obvious flags found in plaintext strings.")
+            for error in stats['errors']:
+                self.out.warning(f"Archive error: {error}")
+        if not findings:
+            self.out.error("No flags found inside archive members.")
+
+    def _analyze_capture(self, filepath):
+        """Reassembles TCP streams and decodes HTTP bodies, searching each one for flags."""
+        self.out.info("Network capture detected. Reassembling TCP streams...")
+        try:
+            findings, stats = self.pcap.scan(filepath)
+        except ValueError as e:
+            self.out.warning(f"Capture error: {e}")
+            return
+
+        for where, offset, flag in findings:
+            self.out.finding('flag', detail=where, flag=flag, offset=offset, stream=where)
+        self.out.highlight("Capture", f"{stats['packets']} packets, {stats['tcp_streams']} TCP streams, "
+                                      f"{stats['http_messages']} HTTP messages, "
+                                      f"{stats['bytes'] / 1e6:.1f} MB reassembled")
+        if stats['gaps']:
+            self.out.warning(f"{stats['gaps']} gaps in TCP streams (missing segments were skipped).")
+        if stats['limited']:
+            self.out.warning(f"{stats['limited']} HTTP bodies exceeded the decode limit and were cut short.")
+        if not findings:
+            self.out.error("No flags found in reassembled streams.")
 
-    def _analyze_strings(self, filepath, min_length=4):
+    def _analyze_stego(self, artifact):
+        """Decodes the PNG and searches every LSB/bit-plane stream for flags, files and text."""
+        if not png_decoder.NUMPY_AVAILABLE:
+            self.out.warning("numpy not installed; skipping LSB stego analysis.")
+            return
+        try:
+            with span("stego.decode"):
+                image = png_decoder.decode_png(artifact.data)
+        except ValueError as e:
+            self.out.warning(f"Image decode error: {e}")
+            return
+
+        self.out.info(f"Image {image.width}x{image.height} ({''.join(image.channels)}, "
+                      f"{image.bit_depth}-bit). Extracting bit planes...")
+        with span("stego.scan"):
+            findings, streams = self.stego.scan(image)
+
+        for label, offset, kind, value in findings:
+            if kind == 'flag':
+                self.out.finding('flag', detail=f"lsb {label}", flag=value, offset=offset, stream=label)
+            else:
+                self.out.finding(f"stego_{kind}", detail=f"{label}: {value}", offset=offset, stream=label)
+        self.out.highlight("Stego", f"{streams} bit streams searched")
+        if not any(kind == 'flag' for _, _, kind, _ in findings):
+            self.out.error("No flags found in image bit planes.")
+
+    def _run_external_tools(self, filepath):
+        """Runs the available helpers concurrently, checking their output line by line."""
+        cmds = [build(filepath) for name, build in EXTERNAL_TOOLS if self.runner.available(name)]
+        if not cmds:
+            self.out.info("No external forensics tools (exiftool, binwalk) found on PATH.")
+            return
+
+        self.out.info(f"Running external tools: {', '.join(cmd[0] for cmd in cmds)}...")
+        found = []
+
+        def on_line(cmd, line):
+            flag = self.extractor.check(line)
+            if flag and flag not in found:
+                found.append(flag)
+                self.out.finding('flag', detail=cmd[0], flag=flag)
+
+        results = asyncio.run(self.runner.run_many(cmds, on_line=on_line))
+        for result in results:
+            if result.timed_out:
+                self.out.warning(f"{result.cmd[0]} timed out after {result.duration:.0f}s")
+            elif result.error:
+                self.out.warning(f"{result.cmd[0]} failed: {result.error}")
+
+    def _analyze_strings(self, artifact, min_length=None):
         """
-        Equivalent to the Linux 'strings' command. 
-        Reads binary file and extracts sequences of printable characters.
+        Equivalent to the Linux 'strings' command, extended to UTF-16LE/BE (and UTF-8
+        when configured). Returns (offset, flag, encoding) for the first occurrence
+        of each distinct flag.
         """
-        found = set()
+        found = {}
         
         try:
-            with open(filepath, "rb") as f:
-                content = f.read()
-                
-            # Regex to find sequences of 4+ printable characters
-            # ASCII range 32-126 (standard printable)
-            # This regex looks for bytes that act like text
-            matches = re.findall(b"[ -~]{4,}", content)
-            
-            for match in matches:
-                text_str = match.decode('utf-8', errors='ignore')
-                
-                # Check this string against our Flag Extractor
-                flag = self.extractor.check(text_str)
-                if flag:
-                    found.add(flag)
+            # Runs of printable characters in every configured encoding, found with
+            # one vectorized pass per chunk so large images never sit in memory
+            for offset, match, encoding in scan_strings(artifact.data, min_length or self.min_length,
+                                                        self.encodings):
+                # Check the raw bytes against our Flag Extractor (no decode per string)
+                flag = self.extractor.check(match)
+                if flag and flag not in found:
+                    found[flag] = (byte_offset(offset, encoding, match.find(flag.encode())), encoding)
                     
         except Exception as e:
-            print(f"[-] Error reading file: {e}")
+            self.out.error(f"Error reading file: {e}")
             
-        return list(found)
\ No newline at end of file
+        return [(offset, flag, encoding) for flag, (offset, encoding) in found.items()]
@@ -4,50 +4,51 @@ Role: Automated workflow for pwn challenges (Checksec, vulnerability scanning).
 """
 import os
 import sys
-
-# Attempt to import pwntools, handle missing dependency gracefully
-try:
-    from pwn import ELF, context
-    PWNTOOLS_AVAILABLE = True
-except ImportError:
-    PWNTOOLS_AVAILABLE = False
+from src.core.output_manager import OutputManager
+from src.utils.profiler import span
+from src.utils.checksec import checksec, checksec_file
 
 class PwnEngine:
-    def execute(self, target):
-        print(f"[*] [Pwn] Starting analysis on: {target}")
+    VERSION = "1.2"
+
+    def __init__(self, out=None):
+        self.out = out or OutputManager()
+
+    def execute(self, target, artifact=None):
+        self.out.info(f"[Pwn] Starting analysis on: {target}")
         
         if not os.path.exists(target):
-            print(f"[-] Error: File not found: {target}")
-            return
-
-        if not PWNTOOLS_AVAILABLE:
-            print("[-] Error: 'pwntools' library not installed. Cannot run checksec.")
-            print("    Please run: pip install pwntools")
+            self.out.error(f"Error: File not found: {target}")
             return
 
-        self._run_checksec(target)
+        with span("pwn.checksec"):
+            self._run_checksec(target, artifact)
 
-    def _run_checksec(self, filepath):
+    def _run_checksec(self, filepath, artifact=None):
         """
-        Uses pwntools to check for binary protections (NX, PIE, Canary, RELRO).
+        Checks binary protections (NX, PIE, Canary, RELRO) with the native ELF/PE parser.
         """
-        print(f"[*] Running Checksec on {os.path.basename(filepath)}...")
+        self.out.info(f"Running Checksec on {os.path.basename(filepath)}...")
         
         try:
-            # Load the binary with pwntools
-            # context.log_level = 'error' # Suppress pwntools noisy banner
-            binary = ELF(filepath, checksec=False)
-            
-            print("\n    [ Security Protections ]")
-            print(f"    Arch:    {binary.arch}-{binary.bits}-{binary.endian}")
-            print(f"    RELRO:   {self._color_status(binary.relro)}")
-            print(f"    Canary:  {self._color_status(binary.canary)}")
-            print(f"    NX:      {self._color_status(binary.nx)}")
-            print(f"    PIE:     {self._color_status(binary.pie)}")
-            print("")
-
-        except Exception as e:
-            print(f"[-] Failed to load binary: {e}")
+            binary = checksec(artifact.data) if artifact is not None else checksec_file(filepath)
+        except ValueError as e:
+            self.out.error(f"Failed to load binary: {e}")
+            return
+
+        print("\n    [ Security Protections ]")
+        print(f"    Arch:    {binary.arch_string}")
+        print(f"    RELRO:   {self._color_status(binary.relro)}")
+        print(f"    Canary:  {self._color_status(binary.canary)}")
+        print(f"    NX:      {self._color_status(binary.nx)}")
+        print(f"    PIE:     {self._color_status(binary.pie)}")
+        for name, enabled in binary.extra.items():
+            print(f"    {name.upper() + ':':<8} {self._color_status(enabled)}")
+        print("")
+
+        self.out.finding('checksec', quiet=True, detail=binary.arch_string,
+                         relro=binary.relro, canary=binary.canary,
+                         nx=binary.nx, pie=binary.pie, **binary.extra)
 
     def _color_status(self, status):
         """Helper to format status strings."""
@@ -3,68 +3,138 @@ Engine: Rev
 Role: Automated workflow for Reverse Engineering (Hashing, Packing, Strings).
 """
 import os
-import hashlib
-import re
+from src.core.artifact import Artifact
+from src.core.output_manager import OutputManager
+from src.utils import entropy
+from src.utils.checksec import sections
+from src.utils.config import load_config
+from src.utils.flag_extractor import FlagExtractor
+from src.utils.profiler import span
+from src.utils.strings_scanner import ENCODINGS, byte_offset, scan_strings
 
 class RevEngine:
-    def execute(self, target):
-        print(f"[*] [Rev] Starting Static Analysis on: {target}")
+    VERSION = "1.3"
+    CONFIG_SECTIONS = ("entropy", "strings")
+
+    # Entropy profiling, overridable through the "entropy" section of the config file
+    WINDOW = entropy.WINDOW
+    THRESHOLD = entropy.HIGH_ENTROPY
+    MAX_REGIONS = 10        # High-entropy regions printed to the console
+    PROFILE_POINTS = 64     # Downsampled per-window profile kept in the finding
+
+    def __init__(self, out=None):
+        self.out = out or OutputManager()
+        self.extractor = FlagExtractor()
+        settings = load_config().get("entropy", {})
+        self.window = settings.get("window", self.WINDOW)
+        self.threshold = settings.get("threshold", self.THRESHOLD)
+        strings = load_config().get("strings", {})
+        self.min_length = strings.get("min_length", 4)
+        self.encodings = tuple(strings.get("encodings", ENCODINGS))
+
+    def execute(self, target, artifact=None):
+        self.out.info(f"[Rev] Starting Static Analysis on: {target}")
         
         if not os.path.exists(target):
-            print(f"[-] Error: File not found: {target}")
+            self.out.error(f"Error: File not found: {target}")
             return
 
-        self._basic_info(target)
-        self._check_upx(target)
-        self._extract_strings(target)
+        # One shared view of the file: every pass below reuses the same bytes
+        artifact = artifact or Artifact(target)
+        with span("rev.basic_info"):
+            self._basic_info(artifact)
+        with span("rev.check_upx"):
+            packed = self._check_upx(artifact)
+        with span("rev.entropy"):
+            self._check_entropy(artifact, packed)
+        with span("rev.strings"):
+            self._extract_strings(artifact)
 
-    def _basic_info(self, path):
+    def _basic_info(self, artifact):
         """Calculates file hash and size."""
         try:
-            with open(path, 'rb') as f:
-                data = f.read()
-                md5 = hashlib.md5(data).hexdigest()
-            print(f"    File Size: {len(data)} bytes")
-            print(f"    MD5 Hash:  {md5}")
+            self.out.highlight("File Size", f"{artifact.size} bytes")
+            self.out.highlight("MD5 Hash", artifact.md5)
+            self.out.finding('file_info', quiet=True, detail=artifact.md5,
+                             size=artifact.size, md5=artifact.md5)
         except Exception as e:
-            print(f"[-] Error reading file info: {e}")
+            self.out.error(f"Error reading file info: {e}")
 
-    def _check_upx(self, path):
+    def _check_upx(self, artifact):
         """Checks for UPX packing signatures."""
         try:
-            with open(path, 'rb') as f:
-                content = f.read()
-            
             # UPX usually leaves 'UPX!' markers in the binary
-            if b'UPX!' in content:
-                print("\n[!] PACKED DETECTED: UPX marker found!")
+            offset = artifact.data.find(b'UPX!')
+            if offset != -1:
+                self.out.finding('packer', detail='UPX', offset=offset)
                 print("    -> Recommendation: Run 'upx -d <file>' to unpack.")
-            else:
-                print("[*] No standard UPX packing markers detected.")
+                return True
+            self.out.info("No standard UPX packing markers detected.")
         except Exception:
             pass
+        return False
+
+    def _check_entropy(self, artifact, packed=False):
+        """Sliding-window entropy profile: catches stripped UPX, other packers and encrypted blobs."""
+        if not entropy.NUMPY_AVAILABLE:
+            self.out.warning("numpy not installed; skipping entropy profile.")
+            return
+        if not artifact.size:
+            return
+
+        profile = entropy.profile(artifact.data, self.window)
+        self.out.highlight("Entropy", f"{profile.overall:.3f} bits/byte")
 
-    def _extract_strings(self, path):
+        try:
+            section_entropy = {name: round(entropy.shannon(artifact.data[offset:offset + size]), 3)
+                               for name, offset, size in sections(artifact.data) if size}
+        except ValueError:
+            section_entropy = {}
+        # Console shows the suspicious sections only; the full table goes into the finding
+        for name, value in section_entropy.items():
+            if value >= self.threshold:
+                self.out.highlight(f"  {name or '(unnamed)'}", f"{value:.3f} bits/byte (high)")
+
+        regions = profile.high_regions(self.threshold)
+        for offset, size, mean in regions[:self.MAX_REGIONS]:
+            self.out.finding('entropy_region', detail=f"{size} bytes, {mean:.2f} bits/byte",
+                             offset=offset, size=size, entropy=round(mean, 3))
+        if len(regions) > self.MAX_REGIONS:
+            self.out.info(f"... {len(regions) - self.MAX_REGIONS} more high-entropy regions")
+
+        # Downsample the per-window profile so the record stays small for any file size
+        values = profile.values
+        step = max(1, -(-len(values) // self.PROFILE_POINTS))
+        points = [round(float(values[i:i + step].max()), 2) for i in range(0, len(values), step)]
+        self.out.finding('entropy', quiet=True, detail=round(profile.overall, 3),
+                         window=profile.window, sections=section_entropy, profile=points)
+
+        high_bytes = sum(size for _, size, _ in regions)
+        if not packed and high_bytes >= artifact.size / 2:
+            self.out.finding('packer', detail='unknown (high entropy: packed or encrypted)',
+                             offset=regions[0][0])
+
+    def _extract_strings(self, artifact):
         """Basic strings extraction to look for flags."""
-        print("[*] Scanning for interesting strings...")
+        self.out.info("Scanning for interesting strings...")
         found_something = False
         
         try:
-            with open(path, 'rb') as f:
-                content = f.read()
-            
-            # Find ASCII strings length 4+
-            matches = re.findall(b"[ -~]{4,}", content)
-            
-            for match in matches:
+            # ASCII and UTF-16 strings (plus UTF-8 if configured), see strings_scanner
+            for offset, match, encoding in scan_strings(artifact.data, self.min_length, self.encodings):
                 s = match.decode('utf-8', errors='ignore')
+                flag = self.extractor.check(match)
+                if flag:
+                    self.out.finding('flag', detail='strings', flag=flag, encoding=encoding,
+                                     offset=byte_offset(offset, encoding, match.find(flag.encode())))
+                    found_something = True
                 # Simple heuristic for flags or interesting files
-                if "flag" in s.lower() or "ctf" in s.lower() or "{" in s:
-                    print(f"    >> Found String: {s}")
+                elif "flag" in s.lower() or "ctf" in s.lower() or "{" in s:
+                    self.out.finding('string', detail=s, offset=offset, encoding=encoding)
                     found_something = True
             
             if not found_something:
-                print("    [-] No obvious flag strings found.")
+                self.out.error("No obvious flag strings found.")
                 
         except Exception as e:
-            print(f"[-] Strings error: {e}")
\ No newline at end of file
+            self.out.error(f"Strings error: {e}")
\ No newline at end of file
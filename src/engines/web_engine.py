@@ -1,51 +1,376 @@
 """
 Engine: Web
-Role: Automated workflow for web challenges (Robots, Headers, Comments).
+Role: Automated workflow for web challenges (Robots, Headers, Crawling, Content discovery).
 """
+import os
+import re
+import asyncio
+import secrets
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 import requests
+from requests.adapters import HTTPAdapter
+from src.core.output_manager import OutputManager
+from src.utils import crawler, discovery
+from src.utils.config import load_config
 from src.utils.flag_extractor import FlagExtractor
+from src.utils.profiler import span
+
+class HostRateLimiter:
+    """Spaces out requests to the same host so probes never exceed 'rate' per second."""
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = {}
+        self._locks = {}
+
+    async def wait(self, url):
+        if not self.interval:
+            return
+        host = urllib.parse.urlsplit(url).netloc
+        lock = self._locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            now = time.monotonic()
+            slot = max(now, self._next.get(host, now))
+            self._next[host] = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+class AdaptiveLimiter:
+    """
+    Concurrency window that follows server latency, like TCP congestion control:
+    it doubles every round trip at first, then grows by one request per round trip,
+    and halves (at most once per window) when latency climbs past SLOWDOWN times
+    the fastest seen, a request fails, or the server answers 429/503.
+    """
+    SLOWDOWN = 2.0
+    JITTER = 0.02       # Seconds of latency growth ignored: localhost noise is not congestion
+
+    def __init__(self, maximum, minimum=1):
+        self.maximum = maximum
+        self.minimum = minimum
+        self.limit = float(min(maximum, max(minimum, 4)))
+        self.active = 0
+        self.fastest = None
+        self.latency = None         # Moving average of recent latencies
+        self._slow_start = True
+        self._hold = 0              # Responses to wait before the next decrease
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < int(self.limit))
+            self.active += 1
+
+    async def release(self, latency, congested=False):
+        async with self._cond:
+            self.active -= 1
+            self.fastest = latency if self.fastest is None else min(self.fastest, latency)
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            self._hold -= 1
+            if congested or self.latency > self.SLOWDOWN * self.fastest + self.JITTER:
+                if self._hold <= 0:
+                    self.limit = max(self.minimum, self.limit / 2)
+                    self._slow_start = False
+                    self._hold = int(self.limit) + self.active
+            elif self._slow_start:
+                self.limit = min(self.maximum, self.limit + 1)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._cond.notify_all()
 
 class WebEngine:
-    def __init__(self):
+    VERSION = "1.5"
+    # Remote content changes between runs, so results are never cached
+    CACHEABLE = False
+    DISCOVERY_CONCURRENCY = 32
+    DISCOVERY_RETRIES = 2       # Extra attempts for a path answered with 429/503
+
+    def __init__(self, out=None, concurrency=8, rate=20, timeout=5, discover=None):
+        self.out = out or OutputManager()
         self.extractor = FlagExtractor()
+        self.concurrency = concurrency
+        self.rate = rate
+        self.timeout = timeout
+        self.session = None
+        settings = load_config().get("discovery", {})
+        # Wordlist discovery is opt-in: it sends hundreds of requests to the target
+        self.discover = settings.get("enabled", bool(settings.get("wordlists"))) if discover is None else discover
+        self.wordlists = settings.get("wordlists", [])
+        self.extensions = settings.get("extensions", list(discovery.EXTENSIONS))
+        self.discovery_concurrency = settings.get("concurrency", self.DISCOVERY_CONCURRENCY)
+        self.discovery_rate = settings.get("max_rate", 0)
+        crawl = load_config().get("crawl", {})
+        self.max_pages = crawl.get("max_pages", crawler.MAX_PAGES)
+        self.max_depth = crawl.get("max_depth", crawler.MAX_DEPTH)
+
+    def execute(self, target, artifact=None):
+        # SMART LOAD: a note or challenge description file points at the real target
+        if os.path.exists(target):
+            try:
+                with open(target, 'r', errors='ignore') as f:
+                    match = re.search(r'https?://[^\s"\'<>]+', f.read(64 * 1024))
+            except OSError as e:
+                self.out.warning(f"Error reading file: {e}")
+                return []
+            if not match:
+                self.out.warning(f"[Web] No URL found in {target}")
+                return []
+            self.out.info(f"[Web] detected file path. Using the URL found in: {target}")
+            target = match.group(0).rstrip('.,;)')
 
-    def execute(self, target):
-        print(f"[*] [Web] Starting scan on: {target}")
+        self.out.info(f"[Web] Starting scan on: {target}")
         
         # Ensure URL has schema
         if not target.startswith("http"):
             target = "http://" + target
 
-        self._check_robots(target)
-        self._check_headers(target)
+        return asyncio.run(self.scan(target))
 
-    def _check_robots(self, url):
-        """Checks robots.txt for hidden paths."""
+    async def scan(self, url):
+        """
+        Runs every probe concurrently over one pooled keep-alive session.
+        Returns the list of flags found.
+        """
+        workers = max(self.concurrency, self.discovery_concurrency if self.discover else 0)
+        self.session = requests.Session()
+        # One connection pool sized to the concurrency limit, reused by every probe
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        # The default executor has min(32, CPUs + 4) threads, which would cap the
+        # requests in flight well below the limits on a small machine
+        executor = ThreadPoolExecutor(max_workers=workers)
+        asyncio.get_running_loop().set_default_executor(executor)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._limiter = HostRateLimiter(self.rate)
+        self.flags = []
+
+        probes = [
+            self._timed("web.robots", self._check_robots(url)),
+            self._timed("web.headers", self._check_headers(url)),
+            self._timed("web.crawl", self._crawl(url)),
+        ]
+        if self.discover:
+            probes.append(self._timed("web.discovery", self._discover(url)))
+        try:
+            await asyncio.gather(*probes)
+        finally:
+            self.session.close()
+            executor.shutdown(wait=False)
+        return self.flags
+
+    @staticmethod
+    async def _timed(stage, coro):
+        with span(stage):
+            return await coro
+
+    async def _fetch(self, method, url, **kwargs):
+        """Sends one request through the shared session, bounded by the concurrency and rate limits."""
+        async with self._semaphore:
+            await self._limiter.wait(url)
+            # requests is blocking; run it on a worker thread so probes overlap
+            return await asyncio.to_thread(
+                self.session.request, method, url, timeout=self.timeout, **kwargs)
+
+    def _report_flags(self, where, text, url=None):
+        for offset, flag in self.extractor.iter_matches(text):
+            self._report_flag(where, flag, offset, url)
+
+    def _report_flag(self, where, flag, offset=None, url=None):
+        if flag not in self.flags:
+            self.flags.append(flag)
+            self.out.finding('flag', detail=where, flag=flag, offset=offset, url=url)
+
+    async def _check_robots(self, url):
+        """Checks robots.txt for hidden paths, then fetches every Disallow'ed path."""
         robots_url = f"{url.rstrip('/')}/robots.txt"
-        print(f"[*] Checking {robots_url}...")
+        self.out.info(f"Checking {robots_url}...")
         
         try:
-            r = requests.get(robots_url, timeout=5)
+            r = await self._fetch("GET", robots_url)
+            if r.status_code != 200:
+                self.out.error("No robots.txt found.")
+                return
+
+            self.out.success(f"Found robots.txt! Content preview:\n{r.text[:200]}\n")
+            # Check for flags in the file itself
+            self._report_flags("ROBOTS.TXT", r.text, robots_url)
+
+            paths = self._disallowed_paths(r.text)
+            await asyncio.gather(*(self._timed("web.robots_path", self._check_path(url, path))
+                                   for path in paths))
+        except Exception as e:
+            self.out.warning(f"Error fetching robots.txt: {e}")
+
+    async def _check_path(self, url, path):
+        """Fetches one hidden path from robots.txt and scans it for flags."""
+        path_url = urllib.parse.urljoin(url.rstrip('/') + '/', path.lstrip('/'))
+        try:
+            r = await self._fetch("GET", path_url)
+            self.out.highlight(f"[{r.status_code}]", path_url)
             if r.status_code == 200:
-                print(f"[+] Found robots.txt! Content preview:\n{r.text[:200]}\n")
-                
-                # Check for flags in the file itself
-                flag = self.extractor.check(r.text)
-                if flag:
-                    print(f"[+] !!! FLAG FOUND IN ROBOTS.TXT: {flag} !!!")
-            else:
-                print("[-] No robots.txt found.")
+                self._report_flags(path.upper(), r.text, path_url)
         except Exception as e:
-            print(f"[!] Error fetching robots.txt: {e}")
+            self.out.warning(f"Error fetching {path_url}: {e}")
 
-    def _check_headers(self, url):
+    async def _check_headers(self, url):
         """Inspects HTTP headers for hidden info."""
-        print(f"[*] Inspecting HTTP Headers...")
+        self.out.info("Inspecting HTTP Headers...")
         try:
-            r = requests.head(url, timeout=5)
+            r = await self._fetch("HEAD", url)
             for key, value in r.headers.items():
                 # CTFs often hide clues in custom headers (X-Flag, X-Secret)
                 if "flag" in key.lower() or "ctf" in key.lower() or self.extractor.check(value):
-                    print(f"[+] INTERESTING HEADER: {key}: {value}")
+                    self.out.finding('header', detail=f"{key}: {value}", url=url)
+                    self._report_flags("HEADERS", value, url)
         except Exception as e:
-            print(f"[!] Error fetching headers: {e}")
+            self.out.warning(f"Error fetching headers: {e}")
+
+    async def _crawl(self, url):
+        """
+        Crawls the site from the index page, breadth-first, same origin only, within
+        the depth and page limits. Every page body is scanned for flags as it streams
+        in; HTML comments are reported, links (including JS/CSS references and
+        source maps) feed the frontier.
+        """
+        frontier = crawler.UrlFrontier(url, self.max_pages)
+        seed = frontier.admit(url)
+        if not seed:
+            return
+        queue = asyncio.Queue()
+        queue.put_nowait((seed, 0))
+        stats = {'pages': 0, 'bytes': 0}
+
+        async def work():
+            while True:
+                page_url, depth = await queue.get()
+                try:
+                    async with self._semaphore:
+                        await self._limiter.wait(page_url)
+                        page = await asyncio.to_thread(crawler.fetch, self.session, page_url,
+                                                       self.timeout, self.extractor)
+                except Exception as e:
+                    self.out.warning(f"Error crawling {page_url}: {e}")
+                else:
+                    stats['pages'] += 1
+                    stats['bytes'] += page.size
+                    self._report_page(page)
+                    if depth < self.max_depth:
+                        for link in page.links:
+                            child = frontier.admit(urllib.parse.urljoin(page_url, link))
+                            if child:
+                                queue.put_nowait((child, depth + 1))
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(work()) for _ in range(self.concurrency)]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        skipped = f", {frontier.skipped} links over the page limit" if frontier.skipped else ""
+        self.out.highlight("Crawl", f"{stats['pages']} pages, {stats['bytes'] / 1024:.0f} KB{skipped}")
+
+    def _report_page(self, page):
+        where = urllib.parse.urlsplit(page.url).path
+        where = "INDEX PAGE" if where == "/" else where
+        for offset, flag in page.flags:
+            self._report_flag(where, flag, offset, page.url)
+        for comment in page.comments:
+            preview = comment if len(comment) <= crawler.COMMENT_PREVIEW else comment[:crawler.COMMENT_PREVIEW] + "..."
+            self.out.finding('comment', detail=f"{where}: {preview}", url=page.url)
+
+    async def _discover(self, url):
+        """
+        Probes every wordlist path through a bounded pool of workers fed from a
+        bounded queue, so the list is streamed rather than loaded. Responses matching
+        the calibrated soft-404 (or repeating too often) are folded away.
+        """
+        base = url.rstrip('/') + '/'
+        self.out.info(f"Discovering content under {base}...")
+        window = AdaptiveLimiter(self.discovery_concurrency)
+        ceiling = HostRateLimiter(self.discovery_rate)
+        responses = discovery.ResponseFilter()
+        stats = {'requests': 0, 'found': 0, 'errors': 0}
+        start = time.monotonic()
+
+        async def probe(path):
+            await window.acquire()
+            sent = time.monotonic()
+            congested = True
+            try:
+                await ceiling.wait(base)
+                r = await asyncio.to_thread(self.session.get, base + path,
+                                            timeout=self.timeout, allow_redirects=False)
+                congested = r.status_code in (429, 503)
+                return r
+            finally:
+                stats['requests'] += 1
+                await window.release(time.monotonic() - sent, congested)
+
+        def fingerprint(r, path):
+            return discovery.fingerprint(r.status_code, r.content, path, r.headers.get("Location", ""))
+
+        # Calibration: random names show what "not found" looks like for each extension
+        for extension in self.extensions:
+            paths = [secrets.token_hex(8) + extension for _ in range(discovery.CALIBRATION_PROBES)]
+            try:
+                replies = await asyncio.gather(*(probe(path) for path in paths))
+            except Exception as e:
+                self.out.warning(f"Discovery calibration failed: {e}")
+                return
+            responses.calibrate(fingerprint(r, path) for r, path in zip(replies, paths))
+
+        queue = asyncio.Queue(maxsize=self.discovery_concurrency * 2)
+
+        async def produce():
+            try:
+                for path in discovery.iter_paths(self.wordlists, self.extensions):
+                    await queue.put(path)
+            except OSError as e:
+                self.out.warning(f"Error reading wordlist: {e}")
+            finally:
+                for _ in range(self.discovery_concurrency):
+                    await queue.put(None)
+
+        async def work():
+            while (path := await queue.get()) is not None:
+                for _ in range(1 + self.DISCOVERY_RETRIES):
+                    try:
+                        r = await probe(path)
+                    except Exception:
+                        r = None
+                    if r is not None and r.status_code not in (429, 503):
+                        break
+                if r is None or r.status_code in (429, 503):
+                    stats['errors'] += 1
+                    continue
+                if responses.interesting(fingerprint(r, path)):
+                    stats['found'] += 1
+                    location = r.headers.get("Location")
+                    self.out.finding('path', detail=f"[{r.status_code}] /{path}" +
+                                     (f" -> {location}" if location else ""),
+                                     url=base + path, status=r.status_code, length=len(r.content))
+                    self._report_flags(f"/{path}", r.text, base + path)
+
+        await asyncio.gather(produce(), *(work() for _ in range(self.discovery_concurrency)))
+        elapsed = time.monotonic() - start
+        rate = stats['requests'] / elapsed if elapsed else 0.0
+        self.out.highlight("Discovery", f"{stats['requests']} requests in {elapsed:.1f}s ({rate:.0f} req/s), "
+                           f"{stats['found']} paths, {responses.collapsed} soft-404s folded, "
+                           f"{stats['errors']} errors, final window {int(window.limit)}")
+
+    @staticmethod
+    def _disallowed_paths(robots_txt):
+        """Returns the unique, non-wildcard paths listed in Disallow lines."""
+        paths = []
+        for line in robots_txt.splitlines():
+            key, _, value = line.partition(':')
+            value = value.split('#')[0].strip()
+            if key.strip().lower() == 'disallow' and value and value != '/' and '*' not in value:
+                if value not in paths:
+                    paths.append(value)
+        return paths
@@ -0,0 +1,207 @@
+"""
+Utility: Archive Walker
+Role: Recursively searches zip/tar/gzip/bz2/xz members for flags in memory,
+      without extracting anything to disk.
+"""
+import io
+import os
+import bz2
+import gzip
+import lzma
+import tarfile
+import zipfile
+import threading
+import contextlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.core.signatures import identify_header
+
+ARCHIVE_TYPES = {
+    'application/zip',
+    'application/x-tar',
+    'application/gzip',
+    'application/x-bzip2',
+    'application/x-xz',
+}
+
+# Single-stream compressors: MIME type -> wrapper around a raw file object
+STREAM_OPENERS = {
+    'application/gzip': lambda f: gzip.GzipFile(fileobj=f),
+    'application/x-bzip2': bz2.BZ2File,
+    'application/x-xz': lzma.LZMAFile,
+}
+
+CHUNK_SIZE = 256 * 1024
+# Bytes kept from the previous chunk so a flag split across chunks is still matched
+OVERLAP = 512
+
+class ArchiveLimitError(Exception):
+    """Raised when the decompression budget (zip bomb guard) is exhausted."""
+
+class _Slice(io.RawIOBase):
+    """Read-only window over a byte range of a file, with its own handle (thread-safe)."""
+    def __init__(self, source, offset, size):
+        self._f = _open_source(source)
+        self._f.seek(offset)
+        self._left = size
+
+    def readable(self):
+        return True
+
+    def read(self, n=-1):
+        if self._left <= 0:
+            return b""
+        n = self._left if n is None or n < 0 else min(n, self._left)
+        data = self._f.read(n)
+        self._left -= len(data)
+        return data
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+def _open_source(source):
+    """A fresh seekable file object over a path or an in-memory buffer."""
+    if isinstance(source, str):
+        return open(source, 'rb')
+    return io.BytesIO(source)
+
+@contextlib.contextmanager
+def _open_stream(wrapper, source):
+    """A decompressing reader over a source; the compressed file closes with it."""
+    with _open_source(source) as raw, wrapper(raw) as stream:
+        yield stream
+
+class ArchiveWalker:
+    def __init__(self, extractor, max_depth=5, max_total=512 * 1024 * 1024, max_workers=None):
+        """
+        extractor:   FlagExtractor used on every member.
+        max_depth:   how many archive layers to descend into.
+        max_total:   total decompressed bytes allowed across all members.
+        max_workers: threads used to decompress members in parallel.
+        """
+        self.extractor = extractor
+        self.max_depth = max_depth
+        self.max_total = max_total
+        self.max_workers = max_workers or min(8, (os.cpu_count() or 1) + 2)
+        self._used = 0
+        self._lock = threading.Lock()
+        self._resources = None      # Open zip archives of the current scan, closed when it ends
+
+    @staticmethod
+    def archive_type(header):
+        """MIME type if the header belongs to a supported archive, else None."""
+        mime = identify_header(bytes(header[:4096]))
+        return mime if mime in ARCHIVE_TYPES else None
+
+    def scan(self, source, name="<root>"):
+        """
+        Walks an archive given as a path or bytes-like object.
+        Returns (findings, stats): findings are (member_path, offset, flag) tuples,
+        stats has members scanned, bytes decompressed and whether a limit tripped.
+        """
+        self._used = 0
+        findings = []
+        stats = {'members': 0, 'bytes': 0, 'limited': False, 'errors': []}
+
+        # Work list of (kind, payload, path, depth). Workers never wait on each other:
+        # a task returns its findings plus any child tasks, which this loop submits.
+        with contextlib.ExitStack() as self._resources, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._run_task, ('archive', source, name, 0))}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        found, children, scanned = future.result()
+                    except ArchiveLimitError as e:
+                        stats['limited'] = True
+                        stats['errors'].append(str(e))
+                        continue
+                    except Exception as e:
+                        stats['errors'].append(str(e))
+                        continue
+                    findings.extend(found)
+                    stats['members'] += scanned
+                    pending.update(pool.submit(self._run_task, child) for child in children)
+
+        stats['bytes'] = self._used
+        return findings, stats
+
+    def _run_task(self, task):
+        kind, payload, path, depth = task
+        if kind == 'archive':
+            return [], self._list_members(payload, path, depth), 0
+        return self._scan_member(payload, path, depth)
+
+    def _list_members(self, source, path, depth):
+        """Returns one 'member' task per file inside an archive (nothing is read yet)."""
+        with _open_source(source) as f:
+            mime = self.archive_type(f.read(4096))
+
+        if mime == 'application/zip':
+            # ZipFile serializes reads of its underlying file, so members can
+            # be decompressed concurrently from one handle. It stays open until
+            # the scan ends, since member tasks run later on other threads.
+            with self._lock:
+                zf = self._resources.enter_context(
+                    zipfile.ZipFile(self._resources.enter_context(_open_source(source))))
+            return [('member', (lambda info=info: zf.open(info)), f"{path}/{info.filename}", depth)
+                    for info in zf.infolist() if not info.is_dir()]
+
+        if mime == 'application/x-tar':
+            with _open_source(source) as f, tarfile.open(fileobj=f, mode='r:') as tf:
+                return [('member', (lambda m=m: _Slice(source, m.offset_data, m.size)),
+                         f"{path}/{m.name}", depth)
+                        for m in tf.getmembers() if m.isfile()]
+
+        if mime in STREAM_OPENERS:
+            wrapper = STREAM_OPENERS[mime]
+            inner = path.rsplit('/', 1)[-1].rsplit('.', 1)[0] or "stream"
+            return [('member', (lambda: _open_stream(wrapper, source)),
+                     f"{path}/{inner}", depth)]
+
+        return []
+
+    def _scan_member(self, opener, path, depth):
+        """
+        Streams one member through the flag extractor. Nested archives are read into
+        memory (charged to the budget) and handed back as a new 'archive' task.
+        """
+        found = []
+        seen = set()
+        with opener() as f:
+            chunk = f.read(CHUNK_SIZE)
+            self._charge(len(chunk), path)
+
+            if depth + 1 <= self.max_depth and self.archive_type(chunk):
+                parts = [chunk]
+                while True:
+                    more = f.read(CHUNK_SIZE)
+                    if not more:
+                        break
+                    self._charge(len(more), path)
+                    parts.append(more)
+                return [], [('archive', b"".join(parts), path, depth + 1)], 0
+
+            base = 0
+            tail = b""
+            while chunk:
+                window = tail + chunk
+                for offset, flag in self.extractor.iter_matches(window):
+                    if flag not in seen:
+                        seen.add(flag)
+                        found.append((path, base - len(tail) + offset, flag))
+                base += len(chunk)
+                tail = window[-OVERLAP:]
+                chunk = f.read(CHUNK_SIZE)
+                self._charge(len(chunk), path)
+
+        return found, [], 1
+
+    def _charge(self, n, path):
+        with self._lock:
+            self._used += n
+            if self._used > self.max_total:
+                raise ArchiveLimitError(
+                    f"decompression limit of {self.max_total} bytes reached at {path}")
@@ -0,0 +1,342 @@
+"""
+Utility: Native checksec.
+Reads the binary protections (arch, RELRO, canary, NX, PIE) and the section table
+straight from ELF and PE headers with struct, so a checksec costs milliseconds and
+never loads pwntools.
+Results follow pwntools' conventions: relro is 'Full', 'Partial' or None, and nx is
+None when it depends on the running kernel.
+"""
+import mmap
+import struct
+
+# ELF constants
+ET_EXEC, ET_DYN = 2, 3
+PT_DYNAMIC, PT_INTERP, PT_LOAD = 2, 3, 1
+PT_GNU_STACK, PT_GNU_RELRO = 0x6474E551, 0x6474E552
+PF_X = 1
+ELF32_HEADER_SIZE = 0x34        # Smallest complete ELF header (the 64-bit one is 0x40)
+SHT_NULL, SHT_SYMTAB, SHT_NOBITS, SHT_DYNSYM = 0, 2, 8, 11
+DT_NULL, DT_STRTAB, DT_STRSZ, DT_BIND_NOW, DT_FLAGS = 0, 5, 10, 24, 30
+DT_FLAGS_1 = 0x6FFFFFFB
+DF_BIND_NOW, DF_1_NOW = 0x8, 0x1
+EF_IA_64_LINUX_EXECUTABLE_STACK = 0x1
+
+CANARY_SYMBOL = b"__stack_chk_fail"
+
+# (e_machine, bits) -> pwntools arch name
+ELF_ARCHES = {
+    (62, 64): "amd64", (62, 32): "amd64", (3, 32): "i386", (6, 32): "i386",
+    (40, 32): "arm", (183, 64): "aarch64", (8, 32): "mips", (8, 64): "mips64",
+    (20, 32): "powerpc", (21, 64): "powerpc64", (18, 32): "sparc", (43, 64): "sparc64",
+    (50, 64): "ia64", (243, 32): "riscv32", (243, 64): "riscv64",
+}
+
+# PE constants
+PE_ARCHES = {0x14C: "i386", 0x8664: "amd64", 0x1C0: "arm", 0x1C4: "thumb", 0xAA64: "aarch64"}
+DLL_HIGH_ENTROPY_VA = 0x0020
+DLL_DYNAMIC_BASE = 0x0040
+DLL_NX_COMPAT = 0x0100
+DLL_NO_SEH = 0x0400
+DLL_GUARD_CF = 0x4000
+IMAGE_DIRECTORY_ENTRY_LOAD_CONFIG = 10
+
+class ChecksecResult:
+    def __init__(self, fmt, arch, bits, endian):
+        self.format = fmt       # 'elf' or 'pe'
+        self.arch = arch
+        self.bits = bits
+        self.endian = endian
+        self.relro = None
+        self.canary = False
+        self.nx = False
+        self.pie = False
+        self.extra = {}         # Format-specific flags (e.g. PE ASLR/CFG/SEH)
+
+    @property
+    def arch_string(self):
+        return f"{self.arch}-{self.bits}-{self.endian}"
+
+    def as_dict(self):
+        return dict(format=self.format, arch=self.arch, bits=self.bits, endian=self.endian,
+                    relro=self.relro, canary=self.canary, nx=self.nx, pie=self.pie, **self.extra)
+
+    def __repr__(self):
+        return (f"ChecksecResult({self.arch_string}, relro={self.relro!r}, canary={self.canary}, "
+                f"nx={self.nx}, pie={self.pie})")
+
+def checksec(data):
+    """Parses an ELF or PE image (bytes, mmap or memoryview). Raises ValueError otherwise."""
+    if data[:4] == b"\x7fELF":
+        return _ElfParser(data).parse()
+    if data[:2] == b"MZ":
+        return _parse_pe(data)
+    raise ValueError("not an ELF or PE binary")
+
+def sections(data):
+    """Returns [(name, offset, size)] for the file-backed sections of an ELF or PE image."""
+    if data[:4] == b"\x7fELF":
+        return _ElfParser(data).sections()
+    if data[:2] == b"MZ":
+        return _pe_sections(data)
+    raise ValueError("not an ELF or PE binary")
+
+def checksec_file(path):
+    """Runs checksec over a file via mmap."""
+    with open(path, "rb") as f:
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            raise ValueError("not an ELF or PE binary")
+    try:
+        return checksec(data)
+    finally:
+        data.close()
+
+class _ElfParser:
+    def __init__(self, data):
+        self.data = data
+        if len(data) < ELF32_HEADER_SIZE:
+            raise ValueError("truncated ELF")
+        if data[4] not in (1, 2) or data[5] not in (1, 2):
+            raise ValueError("corrupt ELF identification")
+        self.is_64 = data[4] == 2
+        self.endian = "<" if data[5] == 1 else ">"
+
+    def _unpack(self, fmt, offset):
+        try:
+            return struct.unpack_from(self.endian + fmt, self.data, offset)
+        except struct.error:
+            raise ValueError("truncated ELF")
+
+    def parse(self):
+        if self.is_64:
+            e_type, e_machine = self._unpack("HH", 16)
+            phoff, shoff, e_flags = self._unpack("QQI", 32)
+            phentsize, phnum, shentsize, shnum = self._unpack("HHHH", 54)
+        else:
+            e_type, e_machine = self._unpack("HH", 16)
+            phoff, shoff, e_flags = self._unpack("III", 28)
+            phentsize, phnum, shentsize, shnum = self._unpack("HHHH", 42)
+
+        bits = 64 if self.is_64 else 32
+        arch = ELF_ARCHES.get((e_machine, bits), str(e_machine))
+        result = ChecksecResult("elf", arch, bits, "little" if self.endian == "<" else "big")
+
+        segments = list(self._segments(phoff, phentsize, phnum))
+        types = {p_type for p_type, *_ in segments}
+        dynamic = self._dynamic(segments)
+
+        result.pie = e_type == ET_DYN
+        if PT_GNU_RELRO in types:
+            bind_now = (DT_BIND_NOW in dynamic
+                        or dynamic.get(DT_FLAGS, 0) & DF_BIND_NOW
+                        or dynamic.get(DT_FLAGS_1, 0) & DF_1_NOW)
+            result.relro = "Full" if bind_now else "Partial"
+
+        stack = [p_flags for p_type, p_flags, *_ in segments if p_type == PT_GNU_STACK]
+        executable = e_type == ET_EXEC or PT_INTERP in types
+        result.nx = self._nx(arch, executable, stack[-1] & PF_X if stack else None, e_flags)
+        result.canary = self._has_symbol(CANARY_SYMBOL, shoff, shentsize, shnum, segments, dynamic)
+        return result
+
+    def sections(self):
+        if self.is_64:
+            shoff = self._unpack("Q", 40)[0]
+            shentsize, shnum, shstrndx = self._unpack("HHH", 58)
+        else:
+            shoff = self._unpack("I", 32)[0]
+            shentsize, shnum, shstrndx = self._unpack("HHH", 46)
+        if not shoff or shstrndx >= shnum:
+            return []
+
+        names_offset, _ = self._section_range(shoff, shentsize, shstrndx)
+        result = []
+        for i in range(shnum):
+            offset = shoff + i * shentsize
+            sh_name, sh_type = self._unpack("II", offset)
+            if sh_type in (SHT_NULL, SHT_NOBITS):
+                continue
+            sh_offset, sh_size = self._section_range(shoff, shentsize, i)
+            start = names_offset + sh_name
+            end = self.data.find(b"\x00", start, start + 256)
+            name = bytes(self.data[start:end if end != -1 else start]).decode("ascii", "replace")
+            result.append((name, sh_offset, sh_size))
+        return result
+
+    def _segments(self, phoff, phentsize, phnum):
+        """Yields (p_type, p_flags, p_offset, p_vaddr, p_filesz) per program header."""
+        for i in range(phnum):
+            offset = phoff + i * phentsize
+            if self.is_64:
+                p_type, p_flags, p_offset, p_vaddr, _, p_filesz = self._unpack("IIQQQQ", offset)
+            else:
+                p_type, p_offset, p_vaddr, _, p_filesz, _, p_flags = self._unpack("IIIIIII", offset)
+            yield p_type, p_flags, p_offset, p_vaddr, p_filesz
+
+    def _dynamic(self, segments):
+        """Returns {d_tag: d_val} from PT_DYNAMIC (first value wins)."""
+        tags = {}
+        fmt = "qQ" if self.is_64 else "iI"
+        size = struct.calcsize(fmt)
+        for p_type, _, p_offset, _, p_filesz in segments:
+            if p_type != PT_DYNAMIC:
+                continue
+            for offset in range(p_offset, p_offset + p_filesz - size + 1, size):
+                tag, value = self._unpack(fmt, offset)
+                if tag == DT_NULL:
+                    break
+                tags.setdefault(tag, value)
+        return tags
+
+    @staticmethod
+    def _nx(arch, executable, stack_exec, e_flags):
+        """Mirrors pwntools' per-arch READ_IMPLIES_EXEC rules."""
+        if not executable:
+            return True
+        non_exec = stack_exec == 0
+        missing = stack_exec is None
+        if arch in ("i386", "arm", "aarch64", "mips", "mips64"):
+            if non_exec:
+                return True
+            return False if missing else None
+        if arch == "amd64":
+            return True if non_exec else None
+        if arch == "powerpc":
+            return not missing
+        if arch == "ia64":
+            return non_exec or not (e_flags & EF_IA_64_LINUX_EXECUTABLE_STACK)
+        return True
+
+    def _has_symbol(self, name, shoff, shentsize, shnum, segments, dynamic):
+        """Looks for an exact symbol name in .symtab/.dynsym, else in the dynamic string table."""
+        tables = []
+        for i in range(shnum if shoff else 0):
+            offset = shoff + i * shentsize
+            if self.is_64:
+                _, sh_type, _, _, sh_offset, sh_size, sh_link, _, _, sh_entsize = \
+                    self._unpack("IIQQQQIIQQ", offset)
+            else:
+                _, sh_type, _, _, sh_offset, sh_size, sh_link, _, _, sh_entsize = \
+                    self._unpack("IIIIIIIIII", offset)
+            if sh_type in (SHT_SYMTAB, SHT_DYNSYM) and sh_entsize >= 4:
+                tables.append((sh_offset, sh_size, sh_entsize, sh_link))
+
+        if tables:
+            for sh_offset, sh_size, sh_entsize, sh_link in tables:
+                str_offset, str_size = self._section_range(shoff, shentsize, sh_link)
+                names = self._name_offsets(name, str_offset, str_size)
+                if names and self._symbol_named(names, sh_offset, sh_size, sh_entsize):
+                    return True
+            return False
+
+        # Section headers stripped: fall back to the string table the loader uses
+        strtab = self._vaddr_to_offset(dynamic.get(DT_STRTAB), segments)
+        if strtab is None:
+            return False
+        return bool(self._name_offsets(name, strtab, dynamic.get(DT_STRSZ, 0)))
+
+    def _section_range(self, shoff, shentsize, index):
+        offset = shoff + index * shentsize
+        if self.is_64:
+            sh_offset, sh_size = self._unpack("QQ", offset + 24)
+        else:
+            sh_offset, sh_size = self._unpack("II", offset + 16)
+        return sh_offset, sh_size
+
+    def _name_offsets(self, name, str_offset, str_size):
+        """Offsets within a string table at which `name` appears NUL-terminated."""
+        needle = name + b"\x00"
+        end = str_offset + str_size
+        found = set()
+        pos = self.data.find(needle, str_offset, end)
+        while pos != -1:
+            found.add(pos - str_offset)
+            pos = self.data.find(needle, pos + 1, end)
+        return found
+
+    def _symbol_named(self, names, sh_offset, sh_size, sh_entsize):
+        # st_name is the first word of both Elf32_Sym and Elf64_Sym
+        entry = struct.Struct(self.endian + "I" + "x" * (sh_entsize - 4))
+        table = memoryview(self.data)[sh_offset:sh_offset + sh_size - sh_size % sh_entsize]
+        try:
+            return any(st_name in names for (st_name,) in entry.iter_unpack(table))
+        finally:
+            table.release()
+
+    @staticmethod
+    def _vaddr_to_offset(vaddr, segments):
+        if vaddr is None:
+            return None
+        for p_type, _, p_offset, p_vaddr, p_filesz in segments:
+            if p_type == PT_LOAD and p_vaddr <= vaddr < p_vaddr + p_filesz:
+                return p_offset + vaddr - p_vaddr
+        return None
+
+def _pe_headers(data):
+    """Returns (machine, nsections, optional header offset, optional header size, characteristics)."""
+    (e_lfanew,) = struct.unpack_from("<I", data, 0x3C)
+    if data[e_lfanew:e_lfanew + 4] != b"PE\x00\x00":
+        raise ValueError("MZ stub without a PE header")
+    machine, nsections, _, _, _, opt_size, characteristics = \
+        struct.unpack_from("<HHIIIHH", data, e_lfanew + 4)
+    return machine, nsections, e_lfanew + 24, opt_size, characteristics
+
+def _pe_sections(data):
+    try:
+        _, nsections, opt, opt_size, _ = _pe_headers(data)
+        result = []
+        for i in range(nsections):
+            entry = opt + opt_size + i * 40
+            name = bytes(data[entry:entry + 8]).rstrip(b"\x00").decode("ascii", "replace")
+            raw_size, raw_ptr = struct.unpack_from("<II", data, entry + 16)
+            if raw_size:
+                result.append((name, raw_ptr, raw_size))
+        return result
+    except struct.error:
+        raise ValueError("truncated PE")
+
+def _parse_pe(data):
+    """Reads DllCharacteristics and the load config's /GS security cookie."""
+    try:
+        machine, nsections, opt, opt_size, characteristics = _pe_headers(data)
+        (magic,) = struct.unpack_from("<H", data, opt)
+        if magic not in (0x10B, 0x20B):
+            raise ValueError("unknown PE optional header")
+        is_64 = magic == 0x20B
+        (dll,) = struct.unpack_from("<H", data, opt + 70)
+        dirs = opt + (112 if is_64 else 96)
+        (ndirs,) = struct.unpack_from("<I", data, dirs - 4)
+
+        sections = []
+        for i in range(nsections):
+            vsize, vaddr, raw_size, raw_ptr = struct.unpack_from("<IIII", data, opt + opt_size + i * 40 + 8)
+            sections.append((vaddr, max(vsize, raw_size), raw_ptr))
+
+        cookie = 0
+        if ndirs > IMAGE_DIRECTORY_ENTRY_LOAD_CONFIG:
+            rva, size = struct.unpack_from("<II", data, dirs + IMAGE_DIRECTORY_ENTRY_LOAD_CONFIG * 8)
+            offset = _rva_to_offset(rva, sections) if rva else None
+            # SecurityCookie sits at 0x3C (PE32) / 0x58 (PE32+) in IMAGE_LOAD_CONFIG_DIRECTORY
+            field = 0x58 if is_64 else 0x3C
+            if offset is not None and size > field:
+                (cookie,) = struct.unpack_from("<Q" if is_64 else "<I", data, offset + field)
+    except struct.error:
+        raise ValueError("truncated PE")
+
+    result = ChecksecResult("pe", PE_ARCHES.get(machine, hex(machine)), 64 if is_64 else 32, "little")
+    result.nx = bool(dll & DLL_NX_COMPAT)
+    result.pie = bool(dll & DLL_DYNAMIC_BASE)
+    result.canary = bool(cookie)
+    result.extra = {
+        "dll": bool(characteristics & 0x2000),
+        "high_entropy_va": bool(dll & DLL_HIGH_ENTROPY_VA),
+        "cfg": bool(dll & DLL_GUARD_CF),
+        "seh": not dll & DLL_NO_SEH,
+    }
+    return result
+
+def _rva_to_offset(rva, sections):
+    for vaddr, size, raw_ptr in sections:
+        if vaddr <= rva < vaddr + size:
+            return raw_ptr + rva - vaddr
+    return None
@@ -0,0 +1,30 @@
+"""
+Utility: Config
+Role: Loads optional user settings (custom flag formats, etc.) from a JSON file.
+"""
+import os
+import json
+import hashlib
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.expanduser("~"), ".config", "ctf-copilot", "config.json")
+
+def load_config(path=None):
+    """
+    Returns the settings dict, or {} if no config file exists.
+    The path defaults to $CTF_COPILOT_CONFIG, then ~/.config/ctf-copilot/config.json.
+    """
+    path = path or os.environ.get("CTF_COPILOT_CONFIG", DEFAULT_CONFIG_PATH)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"[!] Ignoring unreadable config {path}: {e}")
+        return {}
+    return config if isinstance(config, dict) else {}
+
+def config_digest(config, sections):
+    """Short digest of the named config sections, for keys of results that depend on them."""
+    used = {section: config.get(section) for section in sections}
+    return hashlib.sha256(json.dumps(used, sort_keys=True).encode()).hexdigest()[:16]
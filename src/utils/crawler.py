@@ -0,0 +1,174 @@
+"""
+Utility: Crawler.
+Fetches one page at a time as a stream: every chunk goes through the flag extractor
+(with an overlap, so a flag split across chunks is still found), an incremental HTML
+parser that collects links and comments, and link patterns for JS/CSS (source maps,
+url(...), quoted paths). Bodies are never held in memory whole. The frontier keeps
+only same-origin URLs and remembers them as short digests of their normalized form.
+"""
+import re
+import codecs
+import hashlib
+import urllib.parse
+from html.parser import HTMLParser
+
+MAX_PAGES = 100
+MAX_DEPTH = 3
+MAX_PAGE_BYTES = 4 * 1024 * 1024    # Rest of a larger body is not read
+CHUNK_SIZE = 64 * 1024
+FLAG_OVERLAP = 1024                 # Longest flag expected to straddle two chunks
+LINK_OVERLAP = 256
+MAX_COMMENTS = 50                   # Per page
+COMMENT_PREVIEW = 200
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+HTML_TYPES = {"text/html", "application/xhtml+xml"}
+LINK_ATTRIBUTES = {"href", "src", "action", "formaction", "data", "poster"}
+# Fetched for nothing: media and fonts carry no links and rarely a text flag
+SKIP_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".ico", ".bmp", ".webp", ".svgz", ".mp3", ".mp4", ".webm",
+    ".woff", ".woff2", ".ttf", ".otf", ".eot",
+}
+TEXT_LINK_PATTERNS = [
+    re.compile(r"[#@]\s*sourceMappingURL\s*=\s*([^\s'\"*]+)"),
+    re.compile(r"url\(\s*['\"]?([^'\")\s]+)"),                          # CSS url(...)
+    re.compile(r"@import\s+['\"]([^'\"]+)"),
+    re.compile(r"""["'`](/[\w\-./]*\.(?:js|mjs|json|map|css|html?|php|txt|xml|bak))["'`]"""),
+]
+
+def normalize(url):
+    """
+    Canonical form of an absolute URL: lowercase scheme and host, no default port,
+    no user info or fragment, dot segments resolved, query parameters sorted.
+    """
+    parts = urllib.parse.urlsplit(url)
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"      # IPv6 literal
+    port = parts.port
+    netloc = host if port in (None, DEFAULT_PORTS.get(scheme)) else f"{host}:{port}"
+    path = urllib.parse.urljoin("/", parts.path or "/")
+    query = urllib.parse.urlencode(sorted(urllib.parse.parse_qsl(parts.query, keep_blank_values=True)))
+    return urllib.parse.urlunsplit((scheme, netloc, path, query, ""))
+
+class UrlFrontier:
+    """
+    Decides which links get crawled: same origin, not seen before, within the page
+    budget. Seen URLs are 8-byte digests rather than strings, so dedup stays cheap
+    on sites with very long URLs.
+    """
+    def __init__(self, seed, max_pages=MAX_PAGES):
+        self.origin = urllib.parse.urlsplit(normalize(seed))[:2]
+        self.max_pages = max_pages
+        self.seen = set()
+        self.skipped = 0            # Same-origin links dropped for the page budget
+
+    def admit(self, url):
+        """The normalized URL if it should be crawled, else None."""
+        try:
+            url = normalize(url)
+        except ValueError:
+            return None         # Malformed port and the like
+        parts = urllib.parse.urlsplit(url)
+        if parts[:2] != self.origin:
+            return None
+        if any(parts.path.lower().endswith(extension) for extension in SKIP_EXTENSIONS):
+            return None
+        digest = hashlib.blake2b(url.encode(), digest_size=8).digest()
+        if digest in self.seen:
+            return None
+        if len(self.seen) >= self.max_pages:
+            self.skipped += 1
+            return None
+        self.seen.add(digest)
+        return url
+
+class StreamScanner:
+    """Flags in a body that arrives in chunks; each one is searched with the tail of the last."""
+    def __init__(self, extractor, overlap=FLAG_OVERLAP):
+        self.extractor = extractor
+        self.overlap = overlap
+        self.tail = b""
+        self.base = 0               # Body offset of self.tail[0]
+        self._reported = set()      # Offsets already reported inside the current tail
+
+    def feed(self, chunk):
+        """Yields (offset in the body, flag) for every flag completed by this chunk."""
+        data = self.tail + chunk
+        reported = set()
+        for offset, flag in self.extractor.iter_matches(data):
+            if self.base + offset not in self._reported:
+                reported.add(self.base + offset)
+                yield self.base + offset, flag
+        keep = min(self.overlap, len(data))
+        self.base += len(data) - keep
+        self.tail = data[len(data) - keep:]
+        self._reported = {offset for offset in reported | self._reported if offset >= self.base}
+
+class PageParser(HTMLParser):
+    """Collects link targets and comments from HTML fed in pieces."""
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self.comments = []
+
+    def handle_starttag(self, tag, attrs):
+        for name, value in attrs:
+            if not value:
+                continue
+            if name in LINK_ATTRIBUTES:
+                self.links.append(value.strip())
+            elif name == "srcset":
+                self.links.extend(item.split()[0] for item in value.split(",") if item.strip())
+
+    def handle_comment(self, data):
+        data = data.strip()
+        if data and len(self.comments) < MAX_COMMENTS:
+            self.comments.append(data)
+
+class Page:
+    def __init__(self, url, status, content_type, size, links, comments, flags):
+        self.url = url
+        self.status = status
+        self.content_type = content_type
+        self.size = size            # Bytes read (at most MAX_PAGE_BYTES)
+        self.links = links          # Raw link targets, relative to url
+        self.comments = comments    # HTML comments
+        self.flags = flags          # (offset, flag)
+
+def fetch(session, url, timeout, extractor, max_bytes=MAX_PAGE_BYTES):
+    """
+    GETs one page and scans it while it streams in. Blocking: run it on a thread.
+    Redirects are not followed but returned as a link, so the frontier can check them.
+    """
+    with session.get(url, timeout=timeout, stream=True, allow_redirects=False) as r:
+        content_type = r.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        links = [r.headers["Location"]] if "Location" in r.headers else []
+        parser = PageParser() if content_type in HTML_TYPES else None
+        textual = parser is not None or not content_type or content_type.startswith("text/") or \
+            any(kind in content_type for kind in ("javascript", "json", "xml"))
+        try:
+            decoder = codecs.getincrementaldecoder(r.encoding or "utf-8")("replace")
+        except LookupError:
+            decoder = codecs.getincrementaldecoder("utf-8")("replace")
+        scanner = StreamScanner(extractor)
+        flags, size, tail = [], 0, ""
+        for chunk in r.iter_content(CHUNK_SIZE):
+            chunk = chunk[:max_bytes - size]
+            size += len(chunk)
+            flags.extend(scanner.feed(chunk))
+            if textual:
+                text = decoder.decode(chunk)
+                if parser:
+                    parser.feed(text)
+                window = tail + text
+                links.extend(m.group(1) for pattern in TEXT_LINK_PATTERNS for m in pattern.finditer(window))
+                tail = window[-LINK_OVERLAP:]
+            if size >= max_bytes:
+                break
+        if parser:
+            parser.close()
+            links.extend(parser.links)
+        return Page(url, r.status_code, content_type, size, links,
+                    parser.comments if parser else [], flags)
@@ -0,0 +1,95 @@
+"""
+Utility: Content discovery.
+Streams wordlist paths (every word with every extension, constant memory however long
+the list) and tells real pages from soft-404s. A few random paths calibrate what
+"not found" looks like on the server, and every response is reduced to a fingerprint
+(status, length, body hash) with the requested path cut out first, since error pages
+often echo it back.
+"""
+import hashlib
+
+# Tried before any wordlist: where beginner web challenges usually hide things
+COMMON_PATHS = [
+    "admin", "administrator", "login", "dashboard", "panel", "api", "debug", "console",
+    "backup", "backups", "old", "dev", "test", "tmp", "uploads", "files", "secret", "hidden",
+    "private", "config", "flag", "flags", "index", "source", "src", "db", "database",
+    "flag.txt", "robots.txt", "sitemap.xml", ".git/HEAD", ".git/config", ".env", ".htaccess",
+    ".DS_Store", "index.php.bak", "index.php~", "config.php.bak", "backup.zip", "backup.tar.gz",
+    "server-status", "phpinfo.php", ".well-known/security.txt",
+]
+
+EXTENSIONS = ("", ".php", ".txt", ".bak", ".html")
+CALIBRATION_PROBES = 2      # Random paths requested per extension before the wordlist
+COLLAPSE_AFTER = 8          # Identical (status, length) pairs shown before the rest are folded
+LENGTH_SLACK = 16           # Bytes a dynamic soft-404 may vary beyond its calibrated range
+
+def iter_paths(wordlists=(), extensions=EXTENSIONS, words=COMMON_PATHS):
+    """
+    Yields every path to probe: the built-in words, then each wordlist streamed line by line.
+    Words that already carry an extension (flag.txt) are tried as they are.
+    """
+    builtin = set()
+    for word in words:
+        for path in _expand(word, extensions):
+            if path not in builtin:
+                builtin.add(path)
+                yield path
+    for wordlist in wordlists:
+        with open(wordlist, 'r', encoding='utf-8', errors='ignore') as f:
+            for line in f:
+                # Wordlists repeat the built-in paths; other duplicates are not worth a set
+                for path in _expand(line.strip(), extensions):
+                    if path not in builtin:
+                        yield path
+
+def _expand(word, extensions):
+    word = word.lstrip('/')
+    if not word or word.startswith('#'):
+        return []
+    if '.' in word.rsplit('/', 1)[-1]:
+        return [word]
+    return [word + extension for extension in extensions]
+
+def fingerprint(status, body, path, location=""):
+    """(status, length, body hash) of a response, with every echo of the path removed."""
+    for token in sorted({path, path.rsplit('/', 1)[-1]}, key=len, reverse=True):
+        if token:
+            body = body.replace(token.encode(), b"")
+            location = location.replace(token, "")
+    return status, len(body), hashlib.sha1(body + location.encode()).hexdigest()
+
+class ResponseFilter:
+    """Decides which responses are worth reporting; counts the ones it folds away."""
+    def __init__(self, collapse_after=COLLAPSE_AFTER):
+        self.collapse_after = collapse_after
+        self.digests = set()        # Soft-404 bodies that never change
+        self.ranges = {}            # status -> (min, max) length of soft-404s that do
+        self.counts = {}
+        self.collapsed = 0
+
+    def calibrate(self, fingerprints):
+        """Learns the soft-404 of one extension from the responses to random paths."""
+        fingerprints = list(fingerprints)
+        self.digests.update(digest for _, _, digest in fingerprints)
+        statuses = {status for status, _, _ in fingerprints}
+        if len(fingerprints) > 1 and len(statuses) == 1 and len({d for _, _, d in fingerprints}) > 1:
+            # Same status, different bodies: a page with a timestamp or token in it
+            status = statuses.pop()
+            lengths = [length for _, length, _ in fingerprints]
+            low, high = self.ranges.get(status, (min(lengths), max(lengths)))
+            self.ranges[status] = (min(low, *lengths), max(high, *lengths))
+
+    def interesting(self, fp):
+        status, length, digest = fp
+        low, high = self.ranges.get(status, (None, None))
+        if status == 404 or digest in self.digests or \
+                (low is not None and low - LENGTH_SLACK <= length <= high + LENGTH_SLACK):
+            self.collapsed += 1
+            return False
+        # Anything the calibration missed (a catch-all per directory) still repeats itself
+        key = (status, length)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if self.counts[key] > self.collapse_after:
+            self.collapsed += 1
+            return False
+        return True
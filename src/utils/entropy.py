@@ -0,0 +1,82 @@
+"""
+Utility: Entropy profiling.
+Sliding-window Shannon entropy computed with NumPy: windows are strided views over the
+buffer and their byte histograms come from a single bincount per batch, so even
+hundreds of MB are profiled in seconds with bounded memory.
+"""
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+WINDOW = 4096
+HIGH_ENTROPY = 7.2          # bits/byte; compressed or encrypted data sits close to 8
+BATCH_BYTES = 4 * 1024 * 1024
+
+class EntropyProfile:
+    def __init__(self, window, step, offsets, values, overall):
+        self.window = window
+        self.step = step
+        self.offsets = offsets      # Window start offsets
+        self.values = values        # Entropy per window, bits/byte
+        self.overall = overall      # Entropy of the whole buffer
+
+    def high_regions(self, threshold=HIGH_ENTROPY, min_size=None):
+        """Merges consecutive high-entropy windows into (offset, size, mean_entropy) regions."""
+        min_size = min_size or self.window
+        hot = self.values >= threshold
+        if not hot.any():
+            return []
+        # Rising/falling edges of the boolean mask delimit each run of hot windows
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], hot.view(np.int8), [0]))))
+        regions = []
+        for first, last in zip(edges[::2], edges[1::2]):
+            start = int(self.offsets[first])
+            size = int(self.offsets[last - 1]) + self.window - start
+            if size >= min_size:
+                regions.append((start, size, float(self.values[first:last].mean())))
+        return regions
+
+def _as_array(data):
+    """Zero-copy uint8 view over bytes, bytearray, memoryview or mmap."""
+    return np.frombuffer(data, dtype=np.uint8)
+
+def shannon(data):
+    """Entropy of a whole buffer in bits/byte, histogrammed in bounded batches."""
+    arr = _as_array(data)
+    if not arr.size:
+        return 0.0
+    counts = np.zeros(256, dtype=np.int64)
+    for start in range(0, arr.size, BATCH_BYTES):
+        counts += np.bincount(arr[start:start + BATCH_BYTES], minlength=256)
+    p = counts[counts > 0] / arr.size
+    return max(0.0, float(-(p * np.log2(p)).sum()))
+
+def profile(data, window=WINDOW, step=None):
+    """Returns an EntropyProfile of `window`-byte windows every `step` bytes."""
+    step = step or window
+    arr = _as_array(data)
+    if arr.size < window:
+        window = max(arr.size, 1)
+    count = (arr.size - window) // step + 1 if arr.size else 0
+
+    # sum(c * log2 c) lookup for every possible count in a window
+    counts_range = np.arange(window + 1, dtype=np.float64)
+    clog = np.zeros(window + 1)
+    clog[1:] = counts_range[1:] * np.log2(counts_range[1:])
+
+    values = np.empty(count, dtype=np.float64)
+    per_batch = max(1, BATCH_BYTES // window)
+    for first in range(0, count, per_batch):
+        n = min(per_batch, count - first)
+        start = first * step
+        chunk = arr[start:start + (n - 1) * step + window]
+        windows = np.lib.stride_tricks.sliding_window_view(chunk, window)[::step]
+        # Shift each window's bytes into its own 256-bin block so one bincount histograms all of them
+        bins = windows.astype(np.uint32) + (np.arange(n, dtype=np.uint32) * 256)[:, None]
+        hist = np.bincount(bins.ravel(), minlength=n * 256).reshape(n, 256)
+        values[first:first + n] = np.log2(window) - clog[hist].sum(axis=1) / window
+
+    offsets = np.arange(count, dtype=np.int64) * step
+    return EntropyProfile(window, step, offsets, values, shannon(arr))
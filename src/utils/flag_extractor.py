@@ -1,24 +1,116 @@
 import re
+import mmap
+from src.utils.config import load_config
+
+# Common flag formats
+DEFAULT_PATTERNS = [
+    r"CTF\{.*?\}",       # CTF{...}
+    r"flag\{.*?\}",      # flag{...}
+    r"Cyber\{.*?\}",     # Cyber{...}
+]
 
 class FlagExtractor:
-    def __init__(self, patterns=None):
+    CONFIG_SECTIONS = ("flag_formats", "flag_patterns")
+
+    def __init__(self, patterns=None, config=None):
         if patterns is None:
-            # Common flag formats
-            self.patterns = [
-                r"CTF\{.*?\}",       # CTF{...}
-                r"flag\{.*?\}",      # flag{...}
-                r"Cyber\{.*?\}",     # Cyber{...}
-            ]
+            self.patterns = list(DEFAULT_PATTERNS)
+            # Event-specific formats from the config file, e.g.
+            # {"flag_formats": ["picoCTF", "HTB"], "flag_patterns": ["FLAG-[0-9a-f]{32}"]}
+            config = load_config() if config is None else config
+            for prefix in config.get("flag_formats", []):
+                self.patterns.append(re.escape(prefix) + r"\{.*?\}")
+            self.patterns.extend(config.get("flag_patterns", []))
         else:
-            self.patterns = patterns
+            self.patterns = list(patterns)
+
+        # Compile every format once into a single alternation (str and bytes flavours)
+        combined = "|".join(f"(?:{p})" for p in self.patterns)
+        leading = self._leading_chars(self.patterns)
+        if leading:
+            # Lookahead on the known prefixes' first letters lets the engine skip most offsets
+            combined = f"(?=[{leading}])(?:{combined})"
+        self._regex = re.compile(combined, re.IGNORECASE)
+        self._regex_bytes = re.compile(combined.encode(), re.IGNORECASE)
+
+        # Cheap literal prefilter: when every format needs a '{', skip candidates without one
+        self._needs_brace = all(r"\{" in p for p in self.patterns)
 
     def check(self, text):
-        """Returns the flag if found, otherwise None."""
-        if not text or not isinstance(text, str):
+        """Returns the flag if found, otherwise None. Accepts str or bytes."""
+        if not text:
             return None
-            
-        for pattern in self.patterns:
-            match = re.search(pattern, text, re.IGNORECASE)
-            if match:
-                return match.group(0)
-        return None
\ No newline at end of file
+
+        if isinstance(text, str):
+            if self._needs_brace and "{" not in text:
+                return None
+            match = self._regex.search(text)
+        elif isinstance(text, (bytes, bytearray)):
+            if self._needs_brace and b"{" not in text:
+                return None
+            match = self._regex_bytes.search(text)
+        else:
+            for _, flag in self.iter_matches(text):
+                return flag
+            return None
+
+        return self._as_str(match.group(0)) if match else None
+
+    def find_all(self, data):
+        """
+        Returns every flag found (in order of appearance).
+        Works directly on str, bytes, bytearray, memoryview or mmap buffers.
+        """
+        return [flag for _, flag in self.iter_matches(data)]
+
+    def iter_matches(self, data):
+        """Yields (offset, flag) for every match in the buffer."""
+        if not data:
+            return
+
+        if isinstance(data, str):
+            regex, brace = self._regex, "{"
+        elif isinstance(data, (bytes, bytearray, memoryview, mmap.mmap)):
+            regex, brace = self._regex_bytes, b"{"
+        else:
+            return
+
+        # memoryview has no find(); the compiled regex is cheap enough there
+        find = getattr(data, 'find', None)
+        if self._needs_brace and find and find(brace) == -1:
+            return
+
+        for match in regex.finditer(data):
+            yield match.start(), self._as_str(match.group(0))
+
+    def literal_prefixes(self, lower=True):
+        """
+        Lowercased literal text before the '{' of every format (b"flag" for flag{...}),
+        for callers that prefilter huge buffers themselves. None if any format lacks one.
+        With lower=False the prefixes keep the case they were written in (b"picoCTF").
+        """
+        prefixes = []
+        for p in self.patterns:
+            match = re.match(r"((?:\\.|[A-Za-z0-9_ -])+)\\\{", p)
+            if not match:
+                return None
+            literal = re.sub(r"\\(.)", r"\1", match.group(1))
+            prefixes.append((literal.lower() if lower else literal).encode())
+        return prefixes
+
+    @staticmethod
+    def _leading_chars(patterns):
+        """Both cases of each pattern's literal first letter, or '' if any pattern lacks one."""
+        chars = set()
+        for p in patterns:
+            # Bail out on anything where the first letter might be optional or alternated
+            if not p or not p[0].isalnum() or p[1:2] in ("*", "?", "{") or "|" in p:
+                return ""
+            chars.update((p[0].lower(), p[0].upper()))
+        return "".join(sorted(chars))
+
+    @staticmethod
+    def _as_str(value):
+        if isinstance(value, str):
+            return value
+        return bytes(value).decode('utf-8', errors='ignore')
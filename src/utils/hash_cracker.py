@@ -0,0 +1,204 @@
+"""
+Utility: Hash cracking.
+Identifies unsalted hex digests by length and cracks them with a dictionary attack:
+the wordlist is streamed in chunks to a process pool (constant memory, however large
+the list), every word optionally goes through mangling rules and flag-format
+wrappers, and a shared event stops every worker as soon as all hashes are cracked.
+"""
+import os
+import re
+import time
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# Hex digest length -> candidate algorithms, most common first
+HASH_TYPES = {
+    32: ["md5", "ntlm", "md4"],
+    40: ["sha1", "ripemd160"],
+    56: ["sha224", "sha3_224"],
+    64: ["sha256", "sha3_256", "blake2s"],
+    96: ["sha384", "sha3_384"],
+    128: ["sha512", "sha3_512", "blake2b"],
+}
+
+HEX_RE = re.compile(r"[0-9a-fA-F]+")
+
+CHUNK_SIZE = 20000          # Words per task handed to a worker
+STOP_CHECK = 1024           # Words between two looks at the stop event
+
+# Tried before any wordlist: the usual suspects of beginner challenges
+COMMON_WORDS = [
+    b"password", b"123456", b"12345678", b"qwerty", b"abc123", b"letmein", b"admin",
+    b"welcome", b"monkey", b"dragon", b"iloveyou", b"secret", b"root", b"toor", b"pass",
+    b"test", b"hello", b"flag", b"ctf", b"hacker", b"hunter2", b"password1", b"trustno1",
+]
+
+LEET = bytes.maketrans(b"aeiost", b"431057")
+
+# Mangling rules: name -> word -> variants. Rules compound in the order given:
+# ["case", "digits"] also yields "Password1", at 3 x 13 candidates per word
+RULES = {
+    "case": lambda w: [w.capitalize(), w.upper()],
+    "reverse": lambda w: [w[::-1]],
+    "leet": lambda w: [w.translate(LEET)],
+    "digits": lambda w: [w + str(d).encode() for d in range(10)] + [w + b"123", w + b"1234"],
+    "years": lambda w: [w + str(y).encode() for y in range(1990, 2031)],
+    "symbols": lambda w: [w + s for s in (b"!", b"?", b"@", b"#", b"$")],
+}
+
+def hasher(name):
+    """Digest function for an algorithm name, or None if this Python lacks it."""
+    if name == "ntlm":
+        md4 = hasher("md4")
+        return (lambda data: md4(data.decode('utf-8', 'ignore').encode('utf-16-le'))) if md4 else None
+    try:
+        hashlib.new(name)
+    except ValueError:
+        return None
+    constructor = getattr(hashlib, name, None) or (lambda data: hashlib.new(name, data))
+    return lambda data: constructor(data).digest()
+
+def identify(text):
+    """Candidate algorithms for a hex digest (only the available ones), or [] if it is not one."""
+    text = text.strip()
+    if not HEX_RE.fullmatch(text):
+        return []
+    return [name for name in HASH_TYPES.get(len(text), []) if hasher(name)]
+
+def candidates(word, rules=(), wrappers=()):
+    """Every plaintext a word stands for: the word, its mangled forms, each wrapped in a flag format."""
+    variants = [word]
+    for rule in rules:
+        variants += [mangled for variant in variants for mangled in RULES[rule](variant)]
+    for variant in list(dict.fromkeys(variants)):
+        yield variant
+        for prefix in wrappers:
+            yield prefix + b"{" + variant + b"}"
+
+def read_chunks(path, size=CHUNK_SIZE):
+    """Streams a wordlist (one word per line, any encoding) as lists of bytes."""
+    chunk = []
+    with open(path, 'rb') as f:
+        for line in f:
+            word = line.rstrip(b"\r\n")
+            if word:
+                chunk.append(word)
+                if len(chunk) == size:
+                    yield chunk
+                    chunk = []
+    if chunk:
+        yield chunk
+
+# Per-process state of pool workers, set once by _init_worker
+_job = None
+
+# Cleared in processes that are themselves pool workers (batch, daemon, fan-out):
+# a pool per worker would start workers x CPUs processes
+POOL_ALLOWED = True
+
+def disable_pool():
+    """Makes every HashCracker in this process crack inline instead of starting a pool."""
+    global POOL_ALLOWED
+    POOL_ALLOWED = False
+
+def _init_worker(stop, algorithms, targets, rules, wrappers):
+    global _job
+    _job = (stop, algorithms, targets, rules, wrappers)
+
+def _crack_chunk(words):
+    """Worker task: one chunk. Returns ([(digest hex, algorithm, plaintext)], hashes computed, words done)."""
+    stop, algorithms, targets, rules, wrappers = _job
+    return _search(words, algorithms, targets, rules, wrappers, stop)
+
+def _search(words, algorithms, targets, rules, wrappers, stop=None):
+    functions = [(name, hasher(name)) for name in algorithms]
+    found, computed, done = [], 0, 0
+    for word in words:
+        if stop is not None and done % STOP_CHECK == 0 and stop.is_set():
+            break
+        for plaintext in candidates(word, rules, wrappers):
+            for name, digest in functions:
+                value = digest(plaintext)
+                if value in targets:
+                    found.append((value.hex(), name, plaintext))
+            computed += len(functions)
+        done += 1
+    return found, computed, done
+
+class HashCracker:
+    def __init__(self, workers=None, chunk_size=CHUNK_SIZE, rules=(), wrappers=()):
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        unknown = set(rules) - set(RULES)
+        if unknown:
+            raise ValueError(f"unknown mangling rules: {', '.join(sorted(unknown))}")
+        self.rules = tuple(rules)
+        self.wrappers = tuple(wrappers)
+
+    def crack(self, hashes, wordlists=()):
+        """
+        Cracks hex digests with COMMON_WORDS, then every wordlist in turn.
+        Returns (results, stats): results maps each cracked digest to (algorithm, plaintext);
+        stats has 'words', 'hashes' (digests computed), 'elapsed' and 'rate' (hashes/s).
+        """
+        start = time.perf_counter()
+        targets = {bytes.fromhex(h.strip()) for h in hashes}
+        algorithms = list(dict.fromkeys(name for h in hashes for name in identify(h)))
+        results = {}
+        stats = {'words': 0, 'hashes': 0, 'elapsed': 0.0, 'rate': 0.0}
+
+        def record(found, computed, words):
+            for digest, name, plaintext in found:
+                results.setdefault(digest, (name, plaintext))
+            stats['hashes'] += computed
+            stats['words'] += words
+
+        if algorithms:
+            # The built-in list is too small to be worth a pool
+            record(*_search(COMMON_WORDS, algorithms, targets, self.rules, self.wrappers))
+            for path in wordlists:
+                if len(results) == len(targets):
+                    break
+                chunks = read_chunks(path, self.chunk_size)
+                if self.workers > 1 and POOL_ALLOWED:
+                    self._crack_parallel(chunks, algorithms, targets, results, record)
+                else:
+                    for chunk in chunks:
+                        record(*_search(chunk, algorithms, targets, self.rules, self.wrappers))
+                        if len(results) == len(targets):
+                            break
+
+        stats['elapsed'] = time.perf_counter() - start
+        stats['rate'] = stats['hashes'] / stats['elapsed'] if stats['elapsed'] else 0.0
+        return results, stats
+
+    def _crack_parallel(self, chunks, algorithms, targets, results, record):
+        """At most two chunks per worker are in flight, so memory stays flat for any list size."""
+        # Not fork: the caller may own live threads (an NDJSON writer, the daemon's) whose
+        # locks a forked child would inherit mid-use. _init_worker ships all the state.
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        if 'forkserver' in methods:
+            context.set_forkserver_preload([__name__])
+        stop = context.Event()
+        pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                   initializer=_init_worker,
+                                   initargs=(stop, algorithms, targets, self.rules, self.wrappers))
+        pending = set()
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    break
+                pending.add(pool.submit(_crack_chunk, chunk))
+                if len(pending) >= self.workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(*future.result())
+                    if len(results) == len(targets):
+                        stop.set()      # Workers notice within STOP_CHECK words
+            for future in pending:
+                record(*future.result())
+        finally:
+            stop.set()
+            pool.shutdown(wait=True, cancel_futures=True)
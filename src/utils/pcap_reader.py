@@ -0,0 +1,639 @@
+"""
+Utility: PCAP Reader
+Role: Streams packets out of pcap/pcapng captures, reassembles TCP streams and
+      decodes HTTP bodies (chunked, gzip, deflate), feeding every stream to the
+      FlagExtractor as it grows. Packets are read one record at a time and every
+      per-flow buffer is capped, so multi-GB captures run in constant memory.
+"""
+import zlib
+import socket
+import struct
+from collections import OrderedDict
+
+from src.core.signatures import identify_header
+
+CAPTURE_TYPES = {
+    'application/vnd.tcpdump.pcap',
+    'application/x-pcapng',
+}
+
+# Global header magic -> (byte order, timestamp resolution)
+PCAP_MAGIC = {
+    b"\xd4\xc3\xb2\xa1": ("<", 1e-6),
+    b"\xa1\xb2\xc3\xd4": (">", 1e-6),
+    b"\x4d\x3c\xb2\xa1": ("<", 1e-9),
+    b"\xa1\xb2\x3c\x4d": (">", 1e-9),
+}
+PCAPNG_MAGIC = b"\x0a\x0d\x0d\x0a"
+
+# Link types (see tcpdump.org/linktypes.html)
+LINKTYPE_NULL = 0
+LINKTYPE_ETHERNET = 1
+LINKTYPE_RAW = (101, 12, 14)
+LINKTYPE_LOOP = 108
+LINKTYPE_LINUX_SLL = 113
+LINKTYPE_LINUX_SLL2 = 276
+
+ETHERTYPE_IPV4 = 0x0800
+ETHERTYPE_IPV6 = 0x86dd
+VLAN_TAGS = (0x8100, 0x88a8, 0x9100)
+
+PROTO_TCP = 6
+PROTO_UDP = 17
+IPV6_EXTENSIONS = (0, 43, 60)       # Hop-by-hop, routing, destination options
+IPV6_FRAGMENT = 44
+IPV6_AUTH = 51
+
+TCP_FIN, TCP_SYN, TCP_RST = 0x01, 0x02, 0x04
+
+MAX_RECORD = 16 * 1024 * 1024       # Anything larger is a corrupt length field
+# Bytes kept from the previous chunk of a stream so a flag split across segments is still matched
+OVERLAP = 512
+DECODE_CHUNK = 64 * 1024            # Decompressed output produced per zlib call
+MAX_HEADER = 64 * 1024              # HTTP header block larger than this is not HTTP
+
+HTTP_PREFIXES = (b"GET ", b"POST ", b"PUT ", b"HEAD ", b"DELETE ", b"OPTIONS ",
+                 b"PATCH ", b"CONNECT ", b"TRACE ", b"HTTP/1.")
+_HTTP_LINE_PREFIXES = tuple(prefix.decode() for prefix in HTTP_PREFIXES)
+SNIFF_SIZE = 8
+# Smallest body (after type and length, without the trailing length) of each block we decode
+PCAPNG_MIN_BODY = {1: 8, 2: 20, 3: 4, 6: 20}
+PCAPNG_SHB_MIN = 28
+
+_PCAP_RECORD = {endian: struct.Struct(endian + "IIII") for endian in "<>"}
+_EPB = {endian: struct.Struct(endian + "IIIII") for endian in "<>"}
+_BLOCK = {endian: struct.Struct(endian + "II") for endian in "<>"}
+_TCP = struct.Struct(">HHIIBB")
+_UDP = struct.Struct(">HHH")
+
+# --- Capture files ---
+
+def read_packets(source):
+    """
+    Yields (timestamp, linktype, frame) for every packet of a pcap or pcapng capture.
+    'source' is a path or a binary file object; records are read one at a time.
+    """
+    f = open(source, 'rb') if isinstance(source, str) else source
+    try:
+        magic = f.read(4)
+        if magic in PCAP_MAGIC:
+            yield from _read_pcap(f, magic)
+        elif magic == PCAPNG_MAGIC:
+            yield from _read_pcapng(f)
+        else:
+            raise ValueError("not a pcap or pcapng capture")
+    finally:
+        if f is not source:
+            f.close()
+
+def _read_pcap(f, magic):
+    endian, resolution = PCAP_MAGIC[magic]
+    header = f.read(20)
+    if len(header) < 20:
+        raise ValueError("truncated pcap header")
+    # The upper bits of the link type field carry FCS information
+    linktype = struct.unpack(endian + "I", header[16:20])[0] & 0x0fffffff
+    record = _PCAP_RECORD[endian]
+    while True:
+        head = f.read(16)
+        if len(head) < 16:
+            return
+        seconds, fraction, caplen, _ = record.unpack(head)
+        if caplen > MAX_RECORD:
+            raise ValueError(f"corrupt pcap record ({caplen} bytes)")
+        frame = f.read(caplen)
+        if len(frame) < caplen:
+            return  # Capture cut off mid-packet
+        yield seconds + fraction * resolution, linktype, frame
+
+def _read_pcapng(f):
+    endian = "<"
+    interfaces = []     # (linktype, timestamp resolution) per interface of the current section
+
+    def interface(index):
+        if index >= len(interfaces):
+            raise ValueError("corrupt pcapng block (unknown interface)")
+        return interfaces[index]
+
+    head = PCAPNG_MAGIC + f.read(4)
+    while len(head) == 8:
+        if head[:4] == PCAPNG_MAGIC:
+            # Section header: the byte-order magic decides how the rest is read
+            order = f.read(4)
+            if order == b"\x4d\x3c\x2b\x1a":
+                endian = "<"
+            elif order == b"\x1a\x2b\x3c\x4d":
+                endian = ">"
+            else:
+                raise ValueError("bad pcapng byte-order magic")
+            length = struct.unpack(endian + "I", head[4:])[0]
+            if length < PCAPNG_SHB_MIN or length > MAX_RECORD:
+                raise ValueError(f"corrupt pcapng block ({length} bytes)")
+            body = f.read(length - 12)
+            if len(body) < length - 12:
+                return
+            interfaces = []
+        else:
+            kind, length = _BLOCK[endian].unpack(head)
+            if length < 12 or length > MAX_RECORD:
+                raise ValueError(f"corrupt pcapng block ({length} bytes)")
+            body = f.read(length - 8)
+            if len(body) < length - 8:
+                return
+            body = body[:-4]  # Trailing copy of the block length
+            if len(body) < PCAPNG_MIN_BODY.get(kind, 0):
+                raise ValueError(f"corrupt pcapng block (type {kind}, {length} bytes)")
+
+            if kind == 1:       # Interface description
+                interfaces.append((struct.unpack(endian + "H", body[:2])[0],
+                                   _tsresol(body[8:], endian)))
+            elif kind == 6:     # Enhanced packet
+                iface, high, low, caplen, _ = _EPB[endian].unpack_from(body)
+                linktype, resolution = interface(iface)
+                yield ((high << 32) | low) * resolution, linktype, body[20:20 + caplen]
+            elif kind == 3:     # Simple packet (always interface 0, no timestamp)
+                length = struct.unpack(endian + "I", body[:4])[0]
+                yield 0.0, interface(0)[0], body[4:4 + length]
+            elif kind == 2:     # Obsolete packet block
+                iface, _ = struct.unpack(endian + "HH", body[:4])
+                high, low, caplen, _ = struct.unpack(endian + "IIII", body[4:20])
+                linktype, resolution = interface(iface)
+                yield ((high << 32) | low) * resolution, linktype, body[20:20 + caplen]
+        head = f.read(8)
+
+def _tsresol(options, endian):
+    """Timestamp resolution from an interface block's if_tsresol option (default: microseconds)."""
+    pos = 0
+    while pos + 4 <= len(options):
+        code, length = struct.unpack(endian + "HH", options[pos:pos + 4])
+        if code == 0:
+            break
+        if code == 9 and length == 1:
+            value = options[pos + 4]
+            return 2.0 ** -(value & 0x7f) if value & 0x80 else 10.0 ** -value
+        pos += 4 + (length + 3) // 4 * 4
+    return 1e-6
+
+# --- Packet decoding ---
+
+def _network_layer(linktype, frame):
+    """Returns (ethertype, packet) for the supported link types, or None."""
+    if linktype == LINKTYPE_ETHERNET:
+        if len(frame) < 14:
+            return None
+        ethertype = int.from_bytes(frame[12:14], 'big')
+        offset = 14
+        while ethertype in VLAN_TAGS and len(frame) >= offset + 4:
+            ethertype = int.from_bytes(frame[offset + 2:offset + 4], 'big')
+            offset += 4
+        return ethertype, frame[offset:]
+    if linktype == LINKTYPE_LINUX_SLL:
+        return int.from_bytes(frame[14:16], 'big'), frame[16:]
+    if linktype == LINKTYPE_LINUX_SLL2:
+        return int.from_bytes(frame[0:2], 'big'), frame[20:]
+    if linktype in (LINKTYPE_NULL, LINKTYPE_LOOP):
+        frame = frame[4:]   # Address family, in the capturing host's byte order
+    elif linktype not in LINKTYPE_RAW:
+        return None
+    if not frame:
+        return None
+    version = frame[0] >> 4
+    return (ETHERTYPE_IPV4 if version == 4 else ETHERTYPE_IPV6 if version == 6 else None), frame
+
+def decode_packet(linktype, frame):
+    """
+    Decodes a frame down to the transport layer.
+    Returns (protocol, src, sport, dst, dport, segment) for TCP/UDP, else None.
+    IP fragments are skipped: CTF captures rarely need them reassembled.
+    """
+    network = _network_layer(linktype, frame)
+    if not network:
+        return None
+    ethertype, packet = network
+
+    if ethertype == ETHERTYPE_IPV4:
+        if len(packet) < 20:
+            return None
+        header = (packet[0] & 0x0f) * 4
+        if (int.from_bytes(packet[6:8], 'big') & 0x3fff) != 0:
+            return None  # More-fragments flag or a non-zero fragment offset
+        proto = packet[9]
+        total = int.from_bytes(packet[2:4], 'big')
+        # A zero total length is what segmentation offload leaves behind
+        end = total if header <= total <= len(packet) else len(packet)
+        src, dst = socket.inet_ntop(socket.AF_INET, packet[12:16]), socket.inet_ntop(socket.AF_INET, packet[16:20])
+        payload = packet[header:end]
+    elif ethertype == ETHERTYPE_IPV6:
+        if len(packet) < 40:
+            return None
+        proto = packet[6]
+        end = min(40 + int.from_bytes(packet[4:6], 'big'), len(packet))
+        src, dst = socket.inet_ntop(socket.AF_INET6, packet[8:24]), socket.inet_ntop(socket.AF_INET6, packet[24:40])
+        offset = 40
+        while proto in IPV6_EXTENSIONS or proto == IPV6_AUTH:
+            if offset + 2 > end:
+                return None
+            size = (packet[offset + 1] + 2) * 4 if proto == IPV6_AUTH else (packet[offset + 1] + 1) * 8
+            proto = packet[offset]
+            offset += size
+        if proto == IPV6_FRAGMENT:
+            return None
+        payload = packet[offset:end]
+    else:
+        return None
+
+    if proto == PROTO_TCP and len(payload) >= 20:
+        sport, dport = _UDP.unpack_from(payload)[:2]
+        return PROTO_TCP, src, sport, dst, dport, payload
+    if proto == PROTO_UDP and len(payload) >= 8:
+        sport, dport, length = _UDP.unpack_from(payload)
+        return PROTO_UDP, src, sport, dst, dport, payload[8:max(8, min(length, len(payload)))]
+    return None
+
+# --- Stream consumers ---
+
+class _FlagStream:
+    """Feeds one byte stream to the extractor chunk by chunk, with an overlap for split flags."""
+    __slots__ = ('where', 'report', 'extractor', 'tail', 'position')
+
+    def __init__(self, where, extractor, report):
+        self.where = where
+        self.extractor = extractor
+        self.report = report
+        self.tail = b""
+        self.position = 0
+
+    def feed(self, data):
+        buf = self.tail + data
+        base = self.position - len(self.tail)
+        for offset, flag in self.extractor.iter_matches(buf):
+            self.report(self.where, base + offset, flag)
+        self.position += len(data)
+        self.tail = buf[-OVERLAP:]
+
+class _BodyDecoder:
+    """Content-Encoding decoder (gzip/deflate/identity) with a cap on the decoded size."""
+    def __init__(self, encoding, sink, limit):
+        self.sink = sink
+        self.left = limit
+        self.limited = False
+        self.raw = encoding not in ('gzip', 'x-gzip', 'deflate')
+        # wbits 47 accepts both gzip and zlib headers; raw deflate is retried below
+        self._z = None if self.raw else zlib.decompressobj(32 + zlib.MAX_WBITS)
+        self._started = False
+
+    def feed(self, data):
+        if self._z is False:
+            return
+        if self.left <= 0:
+            self.limited = True
+            return
+        if self.raw:
+            self._emit(data)
+            return
+        try:
+            self._inflate(data)
+        except zlib.error:
+            if self._started:
+                self._z = False  # Corrupt body: stop decoding it
+                return
+            # Some servers send "deflate" as a bare deflate stream without the zlib header
+            self._z = zlib.decompressobj(-zlib.MAX_WBITS)
+            try:
+                self._inflate(data)
+            except zlib.error:
+                self._z = False
+
+    def _inflate(self, data):
+        z = self._z
+        while data and self.left > 0 and not z.eof:
+            out = z.decompress(data, DECODE_CHUNK)
+            data = z.unconsumed_tail
+            if out:
+                self._started = True
+                self._emit(out)
+        if self.left <= 0 and (data or not z.eof):
+            self.limited = True
+
+    def _emit(self, data):
+        if len(data) > self.left:
+            data = data[:self.left]
+            self.limited = True
+        self.left -= len(data)
+        self.sink(data)
+
+class _HttpStream:
+    """
+    Incremental HTTP/1.x parser for one direction of a TCP stream (keep-alive aware).
+    Decoded bodies of chunked or compressed messages are fed to their own _FlagStream;
+    plain bodies are already covered by the raw stream.
+    """
+    def __init__(self, scanner, where):
+        self.scanner = scanner
+        self.where = where
+        self.state = 'headers'
+        self.buf = b""
+        self.remaining = 0
+        self.decoder = None
+        self.messages = 0
+
+    def feed(self, data):
+        buf = self.buf + data if self.buf else data
+        self.buf = b""
+        while buf and self.state != 'dead':
+            buf = getattr(self, '_' + self.state)(buf)
+            if buf is None:
+                return
+
+    def close(self):
+        self._end_message()
+
+    def _headers(self, buf):
+        end = buf.find(b"\r\n\r\n")
+        if end < 0:
+            if len(buf) > MAX_HEADER:
+                self.state = 'dead'
+                return None
+            self.buf = buf
+            return None
+        lines = buf[:end].decode('latin-1').split("\r\n")
+        buf = buf[end + 4:]
+        if not lines[0].startswith(_HTTP_LINE_PREFIXES):
+            self.state = 'dead'  # Lost sync (e.g. after a gap)
+            return None
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip().lower()
+        self.messages += 1
+        self.scanner.stats['http_messages'] += 1
+
+        is_response = lines[0].startswith("HTTP/")
+        status = lines[0].split(" ", 2)[1] if is_response and " " in lines[0] else ""
+        chunked = 'chunked' in headers.get('transfer-encoding', '')
+        encoding = headers.get('content-encoding', '')
+        length = headers.get('content-length', '')
+
+        if status.startswith("1") or status in ("204", "304"):
+            return buf
+        if chunked or encoding:
+            where = f"{self.where} #{self.messages} body"
+            self.decoder = self.scanner._body_decoder(where, encoding)
+        if chunked:
+            self.state = 'chunk_size'
+        elif length.isdigit():
+            self.remaining = int(length)
+            self.state = 'body' if self.remaining else 'headers'
+        elif is_response:
+            self.state = 'until_close'
+        if self.state == 'headers':
+            self._end_message()
+        return buf
+
+    def _body(self, buf):
+        part, buf = buf[:self.remaining], buf[self.remaining:]
+        self._feed_body(part)
+        self.remaining -= len(part)
+        if not self.remaining:
+            self._end_message()
+            self.state = 'headers'
+        return buf
+
+    def _until_close(self, buf):
+        self._feed_body(buf)
+        return None
+
+    def _chunk_size(self, buf):
+        end = buf.find(b"\r\n")
+        if end < 0:
+            if len(buf) > MAX_HEADER:
+                self.state = 'dead'
+                return None
+            self.buf = buf
+            return None
+        try:
+            size = int(buf[:end].split(b";")[0].strip(), 16)
+        except ValueError:
+            self.state = 'dead'
+            return None
+        self.remaining = size
+        self.state = 'chunk_data' if size else 'trailers'
+        return buf[end + 2:]
+
+    def _chunk_data(self, buf):
+        part, buf = buf[:self.remaining], buf[self.remaining:]
+        self._feed_body(part)
+        self.remaining -= len(part)
+        if not self.remaining:
+            self.remaining = 2
+            self.state = 'chunk_end'
+        return buf
+
+    def _chunk_end(self, buf):
+        # CRLF after each chunk's data
+        skip = min(self.remaining, len(buf))
+        self.remaining -= skip
+        if not self.remaining:
+            self.state = 'chunk_size'
+        return buf[skip:]
+
+    def _trailers(self, buf):
+        if buf.startswith(b"\r\n"):
+            end = 0
+        else:
+            end = buf.find(b"\r\n\r\n")
+            if end < 0:
+                self.buf = buf
+                return None
+            end += 2
+        self._end_message()
+        self.state = 'headers'
+        return buf[end + 2:]
+
+    def _feed_body(self, data):
+        if self.decoder:
+            self.decoder.feed(data)
+
+    def _end_message(self):
+        if self.decoder and self.decoder.limited:
+            self.scanner.stats['limited'] += 1
+        self.decoder = None
+
+class _HalfStream:
+    """One direction of a TCP connection: in-order delivery with a bounded out-of-order buffer."""
+    __slots__ = ('flow', 'next_seq', 'pending', 'pending_bytes', 'raw', 'http', 'sniff')
+
+    def __init__(self, flow, raw):
+        self.flow = flow            # "src:port -> dst:port"
+        self.next_seq = None
+        self.pending = {}           # seq -> payload received ahead of next_seq
+        self.pending_bytes = 0
+        self.raw = raw
+        self.http = None
+        self.sniff = b""            # First bytes, held until HTTP can be recognized
+
+def _seq_diff(a, b):
+    """a - b in 32-bit sequence space (handles wraparound)."""
+    return ((a - b + 0x80000000) & 0xffffffff) - 0x80000000
+
+class PcapScanner:
+    def __init__(self, extractor, max_flows=8192, max_pending=256 * 1024,
+                 max_buffered=64 * 1024 * 1024, max_body=64 * 1024 * 1024):
+        """
+        extractor:    FlagExtractor fed with every stream.
+        max_flows:    TCP stream directions tracked at once (least recently used are flushed).
+        max_pending:  out-of-order bytes held per direction before skipping the gap.
+        max_buffered: out-of-order bytes held across all directions.
+        max_body:     decoded bytes searched per HTTP body (decompression bomb guard).
+        """
+        self.extractor = extractor
+        self.max_flows = max_flows
+        self.max_pending = max_pending
+        self.max_buffered = max_buffered
+        self.max_body = max_body
+
+    @staticmethod
+    def capture_type(header):
+        """MIME type if the header belongs to a pcap/pcapng capture, else None."""
+        mime = identify_header(bytes(header[:4096]))
+        return mime if mime in CAPTURE_TYPES else None
+
+    def scan(self, source):
+        """
+        Reads every packet of the capture once.
+        Returns (findings, stats): findings are (where, offset, flag) for the first
+        occurrence of each flag, where 'where' names the stream, UDP flow or HTTP
+        body and 'offset' is the byte offset inside it.
+        """
+        self.findings = []
+        self._seen = set()
+        self._flows = OrderedDict()
+        self._buffered = 0
+        self.stats = {'packets': 0, 'tcp_streams': 0, 'udp_datagrams': 0, 'http_messages': 0,
+                      'bytes': 0, 'gaps': 0, 'skipped': 0, 'limited': 0}
+        try:
+            for _, linktype, frame in read_packets(source):
+                self.stats['packets'] += 1
+                decoded = decode_packet(linktype, frame)
+                if not decoded:
+                    self.stats['skipped'] += 1
+                elif decoded[0] == PROTO_TCP:
+                    self._tcp(*decoded[1:])
+                else:
+                    self._udp(*decoded[1:])
+        finally:
+            while self._flows:
+                self._close(next(iter(self._flows)))
+        return self.findings, self.stats
+
+    def _report(self, where, offset, flag):
+        if flag not in self._seen:
+            self._seen.add(flag)
+            self.findings.append((where, offset, flag))
+
+    def _body_decoder(self, where, encoding):
+        body = _FlagStream(where, self.extractor, self._report)
+        return _BodyDecoder(encoding, body.feed, self.max_body)
+
+    def _udp(self, src, sport, dst, dport, payload):
+        self.stats['udp_datagrams'] += 1
+        for offset, flag in self.extractor.iter_matches(payload):
+            self._report(f"udp {_endpoint(src, sport)} -> {_endpoint(dst, dport)}", offset, flag)
+
+    def _tcp(self, src, sport, dst, dport, segment):
+        _, _, seq, _, data_offset, flags = _TCP.unpack_from(segment)
+        payload = segment[(data_offset >> 4) * 4:]
+        key = (src, sport, dst, dport)
+
+        stream = self._flows.get(key)
+        if stream is None:
+            if not payload and not flags & TCP_SYN:
+                return  # Bare ACK/FIN of a stream that carried nothing we saw
+            flow = f"{_endpoint(src, sport)} -> {_endpoint(dst, dport)}"
+            stream = self._flows[key] = _HalfStream(flow, _FlagStream(f"tcp {flow}", self.extractor,
+                                                                      self._report))
+            self.stats['tcp_streams'] += 1
+            if len(self._flows) > self.max_flows:
+                self._close(next(iter(self._flows)))
+        else:
+            self._flows.move_to_end(key)
+
+        if flags & TCP_SYN:
+            seq = (seq + 1) & 0xffffffff
+        if stream.next_seq is None:
+            stream.next_seq = seq  # Capture may start mid-connection
+        if payload:
+            self._segment(stream, seq, payload)
+        if flags & (TCP_FIN | TCP_RST):
+            self._close(key)
+        while self._buffered > self.max_buffered and self._flows:
+            self._close(next(iter(self._flows)))
+
+    def _segment(self, stream, seq, payload):
+        ahead = _seq_diff(seq, stream.next_seq)
+        if ahead > 0:
+            # Out of order: hold it until the gap is filled (or the buffer cap gives up on it)
+            if len(payload) > len(stream.pending.get(seq, b"")):
+                added = len(payload) - len(stream.pending.get(seq, b""))
+                stream.pending[seq] = payload
+                stream.pending_bytes += added
+                self._buffered += added
+            if stream.pending_bytes > self.max_pending:
+                self._skip_gap(stream)
+            return
+        self._deliver(stream, seq, payload)
+        self._drain(stream)
+
+    def _deliver(self, stream, seq, payload):
+        """Delivers the part of a segment at or after next_seq (retransmitted bytes are trimmed)."""
+        skip = -_seq_diff(seq, stream.next_seq)
+        if skip >= len(payload):
+            return
+        data = payload[skip:]
+        stream.next_seq = (stream.next_seq + len(data)) & 0xffffffff
+        self.stats['bytes'] += len(data)
+        stream.raw.feed(data)
+
+        if stream.http is None:
+            stream.sniff += data
+            if len(stream.sniff) >= SNIFF_SIZE:
+                sniff, stream.sniff = stream.sniff, b""
+                if sniff.startswith(HTTP_PREFIXES):
+                    stream.http = _HttpStream(self, f"http {stream.flow}")
+                    stream.http.feed(sniff)
+                else:
+                    stream.http = False
+        elif stream.http:
+            stream.http.feed(data)
+
+    def _drain(self, stream):
+        while stream.pending:
+            seq = min(stream.pending, key=lambda s: _seq_diff(s, stream.next_seq))
+            if _seq_diff(seq, stream.next_seq) > 0:
+                return
+            payload = stream.pending.pop(seq)
+            stream.pending_bytes -= len(payload)
+            self._buffered -= len(payload)
+            self._deliver(stream, seq, payload)
+
+    def _skip_gap(self, stream):
+        """Gives up on missing bytes: resumes at the earliest buffered segment."""
+        self.stats['gaps'] += 1
+        stream.next_seq = min(stream.pending, key=lambda s: _seq_diff(s, stream.next_seq))
+        if stream.http:
+            stream.http.state = 'dead'  # The parser cannot resync mid-message
+        self._drain(stream)
+
+    def _close(self, key):
+        stream = self._flows.pop(key)
+        while stream.pending:
+            self._skip_gap(stream)
+        if stream.http is None and stream.sniff.startswith(HTTP_PREFIXES):
+            stream.http = _HttpStream(self, f"http {stream.flow}")
+            stream.http.feed(stream.sniff)
+        if stream.http:
+            stream.http.close()
+
+def _endpoint(address, port):
+    return f"[{address}]:{port}" if ":" in address else f"{address}:{port}"
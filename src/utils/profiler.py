@@ -0,0 +1,97 @@
+"""
+Utility: Profiler
+Role: Lightweight span timers for per-stage timing. Disabled by default, in which
+      case span() hands back a shared no-op context manager and records nothing.
+"""
+import os
+import json
+import time
+import threading
+import contextlib
+
+_enabled = False
+_spans = []
+_lock = threading.Lock()
+_NOOP = contextlib.nullcontext()
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        record = (self.name, self.start, end, os.getpid(), threading.get_ident(), self.args)
+        with _lock:
+            _spans.append(record)
+
+def span(name, **args):
+    """Times a block: `with span("crypto.Base64"): ...`. Free when profiling is off."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name, args)
+
+def enable():
+    global _enabled
+    _enabled = True
+
+def disable():
+    global _enabled
+    _enabled = False
+
+def is_enabled():
+    return _enabled
+
+def reset():
+    with _lock:
+        _spans.clear()
+
+def records():
+    """Recorded spans as (name, start, end, pid, tid, args) tuples."""
+    with _lock:
+        return list(_spans)
+
+def add_records(spans):
+    """Merges spans recorded elsewhere (e.g. in a batch worker process)."""
+    with _lock:
+        _spans.extend(tuple(s) for s in spans)
+
+def summary():
+    """
+    Per-stage totals, slowest first: [(name, count, total, mean, max)].
+    Times are inclusive, so a parent stage also contains its children.
+    """
+    stages = {}
+    for name, start, end, *_ in records():
+        stats = stages.setdefault(name, [0, 0.0, 0.0])
+        duration = end - start
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+    rows = [(name, count, total, total / count, longest)
+            for name, (count, total, longest) in stages.items()]
+    return sorted(rows, key=lambda row: row[2], reverse=True)
+
+def export_chrome_trace(path):
+    """Writes the spans as Chrome trace 'complete' events (chrome://tracing, Perfetto)."""
+    spans = records()
+    origin = min((s[1] for s in spans), default=0.0)
+    events = [{
+        "name": name,
+        "cat": name.split(".")[0],
+        "ph": "X",
+        "ts": (start - origin) * 1e6,
+        "dur": (end - start) * 1e6,
+        "pid": pid,
+        "tid": tid,
+        "args": args,
+    } for name, start, end, pid, tid, args in spans]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, default=str)
+    return len(events)
@@ -0,0 +1,235 @@
+"""
+Utility: RSA attacks.
+Parses RSA parameters (PEM/DER keys, n=/e=/c= text) and runs the classic fast attacks:
+small-e integer root, Fermat for close primes, Wiener for small private exponents,
+common modulus, and batch GCD. Batch GCD finds every modulus sharing a prime with
+another one through a product tree and a remainder tree, in quasi-linear time
+instead of one gcd per pair. Python ints divide in quadratic time, so the trees run
+on gmpy2 when it is installed and on exact decimal arithmetic (whose big-number
+multiplication and division are quasi-linear) otherwise.
+"""
+import re
+import math
+import decimal
+import importlib.util
+
+try:
+    import gmpy2
+    GMPY2_AVAILABLE = True
+except ImportError:
+    GMPY2_AVAILABLE = False
+
+# pycryptodome parses PEM/DER keys; it is imported only once a key block shows up
+CRYPTO_AVAILABLE = importlib.util.find_spec("Crypto") is not None
+
+DEFAULT_E = 65537
+SMALL_E = 17                # Exponents up to this get the integer-root attack
+SMALL_E_TRIES = 10000       # m^e may wrap n a few times: c + k*n for k below this
+FERMAT_ROUNDS = 100000
+MIN_BARE_BITS = 64          # Smallest n taken without an e or c next to it
+
+PEM_RE = re.compile(rb"-----BEGIN ([A-Z ]+)-----[\s\S]+?-----END \1-----")
+# n = 0x..., e: 65537, c1 = ..., ct = ... (a digit suffix groups the values of one key)
+PARAM_RE = re.compile(r"(?<![\w])(n|e|c|ct|modulus|exponent|ciphertext)(\d*)\s*[=:]\s*(0x[0-9a-f]+|\d+)",
+                      re.IGNORECASE)
+PARAM_NAMES = {'modulus': 'n', 'exponent': 'e', 'ct': 'c', 'ciphertext': 'c'}
+
+class RsaKey:
+    def __init__(self, n, e=DEFAULT_E, c=None, source=None):
+        self.n = n
+        self.e = e
+        self.c = c                  # Ciphertext as an int, if the challenge gives one
+        self.source = source        # Where the key came from, e.g. "PEM #1" or "n2/e2/c2"
+
+    def __repr__(self):
+        return f"RsaKey({self.source}, {self.n.bit_length()} bits, e={self.e})"
+
+def parse(data):
+    """Every RSA key in a buffer (bytes or str): PEM blocks, a DER key, or n=/e=/c= values."""
+    raw = data.encode('latin-1', errors='ignore') if isinstance(data, str) else bytes(data)
+    keys = []
+    blocks = [m.group(0) for m in PEM_RE.finditer(raw) if b"PRIVATE" in m.group(1) or b"PUBLIC" in m.group(1)]
+    if not blocks and raw[:1] == b"\x30":
+        blocks = [raw]   # Maybe a bare DER key
+    if blocks and CRYPTO_AVAILABLE:
+        from Crypto.PublicKey import RSA
+        for i, block in enumerate(blocks, 1):
+            try:
+                key = RSA.import_key(block)
+            except (ValueError, IndexError, TypeError):
+                continue
+            keys.append(RsaKey(key.n, key.e, source=f"{'PEM' if block is not raw else 'DER'} #{i}"))
+    return keys + _parse_params(raw.decode('latin-1'))
+
+def _parse_params(text):
+    """
+    n/e/c assignments. Digit suffixes group values (n1, e1, c1); a suffixed group
+    without its own n or e uses the plain one (a shared modulus: n, e1, c1, e2, c2).
+    A repeated plain name starts the next key, so a list of moduli gives many keys.
+    A lone small "n = 5" is just text: a key needs e or c next to it, or a real-sized n.
+    """
+    groups = {}
+    plain = []
+    for match in PARAM_RE.finditer(text):
+        name, suffix, value = match.groups()
+        name = PARAM_NAMES.get(name.lower(), name.lower())
+        number = int(value, 16) if value.lower().startswith("0x") else int(value)
+        if suffix:
+            groups.setdefault(suffix, {})[name] = number
+        else:
+            if not plain or name in plain[-1]:
+                plain.append({})
+            plain[-1][name] = number
+
+    keys = []
+    base = plain[0] if plain else {}
+    # Suffixed groups without their own n share the plain one (n, e1, c1, e2, c2)
+    shared = any('n' not in values for values in groups.values())
+    for i, values in enumerate(plain):
+        if 'n' in values and not (shared and i == 0 and 'c' not in values) and \
+                (len(values) > 1 or values['n'] >> MIN_BARE_BITS):
+            label = "n/e/c" if len(plain) == 1 else f"key #{i + 1}"
+            keys.append(RsaKey(values['n'], values.get('e', DEFAULT_E), values.get('c'), label))
+    for suffix, values in groups.items():
+        n = values.get('n', base.get('n'))
+        if n:
+            e = values.get('e', base.get('e', DEFAULT_E))
+            keys.append(RsaKey(n, e, values.get('c'), f"n{suffix}/e{suffix}/c{suffix}"))
+    return keys
+
+# --- Number theory ---
+
+def iroot(x, k):
+    """(floor of the k-th root of x, whether it is exact)."""
+    if x < 2:
+        return x, True
+    root = 1 << -(-x.bit_length() // k)     # Above the root: Newton descends from here
+    while True:
+        smaller = ((k - 1) * root + x // root ** (k - 1)) // k
+        if smaller >= root:
+            break
+        root = smaller
+    return root, root ** k == x
+
+# A square is a quadratic residue modulo anything: squares mod 64 and mod 63*65*11
+# rule out over 99% of non-squares before the costly isqrt
+_SQUARES_64 = {i * i % 64 for i in range(64)}
+_SQUARES_45045 = None
+
+def _is_square(x):
+    global _SQUARES_45045
+    if _SQUARES_45045 is None:
+        table = bytearray(45045)
+        for i in range(45045):
+            table[i * i % 45045] = 1
+        _SQUARES_45045 = bytes(table)
+    if x < 0 or x & 63 not in _SQUARES_64 or not _SQUARES_45045[x % 45045]:
+        return False
+    root = math.isqrt(x)
+    return root * root == x
+
+def decrypt(key, p):
+    """Plaintext int given one prime factor of the modulus, or None."""
+    q = key.n // p
+    phi = (p - 1) * (q - 1) if p != q else p * (p - 1)
+    try:
+        d = pow(key.e, -1, phi)
+    except ValueError:
+        return None      # e shares a factor with phi
+    return pow(key.c, d, key.n)
+
+def to_bytes(m):
+    return m.to_bytes((m.bit_length() + 7) // 8, 'big')
+
+# --- Attacks ---
+
+def small_e(key, tries=SMALL_E_TRIES):
+    """m^e barely (or never) exceeds n: c + k*n is a perfect e-th power for some small k."""
+    if key.c is None or key.e > SMALL_E:
+        return None
+    for k in range(tries):
+        m, exact = iroot(key.c + k * key.n, key.e)
+        if exact:
+            return m
+    return None
+
+def fermat(n, rounds=FERMAT_ROUNDS):
+    """A factor of n when its two primes are close: n = a^2 - b^2 with a just above sqrt(n)."""
+    a = math.isqrt(n)
+    if a * a == n:
+        return a
+    a += 1
+    b2 = a * a - n
+    for _ in range(rounds):
+        if _is_square(b2):
+            return a - math.isqrt(b2)
+        b2 += 2 * a + 1
+        a += 1
+    return None
+
+def wiener(n, e):
+    """A factor of n when d < n^(1/4) / 3: d is the denominator of a convergent of e/n."""
+    num, den = e, n
+    k, k_prev, d, d_prev = 1, 0, 0, 1       # Convergent k/d of the continued fraction
+    while den:
+        a = num // den
+        num, den = den, num - a * den
+        k, k_prev = a * k + k_prev, k
+        d, d_prev = a * d + d_prev, d
+        # e*d = 1 + k*phi: a right guess gives phi, and p + q = n - phi + 1
+        if k == 0 or (e * d - 1) % k:
+            continue
+        s = n - (e * d - 1) // k + 1
+        disc = s * s - 4 * n
+        if disc > 0 and _is_square(disc):
+            p = (s + math.isqrt(disc)) // 2
+            if 1 < p < n and n % p == 0:
+                return p
+    return None
+
+def common_modulus(key1, key2):
+    """Plaintext of one message encrypted under the same n with coprime exponents."""
+    if key1.n != key2.n or key1.c is None or key2.c is None or math.gcd(key1.e, key2.e) != 1:
+        return None
+    a = pow(key1.e, -1, key2.e)
+    b = (1 - a * key1.e) // key2.e          # a*e1 + b*e2 = 1
+    try:
+        return pow(key1.c, a, key1.n) * pow(key2.c, b, key1.n) % key1.n
+    except ValueError:
+        return None      # A ciphertext not invertible mod n (it shares a factor)
+
+def batch_gcd(moduli):
+    """
+    gcd(n_i, product of all other moduli) for every modulus: a product tree of the
+    moduli, then a remainder tree of P mod n_i^2 walked back down. Anything above 1
+    is a shared factor (n_i itself when both of its primes are shared).
+    """
+    if len(moduli) < 2:
+        return [1] * len(moduli)
+    with decimal.localcontext() as context:
+        if not GMPY2_AVAILABLE:
+            context.prec, context.Emax, context.Emin = decimal.MAX_PREC, decimal.MAX_EMAX, decimal.MIN_EMIN
+            context.traps[decimal.Inexact] = True     # Any rounding would be a bug, not a result
+        number = gmpy2.mpz if GMPY2_AVAILABLE else decimal.Decimal
+        tree = [[number(n) for n in moduli]]
+        while len(tree[-1]) > 1:
+            level = tree[-1]
+            tree.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i]
+                         for i in range(0, len(level), 2)])
+        remainders = tree.pop()
+        while tree:
+            level = tree.pop()
+            remainders = [remainders[i // 2] % (n * n) for i, n in enumerate(level)]
+        return [math.gcd(int(r) // n, n) for r, n in zip(remainders, moduli)]
+
+def shared_factors(keys):
+    """(key, prime factor) for every key whose modulus shares a prime with another key."""
+    unique = list(dict.fromkeys(key.n for key in keys))
+    found = {}
+    for n, g in zip(unique, batch_gcd(unique)):
+        if g == n:
+            # Both primes shared (or a duplicate); split it against each other modulus
+            g = next((f for m in unique if m != n and 1 < (f := math.gcd(n, m)) < n), 1)
+        if 1 < g < n:
+            found[n] = g
+    return [(key, found[key.n]) for key in keys if key.n in found]
@@ -0,0 +1,169 @@
+"""
+Utility: LSB Steganography
+Role: Extracts every channel / bit-plane / scan order / bit order combination of an
+      image as a byte stream and searches each one for flags, embedded files and
+      text. All 8 bit planes of a sample sequence come out of one vectorized 8x8
+      bit-matrix transpose (groups of 8 samples viewed as a uint64), and streams are
+      prefiltered on '{' plus the flag prefixes before any regex runs, so all
+      combinations of a 4K image take about a second.
+"""
+from src.core.signatures import identify_header
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+PLANES = tuple(range(8))
+ORDERS = ("xy", "yx")               # Row-major, column-major
+BIT_ORDERS = ("msb", "lsb")         # First sample lands in the high / low bit of each byte
+
+FLAG_WINDOW = 1024                  # Bytes handed to the regex around each prefilter hit
+TEXT_MIN = 8                        # Printable bytes needed at the start of a stream to report it
+# Embedded files worth reporting: magics long enough not to show up in noise
+FILE_TYPES = {
+    "image/png", "image/jpeg", "image/gif", "application/zip", "application/pdf",
+    "application/x-7z-compressed", "application/x-xz", "application/x-bzip2",
+    "application/gzip", "application/x-executable", "application/x-sharedlib",
+    "application/x-pie-executable", "application/vnd.tcpdump.pcap", "application/x-pcapng",
+}
+
+def channel_sets(names):
+    """(label, channel indices) to extract: each channel alone, all in order, all reversed."""
+    sets = [(name, [i]) for i, name in enumerate(names)]
+    if len(names) > 1:
+        sets.append(("".join(names), list(range(len(names)))))
+        sets.append(("".join(reversed(names)), list(range(len(names)))[::-1]))
+    return sets
+
+def bit_planes(samples):
+    """
+    (8, ceil(n / 8)) array whose row p packs bit p of every sample, LSB first
+    (sample 0 in bit 0 of byte 0). Each group of 8 samples is an 8x8 bit matrix in
+    one native (little-endian) uint64; transposing it yields the 8 plane bytes at once.
+    """
+    n = samples.size
+    padded = np.zeros((n + 7) // 8 * 8, dtype=np.uint8)
+    padded[:n] = samples
+    x = padded.view("<u8")
+    t = np.empty_like(x)
+    # Hacker's Delight transpose8: swap 1x1, then 2x2, then 4x4 bit blocks
+    for shift, mask in ((7, 0x00AA00AA00AA00AA), (14, 0x0000CCCC0000CCCC), (28, 0x00000000F0F0F0F0)):
+        shift, mask = np.uint64(shift), np.uint64(mask)
+        np.right_shift(x, shift, out=t)
+        t ^= x
+        t &= mask
+        x ^= t
+        t <<= shift
+        x ^= t
+    # Byte k of each word now holds plane k
+    return np.ascontiguousarray(padded.reshape(-1, 8).T)
+
+def reverse_bits(packed):
+    """Reverses the bit order inside every byte (LSB-first <-> MSB-first packing)."""
+    out = np.zeros((packed.size + 7) // 8 * 8, dtype=np.uint8)
+    out[:packed.size] = packed.ravel()
+    x = out.view(np.uint64)
+    t = np.empty_like(x)
+    # Swap nibbles, then bit pairs, then neighbouring bits, in all 8 bytes of a word at once
+    for shift, mask in ((4, 0x0F0F0F0F0F0F0F0F), (2, 0x3333333333333333), (1, 0x5555555555555555)):
+        shift, mask = np.uint64(shift), np.uint64(mask)
+        np.right_shift(x, shift, out=t)
+        t &= mask
+        x &= mask
+        x <<= shift
+        x |= t
+    return out[:packed.size].reshape(packed.shape)
+
+def bit_streams(pixels, channels, planes=PLANES, orders=ORDERS):
+    """
+    Yields (label, stream) for every combination, e.g. ("rgb,b0,xy,msb", uint8 array).
+    'pixels' is (height, width, channels); 16-bit samples contribute their low byte.
+    """
+    if pixels.dtype != np.uint8:
+        pixels = (pixels & 0xff).astype(np.uint8)
+    for order in orders:
+        grid = np.ascontiguousarray(pixels if order == "xy" else pixels.transpose(1, 0, 2))
+        for name, index in channel_sets(channels):
+            if len(index) == 1:
+                samples = grid[..., index[0]].ravel()
+            elif index[0] == 0:
+                samples = grid.reshape(-1)      # All channels in storage order: no copy
+            else:
+                # One strided copy per channel beats a gather over the reversed view
+                samples = np.empty_like(grid)
+                for target, source in enumerate(index):
+                    samples[..., target] = grid[..., source]
+                samples = samples.reshape(-1)
+            lsb = bit_planes(samples)
+            msb = reverse_bits(lsb)
+            for plane in planes:
+                yield f"{name},b{plane},{order},msb", msb[plane]
+                yield f"{name},b{plane},{order},lsb", lsb[plane]
+
+class StegoScanner:
+    def __init__(self, extractor, planes=PLANES, orders=ORDERS):
+        self.extractor = extractor
+        self.planes = tuple(planes)
+        self.orders = tuple(orders)
+        self.prefixes = extractor.literal_prefixes()
+
+    def scan(self, image):
+        """
+        Scans every bit stream of a decoded image (see png_decoder.PngImage).
+        Returns (findings, streams): findings are (label, offset, kind, value) with
+        kind 'flag' (value: the flag), 'file' (value: MIME type) or 'text' (value: preview).
+        Each flag is reported once, for the first stream it shows up in.
+        """
+        findings = []
+        seen = set()
+        streams = 0
+        for label, stream in bit_streams(image.pixels, image.channels, self.planes, self.orders):
+            streams += 1
+            for offset, flag in self._flags(stream):
+                if flag not in seen:
+                    seen.add(flag)
+                    findings.append((label, offset, 'flag', flag))
+            head = stream[:4096].tobytes()
+            mime = identify_header(head)
+            if mime in FILE_TYPES and (mime != "application/gzip" or head[2:3] == b"\x08"):
+                findings.append((label, 0, 'file', mime))
+            text = _leading_text(head)
+            if text:
+                findings.append((label, 0, 'text', text))
+        return findings, streams
+
+    def _flags(self, stream):
+        """(offset, flag) of every flag in one stream."""
+        if self.prefixes is None:
+            # A format without a literal prefix: no prefilter, regex over the whole stream
+            yield from self.extractor.iter_matches(stream.tobytes())
+            return
+        braces = np.flatnonzero(stream == 0x7b)
+        if not braces.size:
+            return
+        hits = np.zeros(braces.size, dtype=bool)
+        for prefix in self.prefixes:
+            start = braces - len(prefix)
+            ok = start >= 0
+            for i, char in enumerate(prefix):
+                byte = stream[np.maximum(start + i, 0)]
+                ok &= ((byte | 0x20) if chr(char).isalpha() else byte) == char
+            hits |= ok
+        for brace in braces[hits]:
+            begin = max(0, int(brace) - max(map(len, self.prefixes)))
+            window = stream[begin:int(brace) + FLAG_WINDOW].tobytes()
+            for offset, flag in self.extractor.iter_matches(window):
+                yield begin + offset, flag
+
+def _leading_text(head):
+    """Printable ASCII at the start of a stream (a hidden message), or None."""
+    end = 0
+    while end < min(len(head), 256) and (32 <= head[end] < 127 or head[end] in (9, 10, 13)):
+        end += 1
+    text = head[:end].decode('ascii')
+    # Flat image areas give repeated bytes like 'UUUU'; require some variety
+    if end >= TEXT_MIN and len(set(text)) >= 4:
+        return text
+    return None
@@ -0,0 +1,257 @@
+"""
+Utility: Strings Scanner
+Role: Streaming equivalent of the Linux 'strings' command, shared by the engines.
+scan_strings() also finds UTF-16LE/BE (and optionally UTF-8) strings in one NumPy
+mask pass per chunk instead of one regex pass per encoding.
+"""
+import re
+import mmap
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Encodings scanned by default; "utf-8" is opt-in since it mostly duplicates ASCII hits
+ENCODINGS = ("ascii", "utf-16le", "utf-16be")
+
+# Bytes per character, to map a character index inside a string back to a file offset
+CHAR_WIDTH = {"ascii": 1, "utf-8": 1, "utf-16le": 2, "utf-16be": 2}
+
+# Chunk size for scan_strings(); bounds the temporary mask arrays (a longer string widens its chunk)
+SCAN_CHUNK_SIZE = 4 * 1024 * 1024
+
+_SWAPPED = {"utf-16le": "utf-16be", "utf-16be": "utf-16le"}
+
+# Integer codes used while merging the per-encoding run arrays
+_ASCII, _UTF16LE, _UTF16BE, _UTF8 = range(4)
+_ENCODING_NAMES = ("ascii", "utf-16le", "utf-16be", "utf-8")
+
+def iter_strings(source, min_length=4, chunk_size=SCAN_CHUNK_SIZE):
+    """
+    Yields (offset, bytes) for every run of 'min_length'+ printable ASCII characters,
+    like the classic 'strings'. 'source' is a file path or a bytes-like object.
+    """
+    for offset, value, _ in scan_strings(source, min_length, ("ascii",), chunk_size):
+        yield offset, value
+
+def byte_offset(offset, encoding, index):
+    """File offset of character 'index' of a string found at 'offset' (UTF-8: byte index)."""
+    return offset + CHAR_WIDTH[encoding] * index
+
+def scan_strings(source, min_length=4, encodings=ENCODINGS, chunk_size=SCAN_CHUNK_SIZE):
+    """
+    Yields (offset, bytes, encoding) for every string of 'min_length'+ printable
+    characters, in offset order. UTF-16 strings are returned as their ASCII
+    projection (one byte per character); UTF-8 strings as their raw bytes.
+    'source' is a file path or a bytes-like object (bytes, memoryview, mmap).
+    """
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            try:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty file
+                return
+        try:
+            yield from scan_strings(data, min_length, encodings, chunk_size)
+        finally:
+            data.close()
+        return
+
+    if not NUMPY_AVAILABLE:
+        yield from _scan_regex(source, min_length, encodings)
+        return
+
+    arr = np.frombuffer(source, dtype=np.uint8)
+    # Slicing bytes/mmap directly is cheaper than going through NumPy for every string
+    buf = source if isinstance(source, (bytes, mmap.mmap)) else arr
+    total = arr.size
+    start = 0
+    size = chunk_size
+    emitted = [0] * len(_ENCODING_NAMES)  # End of the last run yielded per encoding; overlapping runs are its tails
+    recent = set()  # (offset, code) of UTF-16 runs yielded from the previous chunk
+    while start < total:
+        end = min(start + size, total)
+        starts, ends, codes, tail = _chunk_runs(arr[start:end], min_length, encodings)
+        if end < total and tail == 0:
+            # One run is still open across the whole chunk: widen the chunk instead of
+            # cutting the run in two (doubling keeps the rescans linear overall)
+            size *= 2
+            continue
+        size = chunk_size
+
+        # Runs still open at the chunk edge may continue: rescan from the earliest one
+        resume = start + tail if end < total else end
+        keep = starts < resume - start
+        starts, ends, codes = starts[keep] + start, ends[keep] + start, codes[keep]
+
+        current = set()
+        for s, e, code in zip(starts.tolist(), ends.tolist(), codes.tolist()):
+            if s < emitted[code]:
+                continue
+            if code in (_UTF16LE, _UTF16BE):
+                # Shifted reading of a UTF-16 string already yielded from the previous chunk
+                # (pairs within one chunk are resolved by _drop_shifted)
+                if (s - 1, _UTF16LE + _UTF16BE - code) in recent:
+                    continue
+                current.add((s, code))
+                value = bytes(buf[s + (code == _UTF16BE):e:2])
+            else:
+                value = bytes(buf[s:e])
+            emitted[code] = e
+            yield s, value, _ENCODING_NAMES[code]
+        recent = current
+        start = resume
+
+def _runs(mask, min_length):
+    """(start, end) index arrays of the True runs in 'mask' that are at least 'min_length' long."""
+    edges = np.diff(np.concatenate(([0], mask.view(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    keep = ends - starts >= min_length
+    return starts[keep], ends[keep]
+
+def _open_tail(mask):
+    """Index where the run of True values reaching the end of 'mask' starts (len(mask) if none)."""
+    if not mask.size or not mask[-1]:
+        return mask.size
+    closed = np.flatnonzero(~mask)
+    return int(closed[-1]) + 1 if closed.size else 0
+
+def _chunk_runs(chunk, min_length, encodings):
+    """
+    All runs in one chunk as (starts, ends, codes) arrays sorted by offset, chunk-relative,
+    plus the offset where the earliest run still open at the chunk edge begins. The last
+    byte always counts as open: it may start a UTF-16 character split by the boundary.
+    """
+    printable = (chunk >= 0x20) & (chunk <= 0x7E)
+    parts = []
+    tail = chunk.size - 1
+
+    if "ascii" in encodings:
+        parts.append(_runs(printable, min_length) + (_ASCII,))
+        tail = min(tail, _open_tail(printable))
+
+    wide = {}
+    if "utf-16le" in encodings or "utf-16be" in encodings:
+        zero = chunk == 0
+        if "utf-16le" in encodings:
+            wide[_UTF16LE] = printable[:-1] & zero[1:]
+        if "utf-16be" in encodings:
+            wide[_UTF16BE] = zero[:-1] & printable[1:]
+    found = {}
+    for code, mask in wide.items():
+        # Characters are 2-byte aligned relative to the string start: scan each parity
+        starts, ends = [], []
+        for parity in (0, 1):
+            sub = mask[parity::2]
+            s, e = _runs(sub, min_length)
+            starts.append(parity + 2 * s)
+            ends.append(parity + 2 * e)
+            tail = min(tail, parity + 2 * _open_tail(sub))
+        found[code] = (np.concatenate(starts), np.concatenate(ends))
+    if len(found) == 2:
+        found = _drop_shifted(*found[_UTF16LE], *found[_UTF16BE])
+    parts += [(s, e, code) for code, (s, e) in found.items()]
+
+    if "utf-8" in encodings:
+        text, lead = _utf8_mask(chunk, printable)
+        parts.append(_utf8_runs(chunk, text, lead, min_length) + (_UTF8,))
+        # A multi-byte character cut by the boundary is not marked yet: treat it as open
+        edge = text.copy()
+        edge[-3:] |= chunk[-3:] >= 0x80
+        tail = min(tail, _open_tail(edge))
+
+    if not parts:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty, tail
+    starts = np.concatenate([s for s, _, _ in parts])
+    ends = np.concatenate([e for _, e, _ in parts])
+    codes = np.concatenate([np.full(len(s), code, dtype=np.int64) for s, _, code in parts])
+    order = np.lexsort((codes, starts))
+    return starts[order], ends[order], codes[order], tail
+
+def _drop_shifted(le_starts, le_ends, be_starts, be_ends):
+    """
+    "\0A\0B\0C\0" reads as UTF-16LE "ABC" and, one byte earlier or later, as UTF-16BE.
+    Of each such pair keep the longer reading, or the little-endian one on a tie.
+    """
+    le_keep = np.ones(le_starts.size, dtype=bool)
+    be_keep = np.ones(be_starts.size, dtype=bool)
+    order = np.argsort(be_starts)
+    sorted_be = be_starts[order]
+    for shift in (-1, 1):
+        pos = np.minimum(np.searchsorted(sorted_be, le_starts + shift), max(sorted_be.size - 1, 0))
+        hit = np.flatnonzero(sorted_be[pos] == le_starts + shift) if sorted_be.size else pos[:0]
+        le_idx, be_idx = hit, order[pos[hit]]
+        be_longer = be_ends[be_idx] - be_starts[be_idx] > le_ends[le_idx] - le_starts[le_idx]
+        le_keep[le_idx[be_longer]] = False
+        be_keep[be_idx[~be_longer]] = False
+    return {_UTF16LE: (le_starts[le_keep], le_ends[le_keep]),
+            _UTF16BE: (be_starts[be_keep], be_ends[be_keep])}
+
+def _utf8_mask(chunk, printable):
+    """
+    Marks printable ASCII plus every byte of a well-formed multi-byte UTF-8 sequence,
+    so any run of marked bytes decodes cleanly. Also returns the lead-byte mask.
+    """
+    cont = (chunk & 0xC0) == 0x80
+    nxt = np.concatenate((chunk[1:], np.zeros(1, dtype=np.uint8)))
+    after = [np.concatenate((cont[k:], np.zeros(k, dtype=bool))) for k in (1, 2, 3)]
+    ok2 = (chunk >= 0xC2) & (chunk <= 0xDF) & after[0]
+    # Second-byte ranges exclude overlong forms, UTF-16 surrogates and code points past U+10FFFF
+    ok3 = (((chunk & 0xF0) == 0xE0) & after[0] & after[1]
+           & ~((chunk == 0xE0) & (nxt < 0xA0)) & ~((chunk == 0xED) & (nxt >= 0xA0)))
+    ok4 = ((chunk >= 0xF0) & (chunk <= 0xF4) & after[0] & after[1] & after[2]
+           & ~((chunk == 0xF0) & (nxt < 0x90)) & ~((chunk == 0xF4) & (nxt >= 0x90)))
+    lead = ok2 | ok3 | ok4
+
+    text = printable | lead
+    text[1:] |= lead[:-1]
+    text[2:] |= (ok3 | ok4)[:-2]
+    text[3:] |= ok4[:-3]
+    return text, lead
+
+def _utf8_runs(chunk, text, lead, min_length):
+    """Runs of valid UTF-8 with at least one multi-byte character; pure ASCII runs are "ascii"."""
+    starts, ends = _runs(text, 1)
+    lead_count = np.concatenate(([0], np.cumsum(lead)))
+    char_count = np.concatenate(([0], np.cumsum(text & ((chunk & 0xC0) != 0x80))))
+    keep = ((lead_count[ends] - lead_count[starts] > 0)
+            & (char_count[ends] - char_count[starts] >= min_length))
+    return starts[keep], ends[keep]
+
+def _scan_regex(data, min_length, encodings):
+    """Fallback without NumPy: one regex pass per encoding, merged by offset."""
+    patterns = {
+        "ascii": rb"[ -~]{%d,}" % min_length,
+        "utf-16le": rb"(?:[ -~]\x00){%d,}" % min_length,
+        "utf-16be": rb"(?:\x00[ -~]){%d,}" % min_length,
+    }
+    found = []
+    for encoding in encodings:
+        if encoding not in patterns:
+            continue
+        for match in re.finditer(patterns[encoding], data):
+            value = match.group()
+            if encoding == "utf-16le":
+                value = value[::2]
+            elif encoding == "utf-16be":
+                value = value[1::2]
+            found.append((match.start(), value, encoding))
+    # Same rule as the NumPy path: of two UTF-16 readings one byte apart, keep the
+    # longer one, or the little-endian one on a tie
+    wide = {(offset, encoding): len(value) for offset, value, encoding in found if encoding != "ascii"}
+
+    def shadowed(offset, value, encoding):
+        for shift in (-1, 1):
+            other = wide.get((offset + shift, _SWAPPED[encoding]))
+            if other is not None and (other > len(value)
+                                      or (other == len(value) and encoding == "utf-16be")):
+                return True
+        return False
+
+    found = [item for item in found if item[2] == "ascii" or not shadowed(*item)]
+    found.sort(key=lambda item: item[0])
+    yield from found
@@ -0,0 +1,173 @@
+"""
+Utility: XOR cracking.
+Single-byte and repeating-key XOR solved with NumPy. A key column is scored for all 256
+key bytes at once: its byte histogram times a (key, byte) matrix of per-byte plaintext
+weights, so a key never has to be applied to the data to be rated. Key lengths come
+from the normalized Hamming distance between the data and itself shifted by each
+candidate length, and flag prefixes work as known-plaintext cribs.
+"""
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+MAX_KEY_LENGTH = 40
+KEY_LENGTHS = 3             # Best-scoring lengths solved besides length 1
+SHORT_INPUT = 256           # Below this many bytes every key length is tried
+MIN_COLUMN = 3              # Ciphertext bytes per key byte; fewer and any plaintext fits
+MIN_PRINTABLE = 0.95        # Share of printable bytes for a plaintext to be worth showing
+MIN_GAIN = 1.0              # Score per byte a key must add over the untouched data
+
+# Relative frequency (%) of English letters, case-insensitive
+LETTERS = {
+    'a': 8.2, 'b': 1.5, 'c': 2.8, 'd': 4.3, 'e': 12.7, 'f': 2.2, 'g': 2.0, 'h': 6.1,
+    'i': 7.0, 'j': 0.15, 'k': 0.77, 'l': 4.0, 'm': 2.4, 'n': 6.7, 'o': 7.5, 'p': 1.9,
+    'q': 0.095, 'r': 6.0, 's': 6.3, 't': 9.1, 'u': 2.8, 'v': 0.98, 'w': 2.4, 'x': 0.15,
+    'y': 2.0, 'z': 0.074,
+}
+
+class XorResult:
+    def __init__(self, key, plaintext, score):
+        self.key = key              # bytes
+        self.plaintext = plaintext  # bytes
+        self.score = score          # Mean per-byte weight, higher is more English-like
+
+    @property
+    def printable(self):
+        """Share of printable ASCII (plus whitespace) in the plaintext."""
+        if not self.plaintext:
+            return 0.0
+        arr = np.frombuffer(self.plaintext, dtype=np.uint8)
+        return float(((arr >= 32) & (arr < 127) | np.isin(arr, (9, 10, 13))).mean())
+
+_WEIGHTS = None
+
+def weights():
+    """
+    (256, 256) matrix: row k holds the weight of every ciphertext byte c decrypted
+    with key k, i.e. W[k, c] = w[c ^ k], where w is the log-frequency of plaintext bytes.
+    """
+    global _WEIGHTS
+    if _WEIGHTS is None:
+        w = np.full(256, -12.0)                 # Control and high bytes: very unlikely
+        w[32:127] = np.log(0.05)                # Other printable ASCII: rare but fine
+        w[[9, 10, 13]] = np.log(1.0)
+        for char in "0123456789":
+            w[ord(char)] = np.log(0.5)
+        for char in ".,'\"-_{}!?:;()":
+            w[ord(char)] = np.log(0.4)
+        w[ord(' ')] = np.log(15.0)
+        for char, freq in LETTERS.items():
+            w[ord(char)] = np.log(freq)
+            w[ord(char.upper())] = np.log(freq / 4)
+        keys = np.arange(256)
+        _WEIGHTS = w[keys[:, None] ^ keys[None, :]]
+    return _WEIGHTS
+
+def score(data):
+    """Mean weight of the bytes as they are (key 0), comparable to XorResult.score."""
+    arr = np.frombuffer(data, dtype=np.uint8)
+    return float(weights()[0][arr].mean()) if arr.size else 0.0
+
+def column_scores(data, length):
+    """(length, 256) summed weights of every key byte for every key position."""
+    arr = np.frombuffer(data, dtype=np.uint8)
+    position = np.arange(arr.size) % length
+    # One bincount histograms every column: column i owns bins [256 i, 256 i + 256)
+    hist = np.bincount(position * 256 + arr, minlength=length * 256).reshape(length, 256)
+    return hist @ weights().T
+
+def key_lengths(data, max_length=MAX_KEY_LENGTH, count=KEY_LENGTHS):
+    """
+    Most likely repeating-key lengths (> 1), best first, by the normalized Hamming
+    distance between the data and itself shifted by each length. At the key length
+    (or a multiple) both sides were XORed with the same key bytes, so positions only
+    differ where the plaintext does. The distance is counted in bytes rather than bits:
+    printable keys and plaintext share their high bits, which drowns the bit count.
+    Data too short for the statistic to mean anything gets every length.
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    lengths = np.arange(2, min(max_length, arr.size // MIN_COLUMN) + 1)
+    if arr.size < SHORT_INPUT:
+        return [int(n) for n in lengths]
+    distances = np.array([np.count_nonzero(arr[:-n] != arr[n:]) / (arr.size - n) for n in lengths])
+    best = []
+    for n in lengths[np.argsort(distances, kind='stable')]:
+        # A multiple of a chosen length adds nothing: the key found there repeats itself
+        if not any(n % m == 0 for m in best):
+            best.append(int(n))
+        if len(best) == count:
+            break
+    return best
+
+def solve(data, length):
+    """Best key of the given length by per-column frequency analysis."""
+    scores = column_scores(data, length)
+    key = scores.argmax(axis=1).astype(np.uint8)
+    return _result(data, key, scores)
+
+def crib_keys(data, length, crib, scores=None, limit=4):
+    """
+    Keys of the given length implied by 'crib' (e.g. b"flag{") sitting at any offset.
+    Key positions the crib does not cover keep their frequency-analysis byte; a crib
+    longer than the key must agree with itself. Returns up to 'limit' XorResults, best first.
+    An offset is rated by what its crib bytes cost against the frequency-analysis key,
+    so only the few keys returned are ever built (not one per offset).
+    """
+    arr = np.frombuffer(data, dtype=np.uint8)
+    crib = np.frombuffer(crib, dtype=np.uint8)
+    if arr.size < crib.size:
+        return []
+    scores = column_scores(data, length) if scores is None else scores
+    windows = np.lib.stride_tricks.sliding_window_view(arr, crib.size)
+    span = min(crib.size, length)
+    if crib.size > length:
+        implied = windows ^ crib                            # Key bytes for every crib offset
+        consistent = (implied[:, length:] == implied[:, :-length]).all(axis=1)
+        offsets = np.flatnonzero(consistent)
+        implied = implied[consistent, :span]
+    else:
+        offsets = np.arange(windows.shape[0])
+        implied = windows ^ crib
+    if not offsets.size:
+        return []
+
+    best = scores.argmax(axis=1).astype(np.uint8)
+    best_scores = scores[np.arange(length), best]
+    columns = (offsets[:, None] + np.arange(span)) % length
+    # Total of a crib key = total of the frequency key minus what the crib columns lose
+    loss = (best_scores[columns] - scores[columns, implied]).sum(axis=1)
+    # Only the cheapest offsets can win: partition them out instead of sorting every offset
+    top = min(loss.size, limit * 16)
+    order = np.argpartition(loss, top - 1)[:top] if top < loss.size else np.arange(loss.size)
+    order = order[np.argsort(loss[order], kind='stable')]
+    results, seen = [], set()
+    for i in order:
+        key = best.copy()
+        key[columns[i]] = implied[i]
+        if key.tobytes() not in seen:
+            seen.add(key.tobytes())
+            results.append(_result(data, key, scores))
+            if len(results) == limit:
+                break
+    return results
+
+def apply(data, key):
+    """XORs data with a repeating key; both bytes-like."""
+    arr = np.frombuffer(data, dtype=np.uint8)
+    key = np.frombuffer(bytes(key), dtype=np.uint8)
+    if not arr.size or not key.size:
+        return bytes(arr)
+    return (arr ^ np.resize(key, arr.size)).tobytes()
+
+def _result(data, key, scores):
+    score = float(scores[np.arange(key.size), key].sum()) / max(1, len(data))
+    return XorResult(_shortest_period(key.tobytes()), apply(data, key), score)
+
+def _shortest_period(key):
+    """b"abab" -> b"ab": a key solved at a multiple of its length repeats itself."""
+    for n in range(1, len(key)):
+        if len(key) % n == 0 and key == key[:n] * (len(key) // n):
+            return key[:n]
+    return key
@@ -1,9 +1,220 @@
 """
 Base class for safe external tool execution.
+Commands run as asyncio subprocesses in their own process group, under a concurrency
+cap shared by every runner in the process, a per-command timeout and optional CPU/memory
+rlimits.
+Output is streamed line by line so callers can react before the tool exits.
 """
-import subprocess
+import os
+import sys
+import time
+import signal
+import shutil
+import asyncio
+import weakref
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Tools running in this process, so a cancelled engine can stop them (see kill_all)
+_RUNNING = set()
+
+# Tools allowed to run at once in this process, whichever runner started them
+MAX_CONCURRENCY = 4
+# Event loop -> the semaphore enforcing MAX_CONCURRENCY there (asyncio primitives
+# cannot be shared across loops)
+_SEMAPHORES = weakref.WeakKeyDictionary()
+_SEMAPHORES_LOCK = threading.Lock()
+
+class ToolResult:
+    def __init__(self, cmd):
+        self.cmd = cmd
+        self.returncode = None
+        self.stdout = []        # Decoded lines, newline stripped
+        self.stderr = ""
+        self.duration = 0.0
+        self.timed_out = False
+        self.error = None       # Set when the tool could not be started
+
+    @property
+    def ok(self):
+        return self.error is None and not self.timed_out and self.returncode == 0
+
+    @property
+    def output(self):
+        return "\n".join(self.stdout)
+
+    def __repr__(self):
+        return (f"ToolResult(cmd={self.cmd!r}, returncode={self.returncode}, "
+                f"lines={len(self.stdout)}, timed_out={self.timed_out}, error={self.error!r})")
 
 class ToolRunner:
-    def run_command(self, cmd):
-        # TODO: Implement safe subprocess execution with timeout
-        pass
+    # Pipe buffer per line; longer lines (minified JS, binwalk dumps) are read in pieces
+    LINE_LIMIT = 1024 * 1024
+
+    def __init__(self, timeout=30, cpu_limit=None, memory_limit=None):
+        """
+        timeout:         default wall-clock limit per command, in seconds.
+        cpu_limit:       RLIMIT_CPU for each child, in seconds of CPU time.
+        memory_limit:    RLIMIT_AS for each child, in bytes.
+        How many commands run at once is process-wide, see set_max_concurrency().
+        """
+        self.timeout = timeout
+        self.cpu_limit = cpu_limit
+        self.memory_limit = memory_limit
+
+    @staticmethod
+    def available(tool):
+        """True if the executable is on PATH."""
+        return shutil.which(tool) is not None
+
+    def run_command(self, cmd, timeout=None):
+        """Synchronous convenience wrapper around run()."""
+        return asyncio.run(self.run(cmd, timeout=timeout))
+
+    async def run(self, cmd, timeout=None, on_line=None):
+        """
+        Runs one command to completion and returns a ToolResult.
+        'on_line' is called with each stdout line as soon as it is produced.
+        """
+        result = ToolResult(cmd)
+        async for line in self.stream(cmd, timeout=timeout, result=result):
+            result.stdout.append(line)
+            if on_line:
+                on_line(line)
+        return result
+
+    async def run_many(self, cmds, timeout=None, on_line=None):
+        """
+        Fans out over several commands (still bounded by the process-wide cap).
+        Returns the ToolResults in the same order as 'cmds'.
+        'on_line' receives (cmd, line) pairs.
+        """
+        async def one(cmd):
+            callback = (lambda line: on_line(cmd, line)) if on_line else None
+            return await self.run(cmd, timeout=timeout, on_line=callback)
+
+        return await asyncio.gather(*(one(cmd) for cmd in cmds))
+
+    async def stream(self, cmd, timeout=None, result=None):
+        """
+        Async generator yielding stdout lines as the tool prints them.
+        Fills in 'result' (if given) with the exit status, stderr and timing.
+        The whole process group is killed when the timeout expires.
+        """
+        result = result if result is not None else ToolResult(cmd)
+        timeout = self.timeout if timeout is None else timeout
+
+        async with self._semaphore():
+            start = time.monotonic()
+            try:
+                proc = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    start_new_session=True,
+                    limit=self.LINE_LIMIT,
+                    preexec_fn=self._limits if resource else None,
+                )
+            except (OSError, ValueError) as e:
+                result.error = str(e)
+                return
+
+            _RUNNING.add(proc)
+            # Drain stderr in the background so a chatty tool cannot block on a full pipe
+            stderr_task = asyncio.ensure_future(proc.stderr.read())
+            deadline = start + timeout if timeout else None
+
+            try:
+                while True:
+                    remaining = deadline - time.monotonic() if deadline else None
+                    if remaining is not None and remaining <= 0:
+                        raise asyncio.TimeoutError
+                    line = await asyncio.wait_for(self._readline(proc.stdout), remaining)
+                    if not line:
+                        break
+                    yield line.decode('utf-8', errors='ignore').rstrip('\r\n')
+
+                remaining = deadline - time.monotonic() if deadline else None
+                await asyncio.wait_for(proc.wait(), max(remaining, 0) if deadline else None)
+            except asyncio.TimeoutError:
+                result.timed_out = True
+                self._kill(proc)
+                await proc.wait()
+            finally:
+                # Also covers the consumer abandoning the generator early
+                if proc.returncode is None:
+                    self._kill(proc)
+                    await proc.wait()
+                _RUNNING.discard(proc)
+                result.returncode = proc.returncode
+                result.stderr = (await stderr_task).decode('utf-8', errors='ignore')
+                result.duration = time.monotonic() - start
+
+    @staticmethod
+    async def _readline(reader):
+        """
+        One line of any length. StreamReader.readline() raises (and drops the data)
+        past the reader's limit, so the line is taken with readuntil() instead and
+        an oversized one is read in limit-sized pieces.
+        """
+        pieces = []
+        while True:
+            try:
+                pieces.append(await reader.readuntil(b"\n"))
+                break
+            except asyncio.IncompleteReadError as e:
+                pieces.append(e.partial)        # Last line without a newline, or EOF
+                break
+            except asyncio.LimitOverrunError as e:
+                pieces.append(await reader.read(max(e.consumed, 1)))
+        return b"".join(pieces)
+
+    @staticmethod
+    def set_max_concurrency(limit):
+        """Sets how many tools may run at once in this process; call it before any runs."""
+        global MAX_CONCURRENCY
+        with _SEMAPHORES_LOCK:
+            MAX_CONCURRENCY = limit
+            _SEMAPHORES.clear()
+
+    @staticmethod
+    def _semaphore():
+        """The cap shared by every runner on the running event loop."""
+        loop = asyncio.get_running_loop()
+        with _SEMAPHORES_LOCK:
+            if loop not in _SEMAPHORES:
+                _SEMAPHORES[loop] = asyncio.Semaphore(MAX_CONCURRENCY)
+            return _SEMAPHORES[loop]
+
+    def _limits(self):
+        """Runs in the child before exec: applies the CPU and memory rlimits."""
+        if self.cpu_limit:
+            resource.setrlimit(resource.RLIMIT_CPU, (self.cpu_limit, self.cpu_limit))
+        if self.memory_limit:
+            resource.setrlimit(resource.RLIMIT_AS, (self.memory_limit, self.memory_limit))
+
+    @staticmethod
+    def kill_all():
+        """
+        Kills every tool this process is running, with everything they spawned.
+        For a process about to die: tools sit in their own sessions, so they would
+        outlive it, and nobody would enforce their timeouts any more.
+        """
+        for proc in list(_RUNNING):
+            ToolRunner._kill(proc)
+
+    @staticmethod
+    def _kill(proc):
+        """Kills the tool and everything it spawned."""
+        try:
+            if sys.platform != "win32":
+                os.killpg(proc.pid, signal.SIGKILL)
+            else:
+                proc.kill()
+        except ProcessLookupError:
+            pass
@@ -0,0 +1,71 @@
+import bz2
+import gc
+import gzip
+import io
+import lzma
+import tarfile
+import warnings
+import zipfile
+from src.utils.archive_walker import ArchiveWalker, CHUNK_SIZE
+from src.utils.flag_extractor import FlagExtractor
+
+def make_zip(members):
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, data in members.items():
+            z.writestr(name, data)
+    return buf.getvalue()
+
+def make_tar(members):
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w") as t:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            t.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+def test_nested_archives(tmp_path):
+    inner = make_tar({"notes/a.txt": b"x" * 100 + b"flag{deep_tar}",
+                      "b.xz": lzma.compress(b"CTF{in_xz}")})
+    middle = make_zip({"inner.tar.gz": gzip.compress(inner),
+                       "c.bz2": bz2.compress(b"Cyber{in_bz2}")})
+    outer = make_zip({"middle.zip": middle,
+                      "split.txt": b"A" * (CHUNK_SIZE - 5) + b"flag{across_chunks}"})
+    path = tmp_path / "outer.zip"
+    path.write_bytes(outer)
+
+    findings, stats = ArchiveWalker(FlagExtractor(config={})).scan(str(path), "outer.zip")
+    by_flag = {flag: (member, offset) for member, offset, flag in findings}
+
+    assert by_flag["flag{deep_tar}"] == ("outer.zip/middle.zip/inner.tar.gz/inner.tar/notes/a.txt", 100)
+    assert by_flag["CTF{in_xz}"][0].endswith("inner.tar/b.xz/b")
+    assert by_flag["Cyber{in_bz2}"][0] == "outer.zip/middle.zip/c.bz2/c"
+    assert by_flag["flag{across_chunks}"] == ("outer.zip/split.txt", CHUNK_SIZE - 5)
+    assert not stats["limited"] and not stats["errors"]
+
+def test_limits():
+    bomb = make_zip({"bomb.bin": b"\x00" * (8 * 1024 * 1024)})
+    _, stats = ArchiveWalker(FlagExtractor(config={}), max_total=1024 * 1024).scan(bomb)
+    assert stats["limited"]
+
+    nested = make_zip({"l1.zip": make_zip({"l2.zip": make_zip({"f.txt": b"flag{too_deep}"})})})
+    assert ArchiveWalker(FlagExtractor(config={}), max_depth=1).scan(nested)[0] == []
+    assert ArchiveWalker(FlagExtractor(config={}), max_depth=2).scan(nested)[0][0][2] == "flag{too_deep}"
+
+def test_closes_every_archive_it_opens(tmp_path):
+    nested = make_zip({"inner.tar": make_tar({"a.txt": b"flag{closed}"})})
+    paths = []
+    for name, data in (("a.zip", nested), ("b.tar", make_tar({"b.zip": nested})),
+                       ("c.gz", gzip.compress(nested))):
+        paths.append(tmp_path / name)
+        paths[-1].write_bytes(data)
+    walker = ArchiveWalker(FlagExtractor(config={}))
+    with warnings.catch_warnings(record=True) as caught:
+        # A file left to the garbage collector warns when it is finally closed
+        warnings.simplefilter("always", ResourceWarning)
+        for path in paths:
+            findings, _ = walker.scan(str(path), path.name)
+            assert [flag for _, _, flag in findings] == ["flag{closed}"]
+        gc.collect()
+    assert not [w for w in caught if issubclass(w.category, ResourceWarning)]
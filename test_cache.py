@@ -0,0 +1,66 @@
+import os
+import hashlib
+from src.core.artifact import Artifact
+from src.core.cache import AnalysisCache
+from src.core.orchestrator import Orchestrator
+
+def test_lru_eviction(tmp_path):
+    cache = AnalysisCache(str(tmp_path), max_bytes=1000)
+    keys = [AnalysisCache.key(str(i), "RevEngine", "1.0") for i in range(3)]
+
+    for i, key in enumerate(keys):
+        cache.put(key, {'output': "x" * 400})
+        # Keep mtimes strictly ordered regardless of filesystem resolution
+        os.utime(cache._path(key), (i, i))
+        if i == 1:
+            assert cache.get(keys[0]) is not None  # Refresh the oldest entry
+
+    assert cache.get(keys[0]) is not None
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) is not None
+
+def test_repeat_run_is_cached(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    target = tmp_path / "enc.txt"
+    target.write_text("Q1RGe2Jhc2U2NF9pc19lYXN5fQ==")
+
+    Orchestrator().run(str(target))
+    first = capsys.readouterr().out
+    Orchestrator().run(str(target))
+    second = capsys.readouterr().out
+
+    assert "Cached result" not in first
+    assert "Cached result" in second
+    assert "CTF{base64_is_easy}" in second
+
+def test_config_change_misses_the_cache(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setenv("CTF_COPILOT_CONFIG", str(tmp_path / "config.json"))
+    target = tmp_path / "enc.txt"
+    target.write_text("Q1RGe2Jhc2U2NF9pc19lYXN5fQ==")
+
+    Orchestrator().run(str(target))
+    (tmp_path / "config.json").write_text('{"flag_formats": ["picoCTF"]}')
+    Orchestrator().run(str(target))
+    assert "Cached result" not in capsys.readouterr().out
+    Orchestrator().run(str(target))
+    assert "Cached result" in capsys.readouterr().out
+
+def test_put_walks_the_cache_once(tmp_path, monkeypatch):
+    cache = AnalysisCache(str(tmp_path), max_bytes=1000)
+    walks = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: walks.append(1) or entries())
+    for i in range(5):
+        cache.put(AnalysisCache.key(str(i), "RevEngine", "1.0"), {'output': "x" * 100})
+    assert len(walks) == 1
+    cache.put(AnalysisCache.key("big", "RevEngine", "1.0"), {'output': "x" * 600})
+    assert len(walks) == 2 and sum(size for _, size, _ in entries()) <= 1000
+
+def test_artifact_reads_once(tmp_path):
+    path = tmp_path / "bin"
+    path.write_bytes(b"\x7fELF" + b"UPX!" * 4)
+    with Artifact(str(path)) as artifact:
+        assert artifact.size == 20
+        assert artifact.data.find(b"UPX!") == 4
+        assert artifact.sha256 == hashlib.sha256(path.read_bytes()).hexdigest()
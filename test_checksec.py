@@ -0,0 +1,83 @@
+import os
+import glob
+import shutil
+import struct
+import subprocess
+import pytest
+from src.utils.checksec import checksec, checksec_file
+
+GCC_VARIANTS = {
+    "full": ["-fstack-protector-all", "-pie", "-Wl,-z,relro,-z,now"],
+    "partial": ["-fstack-protector", "-no-pie", "-Wl,-z,relro,-z,lazy"],
+    "none": ["-fno-stack-protector", "-no-pie", "-Wl,-z,norelro,-z,execstack"],
+    "shared": ["-fno-stack-protector", "-shared", "-fPIC"],
+}
+
+def make_pe(dll_characteristics, cookie=0, is_64=True):
+    """Minimal PE image: MZ stub, COFF header, optional header and one section holding the load config."""
+    opt_size = 240 if is_64 else 224
+    e_lfanew = 0x40
+    section_table = e_lfanew + 24 + opt_size
+    raw_ptr = 0x200
+    data = bytearray(raw_ptr + 0x200)
+    data[:2] = b"MZ"
+    struct.pack_into("<I", data, 0x3C, e_lfanew)
+    data[e_lfanew:e_lfanew + 4] = b"PE\x00\x00"
+    struct.pack_into("<HHIIIHH", data, e_lfanew + 4, 0x8664 if is_64 else 0x14C, 1, 0, 0, 0, opt_size, 0x22)
+    opt = e_lfanew + 24
+    struct.pack_into("<H", data, opt, 0x20B if is_64 else 0x10B)
+    struct.pack_into("<H", data, opt + 70, dll_characteristics)
+    dirs = opt + (112 if is_64 else 96)
+    struct.pack_into("<I", data, dirs - 4, 16)
+    struct.pack_into("<II", data, dirs + 10 * 8, 0x1000, 0x100)  # Load config directory
+    struct.pack_into("<IIII", data, section_table + 8, 0x200, 0x1000, 0x200, raw_ptr)
+    struct.pack_into("<Q" if is_64 else "<I", data, raw_ptr + (0x58 if is_64 else 0x3C), cookie)
+    return bytes(data)
+
+@pytest.mark.skipif(not shutil.which("gcc"), reason="gcc not installed")
+def test_matches_pwntools(tmp_path):
+    os.environ.setdefault("PWNLIB_SILENT", "1")
+    pwn = pytest.importorskip("pwn")
+    source = tmp_path / "chall.c"
+    source.write_text("#include <stdio.h>\nint main(){char b[64]; fgets(b, 256, stdin); return 0;}\n")
+
+    binaries = []
+    for name, flags in GCC_VARIANTS.items():
+        out = tmp_path / name
+        if subprocess.run(["gcc", "-w", *flags, str(source), "-o", str(out)]).returncode == 0:
+            binaries.append(str(out))
+    binaries += [p for p in sorted(glob.glob("/bin/*")) if os.path.isfile(p)][:20]
+
+    checked = 0
+    for path in binaries:
+        with open(path, "rb") as f:
+            if f.read(4) != b"\x7fELF":
+                continue
+        ours = checksec_file(path)
+        theirs = pwn.ELF(path, checksec=False)
+        assert (ours.arch, ours.bits, ours.endian) == (theirs.arch, theirs.bits, theirs.endian), path
+        assert (ours.relro, ours.canary, ours.nx, ours.pie) == \
+            (theirs.relro, theirs.canary, theirs.nx, theirs.pie), path
+        checked += 1
+    assert checked >= 4
+
+    full = checksec_file(str(tmp_path / "full"))
+    none = checksec_file(str(tmp_path / "none"))
+    assert (full.relro, full.canary, full.nx, full.pie) == ("Full", True, True, True)
+    assert (none.relro, none.canary, none.pie) == (None, False, False)
+
+def test_pe():
+    hardened = checksec(make_pe(0x0100 | 0x0040 | 0x0020 | 0x4000, cookie=0x2B992DDFA232))
+    assert hardened.format == "pe" and hardened.arch_string == "amd64-64-little"
+    assert (hardened.canary, hardened.nx, hardened.pie, hardened.relro) == (True, True, True, None)
+    assert hardened.extra["cfg"] and hardened.extra["high_entropy_va"] and not hardened.extra["dll"]
+
+    legacy = checksec(make_pe(0x0400, is_64=False))
+    assert legacy.arch_string == "i386-32-little"
+    assert (legacy.canary, legacy.nx, legacy.pie) == (False, False, False)
+    assert not legacy.extra["seh"]
+
+def test_rejects_other_formats():
+    for data in (b"", b"\x89PNG\r\n\x1a\n", b"\x7fELF\x02\x01\x01" + b"\x00" * 9, b"\x7fELF", b"\x7fELF\x01"):
+        with pytest.raises(ValueError):
+            checksec(data)
@@ -1,3 +1,5 @@
+import os
+import tempfile
 from src.core.classifier import Classifier
 
 def test():
@@ -8,9 +10,86 @@ def test():
     print(f"B64: {c.identify('ZuwbhdMNQDddJEi4DI/w8A==')} (Expected: crypto)")
     
     print("\n--- Testing File Inputs ---")
-    # Create a dummy file to test
-    with open("test.txt", "w") as f: f.write("Hello World")
-    print(f"File: {c.identify('test.txt')} (Expected: crypto/misc)")
+    # Create a dummy file to test (in a scratch directory, not the cwd)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "test.txt")
+        with open(path, "w") as f: f.write("Hello World")
+        print(f"File: {c.identify(path)} (Expected: crypto/misc)")
+
+def test_signature_table(tmp_path, monkeypatch):
+    import gzip
+    import io
+    import tarfile
+    import zipfile
+    import src.core.classifier as classifier
+
+    samples = {
+        "elf": b"\x7fELF\x02\x01\x01" + b"\x00" * 9 + b"\x02\x00" + b"\x00" * 200,
+        "pe": b"MZ" + b"\x90" * 200,
+        "png": b"\x89PNG\r\n\x1a\n" + b"\x00" * 32,
+        "gif": b"GIF89a" + b"\x00" * 32,
+        "gz": gzip.compress(b"hello"),
+        "pcap": b"\xd4\xc3\xb2\xa1" + b"\x00" * 20,
+        "pcapng": b"\x0a\x0d\x0d\x0a" + b"\x00" * 20,
+        "pdf": b"%PDF-1.7\n",
+        "pyc": b"\xa7\x0d\r\n" + b"\x00" * 12,
+        "note": b"ZmxhZ3t0ZXh0fQ==\n",
+    }
+    zbuf = io.BytesIO()
+    with zipfile.ZipFile(zbuf, "w") as z:
+        z.writestr("a.txt", "hi")
+    samples["zip"] = zbuf.getvalue()
+    tbuf = io.BytesIO()
+    with tarfile.open(fileobj=tbuf, mode="w") as t:
+        info = tarfile.TarInfo("a.txt")
+        t.addfile(info, io.BytesIO(b""))
+    samples["tar"] = tbuf.getvalue()
+
+    expected = {"elf": "pwn", "pe": "pwn", "png": "forensics", "gif": "forensics",
+                "gz": "forensics", "pcap": "forensics", "pcapng": "forensics",
+                "pdf": "forensics", "pyc": "rev", "note": "crypto",
+                "zip": "forensics", "tar": "forensics"}
+
+    for name, data in samples.items():
+        (tmp_path / name).write_bytes(data)
+
+    # Results must not depend on libmagic being installed
+    for available in (True, False):
+        monkeypatch.setattr(classifier, "MAGIC_AVAILABLE", available and classifier.MAGIC_AVAILABLE)
+        c = Classifier()
+        for name, category in expected.items():
+            assert c.identify(str(tmp_path / name)) == category, name
+
+def test_rank_orders_alternatives(tmp_path):
+    c = Classifier()
+    note = tmp_path / "note.txt"
+    note.write_text("Challenge is live at http://chal.example.com:8080/ good luck")
+    ranked = c.rank(str(note))
+    assert ranked[0][0] == 'web'
+    assert abs(sum(score for _, score in ranked) - 1) < 1e-6
+    assert [score for _, score in ranked] == sorted((score for _, score in ranked), reverse=True)
+
+    elf = tmp_path / "chal"
+    elf.write_bytes(b"\x7fELF\x02\x01\x01" + b"\x00" * 64)
+    assert [category for category, _ in c.rank(str(elf))] == ['pwn', 'rev']
+    assert c.rank('example.com/login')[0][0] == 'web'
+    assert c.rank('ZmxhZ3t4fQ==') == [('crypto', 1.0)]
+
+
+def test_crlf_note_is_not_bytecode(tmp_path):
+    import importlib.util
+    from src.core.signatures import identify_header
+
+    c = Classifier()
+    note = tmp_path / "note.txt"
+    note.write_bytes(b"Hi\r\nthe key is in the attached cipher: ZmxhZ3t4fQ==\r\n")
+    assert identify_header(note.read_bytes()) is None
+    assert c.rank(str(note))[0][0] == 'crypto'
+
+    pyc = importlib.util.MAGIC_NUMBER + b"\x00" * 4 + b"\xe3" * 8
+    assert identify_header(pyc) == "application/x-bytecode.python"
+    assert identify_header(importlib.util.MAGIC_NUMBER + b"\x07\x00\x00\x00" + b"\xe3" * 8) is None
+
 
 if __name__ == "__main__":
-    test()
\ No newline at end of file
+    test()
@@ -0,0 +1,25 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+import corpus
+from src.core.classifier import Classifier
+from src.engines.crypto_engine import CryptoEngine
+
+def test_corpus_matches_manifest(tmp_path):
+    manifest = corpus.generate(str(tmp_path), seed=7, big_mb=1)
+    classifier = Classifier()
+
+    for entry in manifest:
+        path = str(tmp_path / entry["file"])
+        assert classifier.identify(path) == entry["category"], entry["file"]
+        if entry["category"] == "crypto":
+            content = open(path).read()
+            assert CryptoEngine().search(content)[1] == entry["flags"][0]
+
+    with open(tmp_path / "big.bin", "rb") as f:
+        data = f.read()
+    assert len(data) == 1024 * 1024
+    big = next(entry for entry in manifest if entry["file"] == "big.bin")
+    assert all(flag.encode() in data for flag in big["flags"])
@@ -0,0 +1,33 @@
+from src.utils import crawler
+from src.utils.flag_extractor import FlagExtractor
+
+def test_normalize():
+    assert crawler.normalize("HTTP://Example.COM:80/a/./b/../c?z=1&a=2#top") == "http://example.com/a/c?a=2&z=1"
+    assert crawler.normalize("https://example.com:8443") == "https://example.com:8443/"
+
+def test_frontier_keeps_same_origin_once_within_budget():
+    frontier = crawler.UrlFrontier("http://ctf.local/", max_pages=3)
+    assert frontier.admit("http://ctf.local/") == "http://ctf.local/"
+    assert frontier.admit("http://CTF.local:80/#again") is None
+    assert frontier.admit("https://ctf.local/") is None
+    assert frontier.admit("http://other.local/") is None
+    assert frontier.admit("http://ctf.local/logo.png") is None
+    assert frontier.admit("http://ctf.local/a") and frontier.admit("http://ctf.local/b")
+    assert frontier.admit("http://ctf.local/c") is None
+    assert frontier.skipped == 1
+
+def test_stream_scanner_finds_flags_across_chunks_once():
+    scanner = crawler.StreamScanner(FlagExtractor(patterns=[r"CTF\{.*?\}"]), overlap=16)
+    body = b"x" * 30 + b"CTF{split}" + b"y" * 40 + b"CTF{whole}"
+    found = []
+    for i in range(0, len(body), 7):
+        found.extend(scanner.feed(body[i:i + 7]))
+    assert found == [(30, "CTF{split}"), (80, "CTF{whole}")]
+
+def test_page_parser_collects_links_and_comments():
+    parser = crawler.PageParser()
+    for piece in ('<img srcset="a.png 1x, b.png 2x"><a hr', 'ef="/x">x</a><!-- hi', ' there --><form action="/login">'):
+        parser.feed(piece)
+    parser.close()
+    assert parser.links == ["a.png", "b.png", "/x", "/login"]
+    assert parser.comments == ["hi there"]
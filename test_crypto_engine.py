@@ -0,0 +1,72 @@
+import base64
+import codecs
+from src.core.output_manager import OutputManager
+from src.engines.crypto_engine import CryptoEngine
+from src.utils import xor_cracker
+
+FLAG = "flag{chained_encodings_ftw}"
+
+def test_chain_search():
+    encoded = base64.b64encode(codecs.encode(FLAG, 'rot13').encode().hex().encode()).decode()
+    chain, flag, _ = CryptoEngine().search(encoded)
+    assert flag == FLAG
+    assert chain == ["Base64", "Hex", "ROT13"]
+
+def test_new_decoders():
+    decimal = " ".join(str(b) for b in FLAG.encode())
+    encoded = base64.b32encode(base64.b85encode(decimal.encode())).decode()
+    assert CryptoEngine().search(encoded)[1] == FLAG
+
+    binary = " ".join(f"{b:08b}" for b in FLAG.encode())
+    assert CryptoEngine().search(binary)[1] == FLAG
+
+def test_budget_bounds_search():
+    _, flag, stats = CryptoEngine(max_nodes=5).search(base64.b64encode(b"A" * 200).decode())
+    assert flag is None
+    assert stats['nodes'] <= 5 + len(CryptoEngine().strategies)
+
+PROSE = (b"Call me Ishmael. Some years ago, never mind how long precisely, having little or no "
+         b"money in my purse, and nothing particular to interest me on shore, I thought I would "
+         b"sail about a little and see the watery part of the world. ") * 12
+
+def test_xor_key_lengths_and_repeating_key():
+    for key in (b"\x42", b"s3cr3t", b"supersecretkey", bytes(range(100, 123))):
+        ciphertext = xor_cracker.apply(PROSE + FLAG.encode(), key)
+        if len(key) > 1:
+            # The key length itself or a multiple of it
+            assert xor_cracker.key_lengths(ciphertext)[0] % len(key) == 0
+        result, flag = CryptoEngine().crack_xor(ciphertext)
+        assert result.key == key and flag == FLAG
+
+def test_xor_crib_recovers_short_ciphertext():
+    # Far too short for frequency analysis: only the known "flag{" prefix pins the key
+    ciphertext = xor_cracker.apply(b"note: " + FLAG.encode(), b"K3y!")
+    result, flag = CryptoEngine().crack_xor(ciphertext)
+    assert flag == FLAG and result.key == b"K3y!"
+
+    out = OutputManager(console=False)
+    out.begin(ciphertext.hex(), "CryptoEngine")
+    CryptoEngine(out=out).execute(ciphertext.hex())
+    assert [(f['flag'], f['key']) for f in out.end() if f['type'] == 'flag'] == [(FLAG, "4b337921")]
+
+def test_xor_honours_time_budget():
+    import os
+    import time
+    noise = os.urandom(CryptoEngine.MAX_XOR_BYTES)
+    assert CryptoEngine().crack_xor(noise, deadline=time.perf_counter()) == (None, None)
+    start = time.perf_counter()
+    CryptoEngine().crack_xor(noise, deadline=start + 0.5)
+    assert time.perf_counter() - start < 2.0
+
+def test_string_targets_skip_the_file_xor_pass():
+    from src.core.artifact import Artifact
+    ciphertext = xor_cracker.apply(b"note: " + FLAG.encode(), b"K3y!").hex()
+    engine = CryptoEngine(out=OutputManager(console=False))
+    attacked = []
+    crack_xor = engine.crack_xor
+    engine.crack_xor = lambda data, deadline=None: attacked.append(data) or crack_xor(data, deadline)
+    with Artifact(ciphertext) as artifact:
+        engine.out.begin(ciphertext, "CryptoEngine")
+        engine.execute(ciphertext, artifact)
+    assert FLAG in {f.get('flag') for f in engine.out.end()}
+    assert attacked == [bytes.fromhex(ciphertext)]
@@ -0,0 +1,39 @@
+import asyncio
+from src.utils import discovery
+from src.engines.web_engine import AdaptiveLimiter
+
+def test_iter_paths_streams_words_with_extensions(tmp_path):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("admin\n/panel\n\n# comment\nnotes.md\n")
+    paths = list(discovery.iter_paths([str(wordlist)], ["", ".php"], words=["admin", "flag.txt"]))
+    assert paths == ["admin", "admin.php", "flag.txt", "panel", "panel.php", "notes.md"]
+
+def test_soft_404_echoing_the_path_is_folded():
+    responses = discovery.ResponseFilter()
+    page = lambda path: f"<p>{path} was not found</p>".encode()
+    responses.calibrate(discovery.fingerprint(200, page(p), p) for p in ("a1b2c3", "d4e5f6a7b8"))
+    assert not responses.interesting(discovery.fingerprint(200, page("admin"), "admin"))
+    assert not responses.interesting(discovery.fingerprint(404, b"gone", "flag"))
+    assert responses.interesting(discovery.fingerprint(200, b"welcome back", "login"))
+    assert responses.collapsed == 2
+
+def test_dynamic_soft_404_and_repeats_are_folded():
+    responses = discovery.ResponseFilter(collapse_after=2)
+    responses.calibrate([(200, 500, "x"), (200, 510, "y")])
+    assert not responses.interesting((200, 520, "z"))
+    assert responses.interesting((200, 4000, "page"))
+    assert [responses.interesting((302, 0, f"r{i}")) for i in range(4)] == [True, True, False, False]
+
+def test_adaptive_limiter_halves_on_latency_and_grows_back():
+    async def run():
+        limiter = AdaptiveLimiter(16)
+        for _ in range(8):
+            await limiter.acquire()
+            await limiter.release(0.01)
+        grown = limiter.limit
+        await limiter.acquire()
+        await limiter.release(1.0)
+        return grown, limiter.limit
+    grown, slowed = asyncio.run(run())
+    assert grown == 12
+    assert slowed == 6
@@ -0,0 +1,30 @@
+import subprocess
+import sys
+from src.engines import EngineRegistry
+
+def test_engines_resolve_lazily():
+    # Fresh interpreter, since other tests may already have imported pwntools/requests
+    code = (
+        "import sys\n"
+        "from src.core.orchestrator import Orchestrator\n"
+        "o = Orchestrator(use_cache=False)\n"
+        "assert o.engine_map.get('crypto').__name__ == 'CryptoEngine'\n"
+        "assert 'pwn' not in sys.modules and 'requests' not in sys.modules, 'eager import'\n"
+        "assert o.engine_map.get('misc') is None\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+def test_register_custom_engine():
+    class DummyEngine:
+        pass
+
+    registry = EngineRegistry({})
+    registry.register('dummy', DummyEngine)
+    registry.register('forensics', 'src.engines.forensics_engine:ForensicsEngine')
+    assert registry.get('dummy') is DummyEngine
+    assert not registry.is_loaded('forensics')
+    assert registry['forensics'].__name__ == 'ForensicsEngine'
+    assert registry.get('unknown') is None
+    registry.register('misc', None)
+    assert registry.has_engine('dummy') and not registry.has_engine('misc')
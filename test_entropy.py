@@ -0,0 +1,46 @@
+import math
+import random
+from collections import Counter
+from src.core.artifact import Artifact
+from src.core.output_manager import OutputManager
+from src.engines.rev_engine import RevEngine
+from src.utils import entropy
+
+def reference(chunk):
+    counts = Counter(chunk)
+    return -sum(c / len(chunk) * math.log2(c / len(chunk)) for c in counts.values())
+
+def test_profile_matches_reference():
+    rng = random.Random(7)
+    data = bytes(rng.choice(b"abcdef") for _ in range(20000)) + rng.randbytes(12000)
+    profile = entropy.profile(data, window=1024, step=512)
+
+    assert len(profile.values) == (len(data) - 1024) // 512 + 1
+    for i in (0, 10, len(profile.values) - 1):
+        start = int(profile.offsets[i])
+        assert abs(profile.values[i] - reference(data[start:start + 1024])) < 1e-9
+    assert abs(profile.overall - reference(data)) < 1e-9
+    assert entropy.shannon(b"\x00" * 100) == 0.0
+
+def test_high_entropy_regions():
+    rng = random.Random(1)
+    data = b"\x00" * 16384 + rng.randbytes(32768) + b"A" * 16384
+    regions = entropy.profile(data, window=4096).high_regions()
+    assert len(regions) == 1
+    offset, size, mean = regions[0]
+    assert (offset, size) == (16384, 32768) and mean > 7.5
+
+def test_rev_engine_flags_packed_blob(tmp_path):
+    blob = tmp_path / "packed.bin"
+    blob.write_bytes(b"\x7fELF" + random.Random(3).randbytes(256 * 1024))
+
+    out = OutputManager(console=False)
+    out.begin(str(blob), "RevEngine")
+    with Artifact(str(blob)) as artifact:
+        RevEngine(out=out)._check_entropy(artifact)
+    findings = out.end()
+
+    kinds = {f['type']: f for f in findings}
+    assert kinds['entropy']['detail'] > 7.9 and len(kinds['entropy']['profile']) <= 64
+    assert kinds['entropy_region']['offset'] == 0
+    assert kinds['packer']['detail'].startswith('unknown')
@@ -0,0 +1,19 @@
+from src.utils.flag_extractor import FlagExtractor
+
+def test_check_str_and_bytes():
+    f = FlagExtractor(config={})
+    assert f.check("junk CTF{one} flag{two}") == "CTF{one}"
+    assert f.check(b"\x00\x01flag{raw_bytes}") == "flag{raw_bytes}"
+    assert f.check("no braces here") is None
+    assert f.check(None) is None
+
+def test_find_all_buffers():
+    f = FlagExtractor(config={})
+    data = b"a flag{1} b Cyber{2} c ctf{3}"
+    assert f.find_all(data) == ["flag{1}", "Cyber{2}", "ctf{3}"]
+    assert f.find_all(memoryview(data)) == ["flag{1}", "Cyber{2}", "ctf{3}"]
+    assert list(f.iter_matches(data))[0] == (2, "flag{1}")
+
+def test_custom_formats_from_config():
+    f = FlagExtractor(config={"flag_formats": ["picoCTF"], "flag_patterns": [r"FLAG-[0-9a-f]{8}"]})
+    assert f.find_all("picoCTF{x} and FLAG-deadbeef") == ["picoCTF{x}", "FLAG-deadbeef"]
@@ -0,0 +1,50 @@
+import hashlib
+from src.core.output_manager import OutputManager
+from src.engines.crypto_engine import CryptoEngine
+from src.utils import hash_cracker
+from src.utils.hash_cracker import HashCracker, candidates, identify
+
+def test_identify_by_length():
+    assert identify(hashlib.md5(b"x").hexdigest())[0] == "md5"
+    assert identify(hashlib.sha1(b"x").hexdigest().upper())[0] == "sha1"
+    assert "sha3_256" in identify(hashlib.sha256(b"x").hexdigest())
+    assert identify("abc") == [] and identify("z" * 32) == []
+
+def test_rules_and_flag_wrappers():
+    words = list(candidates(b"pass", rules=["case", "digits"], wrappers=[b"CTF"]))
+    assert b"Pass" in words and b"pass7" in words and b"CTF{PASS123}" in words
+    assert len(words) == len(set(words))
+
+def test_parallel_crack_stops_when_all_found(tmp_path, monkeypatch):
+    methods = []
+    pool = hash_cracker.ProcessPoolExecutor
+
+    def spy(*args, mp_context=None, **kwargs):
+        methods.append(mp_context.get_start_method())
+        return pool(*args, mp_context=mp_context, **kwargs)
+    monkeypatch.setattr(hash_cracker, "ProcessPoolExecutor", spy)
+
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_bytes(b"\n".join(b"word%d" % i for i in range(50000)) + b"\r\n")
+    hashes = [hashlib.sha1(b"Word123").hexdigest(), hashlib.md5(b"flag{word42}").hexdigest()]
+
+    cracker = HashCracker(workers=2, chunk_size=1000, rules=["case", "digits"], wrappers=[b"flag"])
+    results, stats = cracker.crack(hashes, [str(wordlist)])
+    assert results == {hashes[0]: ("sha1", b"Word123"), hashes[1]: ("md5", b"flag{word42}")}
+    # Both hashes sit in the first chunk: the rest of the list is never hashed
+    assert stats['words'] < 10000 and stats['rate'] > 0
+    # Forking this (threaded) test process could deadlock a worker
+    assert methods and "fork" not in methods
+
+def test_crypto_engine_cracks_flag_hash(tmp_path, monkeypatch):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("alpha\nbravo\ncharlie\n")
+    config = tmp_path / "config.json"
+    config.write_text('{"hashes": {"wordlists": ["%s"], "workers": 1}}' % wordlist)
+    monkeypatch.setenv("CTF_COPILOT_CONFIG", str(config))
+    digest = hashlib.sha256(b"CTF{bravo}").hexdigest()
+
+    out = OutputManager(console=False)
+    out.begin(digest, "CryptoEngine")
+    CryptoEngine(out=out).execute(digest)
+    assert [(f['flag'], f['hash']) for f in out.end() if f['type'] == 'flag'] == [("CTF{bravo}", digest)]
@@ -0,0 +1,135 @@
+import io
+import json
+import time
+from src.core.orchestrator import Orchestrator
+from src.core.output_manager import OutputManager, NDJSONSink
+
+def test_run_many(tmp_path, monkeypatch):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    chal = tmp_path / "chal"
+    (chal / "sub").mkdir(parents=True)
+    (chal / "enc.txt").write_text("Q1RGe2Jhc2U2NF9pc19lYXN5fQ==")
+    (chal / "sub" / "note.txt").write_text("nothing here")
+
+    copilot = Orchestrator()
+    results = copilot.run_many(str(chal), workers=2)
+
+    by_name = {r['target'].split('/')[-1]: r for r in results}
+    assert set(by_name) == {"enc.txt", "note.txt"}
+    assert by_name["enc.txt"]['category'] == 'crypto'
+    assert by_name["enc.txt"]['flags'] == ['CTF{base64_is_easy}']
+    assert not by_name["note.txt"]['flags']
+
+def test_pool_workers_crack_hashes_inline(tmp_path, monkeypatch):
+    import hashlib
+    from src.core import orchestrator
+    from src.utils import hash_cracker
+
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("alpha\nnested_pools\n")
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"hashes": {"wordlists": [str(wordlist)], "workers": 4}}))
+    target = tmp_path / "hash.txt"
+    target.write_text(hashlib.md5(b"flag{nested_pools}").hexdigest())
+    monkeypatch.setenv("CTF_COPILOT_CONFIG", str(config))
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    monkeypatch.setattr(hash_cracker, "POOL_ALLOWED", True)
+
+    def nested_pool(*args):
+        raise AssertionError("a pool worker started its own process pool")
+    monkeypatch.setattr(hash_cracker.HashCracker, "_crack_parallel", nested_pool)
+
+    result = orchestrator._analyze_target(str(target), use_cache=False)
+    assert result['flags'] == ['flag{nested_pools}']
+    assert not hash_cracker.POOL_ALLOWED
+
+def _engine_with_tool(pidfile):
+    """Stands in for _engine_worker: an engine blocked on a long-running external tool."""
+    import signal
+    import sys
+    from src.core import orchestrator
+    from src.wrappers.tool_runner import ToolRunner
+    orchestrator._own_group()
+    signal.signal(signal.SIGTERM, orchestrator._cancel)
+    tool = f"import os, time\nopen({pidfile!r}, 'w').write(str(os.getpid()))\ntime.sleep(60)"
+    ToolRunner(timeout=60).run_command([sys.executable, "-c", tool])
+
+def test_cancelled_engine_takes_its_tools_down(tmp_path):
+    import multiprocessing
+    import os
+    from src.core import orchestrator
+
+    pidfile = tmp_path / "tool.pid"
+    context = multiprocessing.get_context("spawn")
+    reader, writer = context.Pipe(duplex=False)
+    process = context.Process(target=_engine_with_tool, args=(str(pidfile),), daemon=True)
+    process.start()
+    orchestrator._own_group(process.pid)
+    deadline = time.monotonic() + 20
+    while not (pidfile.exists() and pidfile.read_text()) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    tool = int(pidfile.read_text())
+
+    Orchestrator._reap({reader: ('rev', process)}, reader, terminate=True)
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        try:
+            with open(f"/proc/{tool}/stat") as f:
+                if f.read().split(")")[-1].split()[0] == "Z":
+                    break       # Dead, waiting for init to reap it
+        except FileNotFoundError:
+            break
+        time.sleep(0.05)
+    else:
+        os.kill(tool, 9)
+        raise AssertionError("the tool outlived its cancelled engine")
+
+class SlowEngine:
+    VERSION = "0"
+    CACHEABLE = False
+
+    def __init__(self, out=None):
+        self.out = out
+
+    def execute(self, target, artifact=None):
+        time.sleep(60)
+
+def test_fan_out_cancels_on_first_flag(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    note = tmp_path / "note.txt"
+    note.write_text("the admin left this behind: flag{first_one_wins}\n")
+
+    stream = io.StringIO()
+    out = OutputManager(sinks=[NDJSONSink(stream)])
+    copilot = Orchestrator(out=out)
+    copilot.engine_map.register('rev', SlowEngine)
+    assert copilot._candidates(copilot.classifier.rank(str(note))) == ['crypto', 'forensics', 'rev']
+
+    start = time.perf_counter()
+    findings = copilot.run(str(note))
+    out.close()
+    assert time.perf_counter() - start < 30
+
+    console = capsys.readouterr().out
+    assert "flag{first_one_wins}" in {f['flag'] for f in findings}
+    assert "Cancelled: " in console and "Rev" in console.split("Cancelled: ")[1]
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert any(r['flag'] == "flag{first_one_wins}" for r in records)
+
+def test_top_k_one_runs_best_engine_only(tmp_path, monkeypatch):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    note = tmp_path / "note.txt"
+    note.write_text("nothing to see")
+    copilot = Orchestrator(top_k=1)
+    assert copilot._candidates(copilot.classifier.rank(str(note))) == ['crypto']
+
+def test_candidates_skip_categories_without_an_engine(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    copilot = Orchestrator()
+    assert copilot._candidates([('misc', 0.9), ('crypto', 0.5), ('rev', 0.3)]) == ['crypto', 'rev']
+    ranked = copilot.classifier.rank("hello world")
+    assert ranked[0][0] == 'misc'
+    assert all(copilot.engine_map.get(c) is not None for c in copilot._candidates(ranked))
+
+    copilot.run("hello world")
+    assert "Engine Failure" not in capsys.readouterr().out
@@ -0,0 +1,35 @@
+import io
+import json
+from src.core.orchestrator import Orchestrator
+from src.core.output_manager import OutputManager, NDJSONSink
+
+def test_ndjson_sink_writes_all_records():
+    stream = io.StringIO()
+    out = OutputManager(sinks=[NDJSONSink(stream, batch_size=8)], console=False)
+    out.begin("target.bin", "ForensicsEngine")
+    for i in range(100):
+        out.finding('flag', detail='strings', flag=f"flag{{{i}}}", offset=i)
+    findings = out.end()
+    out.close()
+
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(records) == len(findings) == 100
+    assert records[5]['flag'] == "flag{5}" and records[5]['offset'] == 5
+    assert records[0]['target'] == "target.bin" and records[0]['engine'] == "ForensicsEngine"
+    assert records[0]['duration'] is not None
+
+def test_engine_findings_reach_sinks(tmp_path, monkeypatch):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    blob = tmp_path / "dump.png"
+    blob.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 16 + b"flag{structured}\x00")
+
+    for expect_cached in (False, True):
+        stream = io.StringIO()
+        out = OutputManager(sinks=[NDJSONSink(stream)])
+        findings = Orchestrator(out=out).run(str(blob))
+        out.close()
+
+        record = json.loads(stream.getvalue().splitlines()[0])
+        assert findings[0]['flag'] == record['flag'] == "flag{structured}"
+        assert record['engine'] == "ForensicsEngine" and record['offset'] == 24
+        assert record.get('cached', False) == expect_cached
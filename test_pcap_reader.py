@@ -0,0 +1,123 @@
+import gzip
+import socket
+import struct
+from src.utils.flag_extractor import FlagExtractor
+from src.utils.pcap_reader import PcapScanner, read_packets
+
+def tcp_frame(src, dst, sport, dport, seq, data=b"", flags=0x18, v6=False):
+    tcp = struct.pack(">HHIIBBHHH", sport, dport, seq, 0, 5 << 4, flags, 65535, 0, 0) + data
+    if v6:
+        ip = struct.pack(">IHBB", 6 << 28, len(tcp), 6, 64) + \
+             socket.inet_pton(socket.AF_INET6, src) + socket.inet_pton(socket.AF_INET6, dst)
+        return b"\x00" * 12 + b"\x86\xdd" + ip + tcp
+    ip = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(tcp), 0, 0x4000, 64, 6, 0,
+                     socket.inet_aton(src), socket.inet_aton(dst))
+    return b"\x00" * 12 + b"\x08\x00" + ip + tcp
+
+def udp_frame(src, dst, sport, dport, data):
+    udp = struct.pack(">HHHH", sport, dport, 8 + len(data), 0) + data
+    ip = struct.pack(">BBHHHBBH4s4s", 0x45, 0, 20 + len(udp), 0, 0, 64, 17, 0,
+                     socket.inet_aton(src), socket.inet_aton(dst))
+    return b"\x00" * 12 + b"\x08\x00" + ip + udp
+
+def pcap(frames):
+    out = [struct.pack("<IHHiIII", 0xa1b2c3d4, 2, 4, 0, 0, 65535, 1)]
+    for i, frame in enumerate(frames):
+        out.append(struct.pack("<IIII", 1700000000 + i, 0, len(frame), len(frame)) + frame)
+    return b"".join(out)
+
+def pcapng(frames):
+    def block(kind, body):
+        body += b"\x00" * (-len(body) % 4)
+        return struct.pack("<II", kind, len(body) + 12) + body + struct.pack("<I", len(body) + 12)
+    out = [block(0x0a0d0d0a, struct.pack("<IHHq", 0x1a2b3c4d, 1, 0, -1)),
+           block(1, struct.pack("<HHI", 1, 0, 65535) + struct.pack("<HHB3x", 9, 1, 9) + b"\x00" * 4)]
+    for i, frame in enumerate(frames):
+        out.append(block(6, struct.pack("<IIIII", 0, 0, i * 1000, len(frame), len(frame)) + frame))
+    return b"".join(out)
+
+def segments(data, seq, size):
+    return [(seq + i, data[i:i + size]) for i in range(0, len(data), size)]
+
+def test_reassembles_out_of_order_and_retransmitted_segments(tmp_path):
+    client, server = "10.0.0.1", "10.0.0.2"
+    request = b"POST /login HTTP/1.1\r\nContent-Length: 29\r\n\r\nuser=admin&pw=flag{in_order}"
+    parts = segments(request, 1001, 7)
+    # Swap two segments and retransmit one: the stream must still read in order
+    parts[3], parts[4] = parts[4], parts[3]
+    parts.insert(6, parts[2])
+    frames = [tcp_frame(client, server, 40000, 80, 1000, flags=0x02)]
+    frames += [tcp_frame(client, server, 40000, 80, seq, data) for seq, data in parts]
+    frames.append(udp_frame(client, "10.0.0.53", 5353, 53, b"\x00\x01flag{over_udp}"))
+    path = tmp_path / "cap.pcap"
+    path.write_bytes(pcap(frames))
+
+    findings, stats = PcapScanner(FlagExtractor(config={})).scan(str(path))
+    by_flag = {flag: (where, offset) for where, offset, flag in findings}
+    assert by_flag["flag{in_order}"] == ("tcp 10.0.0.1:40000 -> 10.0.0.2:80", request.index(b"flag{"))
+    assert by_flag["flag{over_udp}"] == ("udp 10.0.0.1:5353 -> 10.0.0.53:53", 2)
+    assert stats['tcp_streams'] == 1 and stats['http_messages'] == 1
+    assert stats['bytes'] == len(request) and stats['gaps'] == 0
+
+def test_decodes_chunked_gzip_http_over_ipv6_pcapng(tmp_path):
+    client, server = "2001:db8::1", "2001:db8::2"
+    body = gzip.compress(b"<html>" + b"padding " * 500 + b"flag{gzipped_and_chunked}</html>")
+    chunks = b"".join(b"%x\r\n%s\r\n" % (len(body[i:i + 100]), body[i:i + 100])
+                      for i in range(0, len(body), 100)) + b"0\r\n\r\n"
+    first = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok"
+    second = (b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n"
+              b"Content-Encoding: gzip\r\n\r\n" + chunks)
+    stream = first + second
+    frames = [tcp_frame(server, client, 80, 50000, seq, data, v6=True)
+              for seq, data in segments(stream, 7, 50)]
+    frames.append(tcp_frame(server, client, 80, 50000, 7 + len(stream), flags=0x11, v6=True))
+    path = tmp_path / "cap.pcapng"
+    path.write_bytes(pcapng(frames))
+
+    packets = list(read_packets(str(path)))
+    assert len(packets) == len(frames) and abs(packets[1][0] - 1e-6) < 1e-12 and packets[0][1] == 1
+
+    findings, stats = PcapScanner(FlagExtractor(config={})).scan(str(path))
+    assert [(where, flag) for where, _, flag in findings] == \
+        [("http [2001:db8::2]:80 -> [2001:db8::1]:50000 #2 body", "flag{gzipped_and_chunked}")]
+    assert findings[0][1] == 6 + 8 * 500
+    assert stats['http_messages'] == 2
+
+def test_bounds_decoded_body_and_gap_buffers(tmp_path):
+    client, server = "10.0.0.1", "10.0.0.2"
+    bomb = gzip.compress(b"\x00" * (8 * 1024 * 1024) + b"flag{too_deep}")
+    response = b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nContent-Length: %d\r\n\r\n" % len(bomb) + bomb
+    frames = [tcp_frame(server, client, 80, 40000, seq, data)
+              for seq, data in segments(response, 1, 1400)]
+    # A segment that was never captured: the rest is delivered once the gap is given up on
+    lost = segments(b"A" * 100 + b"flag{after_the_gap}", 1, 10)
+    del lost[2]
+    frames += [tcp_frame(client, server, 40001, 80, seq, data) for seq, data in lost]
+    path = tmp_path / "cap.pcap"
+    path.write_bytes(pcap(frames))
+
+    scanner = PcapScanner(FlagExtractor(config={}), max_pending=64, max_body=1024 * 1024)
+    findings, stats = scanner.scan(str(path))
+    assert [flag for _, _, flag in findings] == ["flag{after_the_gap}"]
+    assert stats['limited'] == 1 and stats['gaps'] == 1
+
+def test_rejects_corrupt_pcapng_blocks():
+    import io
+    import pytest
+
+    def block(kind, body):
+        return struct.pack("<II", kind, len(body) + 12) + body + struct.pack("<I", len(body) + 12)
+    shb = block(0x0a0d0d0a, struct.pack("<IHHq", 0x1a2b3c4d, 1, 0, -1))
+    idb = block(1, struct.pack("<HHI", 1, 0, 65535))
+    epb = lambda iface: block(6, struct.pack("<IIIII", iface, 0, 0, 4, 4) + b"abcd")
+    corrupt = [
+        shb + epb(0),                                   # Packet before any interface
+        shb + idb + epb(3),                             # Interface that does not exist
+        shb + block(3, b"abcd") + idb,                  # Simple packet before the interface
+        shb + idb + block(6, b"\x00" * 8),              # Enhanced packet body too short
+        struct.pack("<II", 0x0a0d0d0a, 4) + b"\x4d\x3c\x2b\x1a" + b"\x00" * 64,   # SHB length < 12
+    ]
+    for capture in corrupt:
+        with pytest.raises(ValueError, match="corrupt pcapng block"):
+            list(read_packets(io.BytesIO(capture)))
+    assert [frame for _, _, frame in read_packets(io.BytesIO(shb + idb + epb(0)))] == [b"abcd"]
@@ -0,0 +1,86 @@
+import zlib
+import random
+import struct
+import numpy as np
+from src.utils.png_decoder import ADAM7, decode_png
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    return a if pa <= pb and pa <= pc else b if pb <= pc else c
+
+def filter_rows(raw_rows, bpp, rng, kinds):
+    """Applies a random PNG filter to every scanline (reference implementation)."""
+    out, prev = [], bytes(len(raw_rows[0]))
+    for row in raw_rows:
+        kind = rng.choice(kinds)
+        line = bytearray([kind])
+        for i, value in enumerate(row):
+            a = row[i - bpp] if i >= bpp else 0
+            b = prev[i]
+            c = prev[i - bpp] if i >= bpp else 0
+            pred = [0, a, b, (a + b) // 2, paeth(a, b, c)][kind]
+            line.append((value - pred) & 0xff)
+        out.append(bytes(line))
+        prev = row
+    return b"".join(out)
+
+def make_png(samples, depth, color_type, rng, interlace=False, palette=None, kinds=range(5)):
+    """Encodes a (height, width, channels) array as a PNG with randomly chosen filters."""
+    height, width, channels = samples.shape
+
+    def scanlines(image):
+        if depth == 16:
+            rows = image.astype(">u2").reshape(image.shape[0], -1)
+            return [r.tobytes() for r in rows], channels * 2
+        if depth < 8:
+            bits = np.unpackbits(image.astype(np.uint8)[..., None], axis=-1)[..., 8 - depth:]
+            rows = np.packbits(bits.reshape(image.shape[0], -1), axis=1)
+            return [r.tobytes() for r in rows], 1
+        return [r.tobytes() for r in image.reshape(image.shape[0], -1)], channels
+
+    if interlace:
+        data = b""
+        for x0, y0, dx, dy in ADAM7:
+            sub = samples[y0::dy, x0::dx]
+            if sub.size:
+                rows, bpp = scanlines(sub)
+                data += filter_rows(rows, bpp, rng, kinds)
+    else:
+        rows, bpp = scanlines(samples)
+        data = filter_rows(rows, bpp, rng, kinds)
+
+    def chunk(kind, payload):
+        return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+    png = b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, depth,
+                                                          color_type, 0, 0, int(interlace)))
+    if palette is not None:
+        png += chunk(b"PLTE", palette.tobytes())
+    # Split the zlib stream over two IDAT chunks, as real encoders do
+    compressed = zlib.compress(data)
+    half = len(compressed) // 2
+    return png + chunk(b"IDAT", compressed[:half]) + chunk(b"IDAT", compressed[half:]) + chunk(b"IEND", b"")
+
+def test_decodes_every_format_and_filter():
+    rng = random.Random(3)
+    gen = np.random.default_rng(3)
+    cases = [(8, 2, 3), (8, 6, 4), (8, 0, 1), (8, 4, 2), (16, 2, 3), (16, 0, 1),
+             (1, 0, 1), (2, 0, 1), (4, 0, 1), (4, 3, 1), (8, 3, 1)]
+    for depth, color_type, channels in cases:
+        for interlace, kinds in ((False, range(5)), (True, range(5)), (False, range(3))):
+            shape = (rng.randrange(1, 23), rng.randrange(1, 29), channels)
+            samples = gen.integers(0, 1 << depth, size=shape, dtype=np.uint16 if depth == 16 else np.uint8)
+            palette = gen.integers(0, 256, size=(16, 3), dtype=np.uint8) if color_type == 3 else None
+            image = decode_png(make_png(samples, depth, color_type, rng, interlace, palette, kinds))
+            assert image.pixels.shape == shape, (depth, color_type, interlace)
+            assert (image.pixels == samples).all(), (depth, color_type, interlace)
+            assert image.interlaced == interlace
+            assert image.palette is None or (image.palette == palette).all()
+
+def test_rejects_short_ihdr():
+    import pytest
+    chunk = lambda kind, data: struct.pack(">I", len(data)) + kind + data + struct.pack(">I", 0)
+    for ihdr in (b"", struct.pack(">II", 4, 4)):
+        with pytest.raises(ValueError, match="IHDR"):
+            decode_png(b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IEND", b""))
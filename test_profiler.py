@@ -0,0 +1,29 @@
+import json
+from src.utils import profiler
+from src.engines.crypto_engine import CryptoEngine
+
+def test_disabled_records_nothing():
+    profiler.disable()
+    profiler.reset()
+    assert profiler.span("a") is profiler.span("b")  # Shared no-op
+    with profiler.span("a"):
+        pass
+    CryptoEngine().search("ZmxhZ3t4fQ==")
+    assert profiler.records() == []
+
+def test_spans_summary_and_trace(tmp_path):
+    profiler.reset()
+    profiler.enable()
+    try:
+        CryptoEngine().search("Wm14aFozdDRmUT09")  # base64(base64(flag{x}))
+    finally:
+        profiler.disable()
+
+    stages = {row[0]: row for row in profiler.summary()}
+    assert stages["crypto.Base64"][1] >= 2
+
+    path = tmp_path / "trace.json"
+    count = profiler.export_chrome_trace(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    assert len(events) == count and all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
+    profiler.reset()
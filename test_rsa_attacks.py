@@ -0,0 +1,70 @@
+import math
+import random
+from Crypto.PublicKey import RSA
+from Crypto.Util.number import bytes_to_long, getPrime, isPrime
+from src.core.orchestrator import Orchestrator
+from src.core.output_manager import OutputManager
+from src.engines.crypto_engine import CryptoEngine
+from src.utils import rsa_attacks
+
+FLAG = b"flag{factor_me_if_you_can}"
+M = bytes_to_long(FLAG)
+
+def run_engine(text):
+    out = OutputManager(console=False)
+    out.begin("rsa", "CryptoEngine")
+    CryptoEngine(out=out).execute(text)
+    return out.end()
+
+def flags(findings):
+    return [(f['flag'], f['detail']) for f in findings if f['type'] == 'flag']
+
+def test_parse_pem_and_param_groups():
+    key = RSA.generate(1024)
+    text = key.publickey().export_key().decode() + "\nn = 0x%x\ne1 = 3\nc1 = 12\ne2 = 5\nc2 = 34\n" % key.n
+    keys = rsa_attacks.parse(text)
+    assert [(k.source, k.n == key.n, k.e, k.c) for k in keys] == [
+        ("PEM #1", True, 65537, None), ("n1/e1/c1", True, 3, 12), ("n2/e2/c2", True, 5, 34)]
+    assert rsa_attacks.parse("version: 2, n = 5") == []
+
+def test_single_key_attacks():
+    p, q = getPrime(512), getPrime(512)
+    n = p * q
+    assert flags(run_engine(f"n = {n}\ne = 3\nc = {pow(M, 3, n)}")) == [(FLAG.decode(), "RSA small e root (n/e/c)")]
+
+    # Close primes: Fermat
+    q = p + 2
+    while not isPrime(q):
+        q += 2
+    assert flags(run_engine(f"n = {hex(p * q)}\nc = {hex(pow(M, 65537, p * q))}"))[0][1].startswith("RSA Fermat")
+
+    # Tiny private exponent: Wiener
+    q = getPrime(512)
+    n, phi = p * q, (p - 1) * (q - 1)
+    d = next(d for d in range(random.getrandbits(100) | 1, 1 << 120, 2) if math.gcd(d, phi) == 1)
+    e = pow(d, -1, phi)
+    assert flags(run_engine(f"N: {n}\nexponent: {e}\nct: {pow(M, e, n)}"))[0][1].startswith("RSA Wiener")
+
+def test_common_modulus():
+    n = getPrime(512) * getPrime(512)
+    text = f"n = {n}\ne1 = 65537\nc1 = {pow(M, 65537, n)}\ne2 = 257\nc2 = {pow(M, 257, n)}"
+    assert flags(run_engine(text)) == [(FLAG.decode(), "RSA common modulus (n1/e1/c1)")]
+
+def test_batch_gcd_finds_shared_primes():
+    shared = getPrime(128)
+    moduli = [getPrime(128) * getPrime(128) for _ in range(200)]
+    moduli[17] = shared * getPrime(128)
+    moduli[150] = shared * getPrime(128)
+    gcds = rsa_attacks.batch_gcd(moduli)
+    assert [i for i, g in enumerate(gcds) if g > 1] == [17, 150]
+    assert gcds[17] == gcds[150] == shared
+
+def test_run_many_shares_primes_across_targets(tmp_path, monkeypatch):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    shared = getPrime(512)
+    for name in ("alice", "bob"):
+        n = shared * getPrime(512)
+        (tmp_path / f"{name}.txt").write_text(f"n = {n}\ne = 65537\nc = {pow(M, 65537, n)}\n")
+
+    results = Orchestrator().run_many(str(tmp_path), workers=1)
+    assert all(r['flags'] == [FLAG.decode()] for r in results) and len(results) == 2
@@ -0,0 +1,51 @@
+import base64
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from src.core.client import Client
+from src.core.output_manager import OutputManager
+from src.core.server import AnalysisServer
+
+def test_concurrent_clients(tmp_path, monkeypatch):
+    monkeypatch.setenv("CTF_COPILOT_CACHE", str(tmp_path / "cache"))
+    socket_path = str(tmp_path / "copilot.sock")
+    server = AnalysisServer(socket_path, workers=2, out=OutputManager(console=False))
+    ready = threading.Event()
+
+    async def serve():
+        started = asyncio.Event()
+        task = asyncio.create_task(server.serve(started))
+        await started.wait()
+        ready.set()
+        await task
+
+    thread = threading.Thread(target=asyncio.run, args=(serve(),))
+    thread.start()
+    assert ready.wait(60)
+
+    blob = tmp_path / "dump.png"
+    blob.write_bytes(b"\x89PNG\r\n\x1a\n" + b"\x00" * 16 + b"flag{over_the_socket}\x00")
+
+    def client_run(i):
+        encoded = base64.b64encode(f"flag{{client_{i}}}".encode()).decode()
+        with Client(socket_path, timeout=60) as client:
+            return list(client.analyze([encoded, str(blob)]))
+
+    try:
+        with ThreadPoolExecutor(4) as clients:
+            sessions = list(clients.map(client_run, range(4)))
+
+        for i, events in enumerate(sessions):
+            done = {e['id']: e for e in events if e['event'] == 'done'}
+            assert done[0]['flags'] == [f"flag{{client_{i}}}"] and done[0]['category'] == 'crypto'
+            assert done[1]['flags'] == ["flag{over_the_socket}"]
+            findings = [e for e in events if e['event'] == 'finding' and e['id'] == 1]
+            assert findings[0]['flag'] == "flag{over_the_socket}" and findings[0]['offset'] == 24
+
+        with Client(socket_path, timeout=10) as client:
+            assert client.ping()['jobs'] == 8
+            assert client.shutdown()['event'] == 'bye'
+    finally:
+        server.stop()
+        thread.join(30)
+    assert not thread.is_alive()
@@ -0,0 +1,53 @@
+import random
+import numpy as np
+from src.core.artifact import Artifact
+from src.core.output_manager import OutputManager
+from src.engines.forensics_engine import ForensicsEngine
+from src.utils.png_decoder import decode_png
+from src.utils.stego import StegoScanner, bit_planes, reverse_bits
+from src.utils.flag_extractor import FlagExtractor
+from test_png_decoder import make_png
+
+def embed(pixels, payload, plane, channels):
+    """Hides 'payload' MSB-first in one bit plane of the given channels, row-major."""
+    bits = np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
+    flat = pixels[..., channels].reshape(-1)
+    flat[:bits.size] = (flat[:bits.size] & ~np.uint8(1 << plane)) | (bits << plane)
+    pixels[..., channels] = flat.reshape(pixels[..., channels].shape)
+
+def test_bit_planes_match_packbits():
+    samples = np.random.default_rng(3).integers(0, 256, 1003, dtype=np.uint8)
+    planes = bit_planes(samples.copy())
+    padded = np.zeros(1008, dtype=np.uint8)
+    padded[:1003] = samples
+    for plane in range(8):
+        bits = (padded >> plane) & 1
+        assert np.array_equal(planes[plane], np.packbits(bits, bitorder="little"))
+        assert np.array_equal(reverse_bits(planes[plane]), np.packbits(bits))
+
+def test_finds_flag_file_and_text_in_bit_planes():
+    rng = np.random.default_rng(5)
+    pixels = rng.integers(0, 256, (64, 96, 3), dtype=np.uint8)
+    embed(pixels, b"junk" * 40 + b"flag{lsb_hidden}", 0, [0, 1, 2])
+    embed(pixels, b"PK\x03\x04" + bytes(60), 1, [2])
+    embed(pixels, b"the password is hunter2", 2, [1])
+    image = decode_png(make_png(pixels, 8, 2, random.Random(5)))
+
+    findings, streams = StegoScanner(FlagExtractor(config={})).scan(image)
+    assert streams == 5 * 8 * 2 * 2
+    assert ("rgb,b0,xy,msb", 160, "flag", "flag{lsb_hidden}") in findings
+    assert ("b,b1,xy,msb", 0, "file", "application/zip") in findings
+    assert ("g,b2,xy,msb", 0, "text") in [f[:3] for f in findings if f[3].startswith("the password")]
+
+def test_forensics_engine_scans_png(tmp_path):
+    pixels = np.random.default_rng(9).integers(0, 256, (40, 40, 4), dtype=np.uint8)
+    embed(pixels, b"CTF{alpha_channel}", 0, [3])
+    path = tmp_path / "image.png"
+    path.write_bytes(make_png(pixels.transpose(1, 0, 2).copy(), 8, 6, random.Random(1)))
+
+    out = OutputManager(console=False)
+    out.begin(str(path), "ForensicsEngine")
+    with Artifact(str(path)) as artifact:
+        ForensicsEngine(out=out)._analyze_stego(artifact)
+    flags = [f for f in out.end() if f['flag'] == "CTF{alpha_channel}"]
+    assert flags and flags[0]['stream'] == "a,b0,yx,msb"
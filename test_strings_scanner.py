@@ -0,0 +1,53 @@
+import random
+import re
+from src.utils.strings_scanner import ENCODINGS, _scan_regex, byte_offset, iter_strings, scan_strings
+
+def test_chunk_boundaries(tmp_path):
+    data = b"\x00\x01flag{split_across_chunks}\xff" * 50 + b"abc\x00tail_at_eof"
+    path = tmp_path / "blob.bin"
+    path.write_bytes(data)
+
+    expected = [(m.start(), m.group()) for m in re.finditer(rb"[ -~]{4,}", data)]
+    for chunk_size in (1, 5, 16, 4096):
+        assert list(iter_strings(str(path), chunk_size=chunk_size)) == expected
+
+def test_bytes_source():
+    assert list(iter_strings(b"\x00hello\x00hi\x00", min_length=2)) == [(1, b"hello"), (7, b"hi")]
+
+def test_wide_strings():
+    data = (b"\x01\x02" + "flag{wide_le}".encode("utf-16le") + b"\xff"
+            + "CTF{wide_be}".encode("utf-16be") + b"\x01plain\x00" + "héllo wörld".encode())
+    assert list(scan_strings(data)) == [
+        (2, b"flag{wide_le}", "utf-16le"),
+        (29, b"CTF{wide_be}", "utf-16be"),
+        (54, b"plain", "ascii"),
+        (63, b"llo w", "ascii"),
+    ]
+    assert list(scan_strings(data, encodings=("utf-8",))) == [(60, "héllo wörld".encode(), "utf-8")]
+    assert byte_offset(29, "utf-16be", 4) == 37
+    # Zero-padded wide strings also read as UTF-16BE one byte earlier; little-endian wins
+    assert list(scan_strings(b"\x00" * 8 + "flag{pad}".encode("utf-16le") + b"\x00" * 8)) == [
+        (8, b"flag{pad}", "utf-16le")]
+
+def test_scan_matches_regex_across_chunks(tmp_path):
+    rng = random.Random(5)
+    blob = bytearray(rng.randbytes(200000))
+    for i in range(200):
+        pos = rng.randrange(len(blob) - 64)
+        blob[pos:pos + 40] = f"flag{{{i:04d}_padding_xx}}".encode(rng.choice(ENCODINGS))[:40]
+    path = tmp_path / "blob.bin"
+    path.write_bytes(bytes(blob))
+
+    expected = sorted(_scan_regex(bytes(blob), 4, ENCODINGS))
+    for chunk_size in (1000, 4096, 1 << 22):
+        assert sorted(scan_strings(str(path), chunk_size=chunk_size)) == expected
+
+def test_run_longer_than_a_chunk(tmp_path):
+    run = b"A" * 5000 + b"flag{in_a_long_run}" + b"B" * 5000
+    data = b"\x00" + run + b"\x01" + (b"x" * 3000).decode().encode("utf-16le") + b"\xff"
+    path = tmp_path / "long.bin"
+    path.write_bytes(data)
+    for chunk_size in (1, 1000, 4096):
+        assert list(scan_strings(str(path), chunk_size=chunk_size)) == [
+            (1, run, "ascii"), (len(run) + 2, b"x" * 3000, "utf-16le")]
+        assert list(iter_strings(str(path), chunk_size=chunk_size))[0] == (1, run)
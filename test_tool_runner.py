@@ -0,0 +1,84 @@
+import asyncio
+import os
+import sys
+import time
+from src.wrappers import tool_runner
+from src.wrappers.tool_runner import ToolRunner
+
+PY = sys.executable
+
+def script(code):
+    return [PY, "-c", code]
+
+def test_streams_lines_before_exit():
+    runner = ToolRunner()
+    tool = script("import time\nprint('flag{early}', flush=True)\ntime.sleep(0.5)\nprint('done')")
+
+    async def first_line_latency():
+        start = time.monotonic()
+        seen = []
+        result = await runner.run(tool, on_line=lambda line: seen.append((time.monotonic() - start, line)))
+        return seen, result
+
+    seen, result = asyncio.run(first_line_latency())
+    assert result.ok and result.stdout == ["flag{early}", "done"]
+    assert seen[0][0] < 0.4  # Delivered while the tool was still sleeping
+
+def test_timeout_kills_process_group(tmp_path):
+    marker = tmp_path / "grandchild.pid"
+    tool = script(
+        "import subprocess, sys, time\n"
+        f"p = subprocess.Popen([{PY!r}, '-c', 'import time; time.sleep(30)'])\n"
+        f"open({str(marker)!r}, 'w').write(str(p.pid))\n"
+        "time.sleep(30)\n"
+    )
+    result = ToolRunner().run_command(tool, timeout=1)
+    assert result.timed_out and not result.ok
+    assert result.duration < 5
+
+    grandchild = int(marker.read_text())
+    time.sleep(0.2)
+    try:
+        os.kill(grandchild, 0)
+        alive = not open(f"/proc/{grandchild}/stat").read().split()[2] == "Z"
+    except (ProcessLookupError, FileNotFoundError):
+        alive = False
+    assert not alive
+
+def test_concurrency_cap_and_fan_out():
+    cmds = [script(f"import time; time.sleep(0.3); print({i})") for i in range(4)]
+
+    async def two_runners():
+        # The cap is per process: separate runners share it
+        first, second = await asyncio.gather(ToolRunner().run_many(cmds[:2]),
+                                             ToolRunner().run_many(cmds[2:]))
+        return first + second
+
+    previous = tool_runner.MAX_CONCURRENCY
+    ToolRunner.set_max_concurrency(2)
+    try:
+        start = time.monotonic()
+        results = asyncio.run(two_runners())
+        elapsed = time.monotonic() - start
+    finally:
+        ToolRunner.set_max_concurrency(previous)
+
+    assert [r.stdout for r in results] == [["0"], ["1"], ["2"], ["3"]]
+    assert elapsed >= 0.6  # Two waves of two
+
+def test_memory_limit_and_missing_tool():
+    runner = ToolRunner(memory_limit=256 * 1024 * 1024)
+    result = runner.run_command(script("x = bytearray(1024 * 1024 * 1024)"))
+    assert result.returncode != 0 and "MemoryError" in result.stderr
+
+    missing = runner.run_command(["definitely-not-a-real-tool-xyz"])
+    assert missing.error and not missing.ok
+
+def test_lines_longer_than_the_reader_limit():
+    runner = ToolRunner()
+    for size in (100 * 1024, 3 * ToolRunner.LINE_LIMIT):
+        tool = script(f"import sys\nsys.stdout.write('A' * {size} + '\\n' + 'flag{{after}}\\n')")
+        result = runner.run_command(tool)
+        assert result.ok
+        assert [len(line) for line in result.stdout] == [size, len("flag{after}")]
+        assert result.stdout[1] == "flag{after}"
@@ -0,0 +1,141 @@
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from src.core.output_manager import OutputManager
+from src.engines.web_engine import WebEngine
+
+PAGES = {
+    "/": "<html><!-- nothing to see --></html>",
+    "/robots.txt": "User-agent: *\nDisallow: /secret\nDisallow: /admin # staff only\nDisallow: /\n",
+    "/secret": "CTF{robots_are_not_access_control}",
+    "/admin": "login required",
+}
+
+class ChallengeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def _respond(self, body=True):
+        page = PAGES.get(self.path)
+        data = (page or "not found").encode()
+        self.send_response(200 if page is not None else 404)
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("X-Flag-Hint", "flag{header_hint}")
+        self.end_headers()
+        if body:
+            self.wfile.write(data)
+
+    def do_GET(self):
+        self._respond()
+
+    def do_HEAD(self):
+        self._respond(body=False)
+
+    def log_message(self, *args):
+        pass
+
+def serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ChallengeHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def test_concurrent_probes():
+    server = serve()
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        flags = WebEngine().execute(url)
+    finally:
+        server.shutdown()
+
+    assert "CTF{robots_are_not_access_control}" in flags
+    assert "flag{header_hint}" in flags
+
+def test_disallowed_paths():
+    assert WebEngine._disallowed_paths(PAGES["/robots.txt"]) == ["/secret", "/admin"]
+
+SITE = {
+    "/flag.txt": "CTF{wordlists_find_what_robots_hide}",
+    "/backup": "index.php source",
+}
+
+class SoftNotFoundHandler(BaseHTTPRequestHandler):
+    """Answers 200 for every path, echoing it back, like many catch-all frameworks."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        page = SITE.get(self.path, f"<h1>Sorry, {self.path} does not exist</h1>")
+        data = page.encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+def test_content_discovery_folds_soft_404s(tmp_path):
+    wordlist = tmp_path / "words.txt"
+    wordlist.write_text("index\nbackup\n# comment\nnothing\nflag\n")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SoftNotFoundHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    out = OutputManager(console=False)
+    engine = WebEngine(out=out, rate=0, discover=True)
+    engine.wordlists = [str(wordlist)]
+    engine.extensions = ["", ".txt"]
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        out.begin(url, "WebEngine")
+        flags = engine.execute(url)
+        findings = out.end()
+    finally:
+        server.shutdown()
+
+    assert "CTF{wordlists_find_what_robots_hide}" in flags
+    paths = sorted(f['url'].rsplit('/', 1)[-1] for f in findings if f['type'] == 'path')
+    assert paths == ["backup", "flag.txt"]
+
+STATIC_SITE = {
+    "index.html": '<html><head><link rel="stylesheet" href="css/style.css"><script src="/js/app.js"></script>'
+                  '</head><body><!-- TODO: remove /notes.html before launch -->'
+                  '<a href="about.html#team">About</a> <a href="http://example.com/">elsewhere</a>'
+                  '<a href="level1.html">deeper</a></body></html>',
+    "about.html": "<p>We are a team.</p><!-- CTF{comments_ship_to_production} -->",
+    "notes.html": "<p>unlinked</p>",
+    "css/style.css": "body { background: url('../img/bg.png'); } @import '/css/print.css';",
+    "css/print.css": "/* flag{css_is_code_too} */",
+    "js/app.js": 'fetch("/api/config.json");\n//# sourceMappingURL=app.js.map\n',
+    "js/app.js.map": '{"version":3,"sourcesContent":["const key = \\"Cyber{source_maps_leak}\\";"]}',
+    "api/config.json": '{"debug": false}',
+    "level1.html": '<a href="level2.html">next</a>',
+    "level2.html": '<a href="level3.html">next</a>',
+    "level3.html": "flag{too_deep_for_the_crawler}",
+}
+
+def test_crawler_scans_static_site(tmp_path):
+    import functools
+    from http.server import SimpleHTTPRequestHandler
+
+    class QuietHandler(SimpleHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+    for name, content in STATIC_SITE.items():
+        (tmp_path / name).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / name).write_text(content)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(QuietHandler, directory=str(tmp_path)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    out = OutputManager(console=False)
+    engine = WebEngine(out=out, rate=0)
+    engine.max_depth = 2
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+        out.begin(url, "WebEngine")
+        flags = engine.execute(url)
+        findings = out.end()
+    finally:
+        server.shutdown()
+
+    assert "CTF{comments_ship_to_production}" in flags
+    assert "flag{css_is_code_too}" in flags
+    assert "Cyber{source_maps_leak}" in flags
+    assert "flag{too_deep_for_the_crawler}" not in flags
+    comments = [f['detail'] for f in findings if f['type'] == 'comment']
+    assert "/index.html: TODO: remove /notes.html before launch" in comments